@@ -11,19 +11,22 @@ from .. import settings
 
 # Attempt to fix bill identifiers in the DB that were NOT normalized when saved the first time
 # non-normalized bill identifiers will never be matchable to a bill.identifier value
-def fix_abnormal_related_bill_identifiers(jurisdiction_id: str) -> None:
+def fix_abnormal_related_bill_identifiers(jurisdiction_id: str, batch_size: int = 1000) -> int:
     # import of model has to be after django_init
     from ..data.models import RelatedBill
     abnormal_unresolved_rb = RelatedBill.objects.filter(
         bill__legislative_session__jurisdiction_id=jurisdiction_id,
         related_bill=None,
     ).exclude(identifier__contains=' ')
-    for rb in abnormal_unresolved_rb:
-        new_identifier = transformers.fix_bill_id(rb.identifier)
-        if new_identifier is not rb.identifier:
+    # only the rows whose identifier changes are written, batch_size at a time
+    fixed = []
+    for rb_id, identifier in abnormal_unresolved_rb.values_list("id", "identifier"):
+        new_identifier = transformers.fix_bill_id(identifier)
+        if new_identifier != identifier:
             # update this related bill row with normalized identifier
-            rb.identifier = new_identifier
-            rb.save()
+            fixed.append(RelatedBill(id=rb_id, identifier=new_identifier))
+    RelatedBill.objects.bulk_update(fixed, ["identifier"], batch_size=batch_size)
+    return len(fixed)
 
 
 @click.command(help="Resolve unresolved relationships between entities")
@@ -56,7 +59,8 @@ def main(jurisdiction_abbreviation: str, log_level: str, session: Union[str, Non
     # Prep: resolve any non-normalized bill identifiers in related bill data
     # ie if RelatedBill has an identifier like "A1675" instead of "A 1675", then it can't be matched to a real bill
     # (this was a historical problem only fixed in mid 2024)
-    fix_abnormal_related_bill_identifiers(jurisdiction_id)
+    fixed = fix_abnormal_related_bill_identifiers(jurisdiction_id)
+    logger.info(f"Normalized {fixed} related bill identifiers")
 
     # Run the resolution logic
     try:
@@ -1,7 +1,7 @@
+import json
 import typing
 import logging
-from django.db import transaction  # type: ignore
-from django.db.models import Count, Subquery, OuterRef, Q, F  # type: ignore
+from django.db import connection, transaction  # type: ignore
 from .. import utils
 
 # model imports are inside functions since this file is imported pre-init
@@ -21,6 +21,12 @@ def print_report(report: dict[str, typing.Any]) -> None:
             print("  objects:")
             for objtype, num in sorted(details["objects"].items()):
                 print("    {}: {}".format(objtype, num))
+            if "validation" in details:
+                print(
+                    "  validation: {} ({} validated)".format(
+                        details["validation"]["mode"], details["validation"]["validated"]
+                    )
+                )
     if "import" in report:
         print("import:")
         for type, changes in sorted(report["import"].items()):
@@ -30,6 +36,12 @@ def print_report(report: dict[str, typing.Any]) -> None:
                         type, changes["insert"], changes["update"], changes["noop"]
                     )
                 )
+                for stage, times in changes.get("stages", {}).items():
+                    print(
+                        "    {}: {:.2f}s ({:.2f}s cpu) {} queries".format(
+                            stage, times["wall"], times["cpu"], times["queries"]
+                        )
+                    )
 
 
 @transaction.atomic
@@ -82,108 +94,111 @@ def save_report(report: dict[str, typing.Any], jurisdiction: str) -> typing.Any:
                 noop_count=changes["noop"],
                 start_time=changes["start"],
                 end_time=changes["end"],
+                stages=changes.get("stages", {}),
             )
 
 
-def _simple_count(ModelCls: typing.Any, session: str, **filter: typing.Any) -> int:
-    return (
-        ModelCls.objects.filter(legislative_session_id=session).filter(**filter).count()
-    )
+# the whole report for a session in one statement, each table is read once:
+# votes are joined to per-vote totals of their person votes and vote counts,
+# and a vote without a "yes" (or "no") count counts as 0 when checking the totals
+_SESSION_REPORT_SQL = """
+WITH session_bills AS (
+    SELECT id FROM opencivicdata_bill WHERE legislative_session_id = %(session)s
+), bill_report AS (
+    SELECT
+        COUNT(*) FILTER (WHERE NOT EXISTS (
+            SELECT 1 FROM opencivicdata_billaction a WHERE a.bill_id = b.id
+        )) AS bills_missing_actions,
+        COUNT(*) FILTER (WHERE NOT EXISTS (
+            SELECT 1 FROM opencivicdata_billsponsorship s WHERE s.bill_id = b.id
+        )) AS bills_missing_sponsors,
+        COUNT(*) FILTER (WHERE NOT EXISTS (
+            SELECT 1 FROM opencivicdata_billversion v WHERE v.bill_id = b.id
+        )) AS bills_missing_versions
+    FROM session_bills b
+), session_votes AS (
+    SELECT id, bill_id FROM opencivicdata_voteevent
+    WHERE legislative_session_id = %(session)s
+), person_vote_sums AS (
+    SELECT
+        vote_event_id,
+        COUNT(*) FILTER (WHERE option = 'yes') AS yes_sum,
+        COUNT(*) FILTER (WHERE option = 'no') AS no_sum,
+        COUNT(*) FILTER (WHERE option = 'other') AS other_sum
+    FROM opencivicdata_personvote
+    WHERE vote_event_id IN (SELECT id FROM session_votes)
+    GROUP BY vote_event_id
+), vote_counts AS (
+    SELECT
+        vote_event_id,
+        MAX(value) FILTER (WHERE option = 'yes') AS yes_count,
+        MAX(value) FILTER (WHERE option = 'no') AS no_count,
+        MAX(value) FILTER (WHERE option = 'other') AS other_count
+    FROM opencivicdata_votecount
+    WHERE vote_event_id IN (SELECT id FROM session_votes)
+    GROUP BY vote_event_id
+), vote_report AS (
+    SELECT
+        COUNT(*) FILTER (WHERE v.bill_id IS NULL) AS votes_missing_bill,
+        COUNT(*) FILTER (WHERE pvs.vote_event_id IS NULL) AS votes_missing_voters,
+        COUNT(*) FILTER (WHERE vc.yes_count IS NULL) AS votes_missing_yes_count,
+        COUNT(*) FILTER (WHERE vc.no_count IS NULL) AS votes_missing_no_count,
+        COUNT(*) FILTER (WHERE
+            COALESCE(pvs.yes_sum, 0) != COALESCE(vc.yes_count, 0)
+            OR COALESCE(pvs.no_sum, 0) != COALESCE(vc.no_count, 0)
+            OR COALESCE(pvs.other_sum, 0) != COALESCE(vc.other_count, 0)
+        ) AS votes_with_bad_counts
+    FROM session_votes v
+    LEFT JOIN person_vote_sums pvs ON pvs.vote_event_id = v.id
+    LEFT JOIN vote_counts vc ON vc.vote_event_id = v.id
+), unmatched_sponsors AS (
+    SELECT entity_type, name, COUNT(*) AS num
+    FROM opencivicdata_billsponsorship
+    WHERE bill_id IN (SELECT id FROM session_bills)
+        AND entity_type IN ('person', 'organization')
+        AND person_id IS NULL
+    GROUP BY entity_type, name
+), unmatched_voters AS (
+    SELECT voter_name, COUNT(*) AS num
+    FROM opencivicdata_personvote
+    WHERE vote_event_id IN (SELECT id FROM session_votes) AND voter_id IS NULL
+    GROUP BY voter_name
+)
+SELECT
+    bill_report.*,
+    vote_report.*,
+    (
+        SELECT COALESCE(jsonb_object_agg(name, num), '{}')
+        FROM unmatched_sponsors WHERE entity_type = 'person'
+    ) AS unmatched_sponsor_people,
+    (
+        SELECT COALESCE(jsonb_object_agg(name, num), '{}')
+        FROM unmatched_sponsors WHERE entity_type = 'organization'
+    ) AS unmatched_sponsor_organizations,
+    (
+        SELECT COALESCE(jsonb_object_agg(voter_name, num), '{}')
+        FROM unmatched_voters
+    ) AS unmatched_voters
+FROM bill_report, vote_report
+"""
+
+_NAME_COUNT_FIELDS = (
+    "unmatched_sponsor_people",
+    "unmatched_sponsor_organizations",
+    "unmatched_voters",
+)
 
 
 def generate_session_report(session: str) -> typing.Any:
-    from ..data.models import (
-        Bill,
-        VoteEvent,
-        VoteCount,
-        PersonVote,
-        BillSponsorship,
-        SessionDataQualityReport,
-    )
-
-    report: dict[str, typing.Any] = {
-        "bills_missing_actions": _simple_count(Bill, session, actions__isnull=True),
-        "bills_missing_sponsors": _simple_count(
-            Bill, session, sponsorships__isnull=True
-        ),
-        "bills_missing_versions": _simple_count(Bill, session, versions__isnull=True),
-        "votes_missing_bill": _simple_count(VoteEvent, session, bill__isnull=True),
-        "votes_missing_voters": _simple_count(VoteEvent, session, votes__isnull=True),
-        "votes_missing_yes_count": 0,
-        "votes_missing_no_count": 0,
-        "votes_with_bad_counts": 0,
-    }
-
-    voteevents = VoteEvent.objects.filter(legislative_session_id=session)
-    # explicitly remove ordering pre-Django 3.1
-    queryset = voteevents.order_by().annotate(
-        yes_sum=Count("pk", filter=Q(votes__option="yes")),
-        no_sum=Count("pk", filter=Q(votes__option="no")),
-        other_sum=Count("pk", filter=Q(votes__option="other")),
-        yes_count=Subquery(
-            VoteCount.objects.filter(vote_event=OuterRef("pk"), option="yes").values(
-                "value"
-            )
-        ),
-        no_count=Subquery(
-            VoteCount.objects.filter(vote_event=OuterRef("pk"), option="no").values(
-                "value"
-            )
-        ),
-        other_count=Subquery(
-            VoteCount.objects.filter(vote_event=OuterRef("pk"), option="other").values(
-                "value"
-            )
-        ),
-    )
-
-    for vote in queryset:
-        if vote.yes_count is None:
-            report["votes_missing_yes_count"] += 1
-            vote.yes_count = 0
-        if vote.no_count is None:
-            report["votes_missing_no_count"] += 1
-            vote.no_count = 0
-        if vote.other_count is None:
-            vote.other_count = 0
-        if (
-            vote.yes_sum != vote.yes_count
-            or vote.no_sum != vote.no_count
-            or vote.other_sum != vote.other_count
-        ):
-            report["votes_with_bad_counts"] += 1
-
-    # handle unmatched
-    queryset = (
-        BillSponsorship.objects.filter(
-            bill__legislative_session_id=session, entity_type="person", person_id=None
-        )
-        .values("name")
-        .annotate(num=Count("name"))
-    )
-    report["unmatched_sponsor_people"] = {
-        item["name"]: item["num"] for item in queryset
-    }
-    queryset = (
-        BillSponsorship.objects.filter(
-            bill__legislative_session_id=session,
-            entity_type="organization",
-            person_id=None,
-        )
-        .values("name")
-        .annotate(num=Count("name"))
-    )
-    report["unmatched_sponsor_organizations"] = {
-        item["name"]: item["num"] for item in queryset
-    }
-    queryset = (
-        PersonVote.objects.filter(
-            vote_event__legislative_session_id=session, voter__isnull=True
-        )
-        .values(name=F("voter_name"))
-        .annotate(num=Count("voter_name"))
-    )
-    report["unmatched_voters"] = {item["name"]: item["num"] for item in queryset}
+    from ..data.models import SessionDataQualityReport
+
+    with connection.cursor() as cursor:
+        cursor.execute(_SESSION_REPORT_SQL, {"session": session})
+        columns = [col[0] for col in cursor.description]
+        report = dict(zip(columns, cursor.fetchone()))
+    # Django leaves jsonb from raw queries undecoded
+    for field in _NAME_COUNT_FIELDS:
+        report[field] = json.loads(report[field])
 
     # atomically replace the report if it exists
     new_report = SessionDataQualityReport(legislative_session_id=session, **report)
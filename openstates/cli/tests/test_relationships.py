@@ -0,0 +1,24 @@
+import pytest  # type: ignore
+from openstates.data.models import Jurisdiction, Division, Bill, RelatedBill
+from openstates.cli.relationships import fix_abnormal_related_bill_identifiers
+
+
+@pytest.mark.django_db
+def test_fix_abnormal_related_bill_identifiers():
+    Division.objects.create(id="ocd-division/country:us", name="USA")
+    j = Jurisdiction.objects.create(id="jid", division_id="ocd-division/country:us")
+    session = j.legislative_sessions.create(identifier="1900", name="1900")
+    bill = Bill.objects.create(identifier="HB 1", title="One", legislative_session=session)
+    for identifier in ("A1675", "HB 2", "SJR5", "X"):
+        bill.related_bills.create(
+            identifier=identifier, legislative_session="1900", relation_type="companion"
+        )
+
+    assert fix_abnormal_related_bill_identifiers("jid", batch_size=1) == 2
+    assert sorted(RelatedBill.objects.values_list("identifier", flat=True)) == [
+        "A 1675",
+        "HB 2",
+        "SJR 5",
+        "X",
+    ]
+    assert fix_abnormal_related_bill_identifiers("jid") == 0
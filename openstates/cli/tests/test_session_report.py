@@ -1,5 +1,7 @@
 import pytest  # type: ignore
 import django  # type: ignore
+from django.db import connection  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
 from openstates.data.models import (
     Jurisdiction,
     Division,
@@ -249,3 +251,28 @@ def test_unmatched_voters():
     voter.save()
     report = generate_session_report(session)
     assert report.unmatched_voters == {"Wendy": 2}
+
+
+@pytest.mark.django_db
+def test_session_report_single_query():
+    session, org, person = create_data()
+    for n in range(3):
+        b = Bill.objects.create(
+            identifier=f"HB{n}", title="One", legislative_session_id=session
+        )
+        b.sponsorships.create(name="Wendy", entity_type="person")
+        vote = VoteEvent.objects.create(
+            legislative_session_id=session, motion_text="Passage", bill=b, organization=org
+        )
+        vote.votes.create(option="yes", voter_name="Roy")
+        vote.counts.create(option="yes", value=n)
+
+    with CaptureQueriesContext(connection) as queries:
+        report = generate_session_report(session)
+    # the report, and replacing the old one (a delete and an insert)
+    assert len([q for q in queries if "SAVEPOINT" not in q["sql"]]) == 3
+    assert report.bills_missing_actions == 3
+    assert report.votes_missing_no_count == 3
+    assert report.votes_with_bad_counts == 2
+    assert report.unmatched_sponsor_people == {"Wendy": 3}
+    assert report.unmatched_voters == {"Roy": 3}
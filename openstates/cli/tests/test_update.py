@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import pytest
+from unittest import mock
+from openstates import settings
+from openstates.cli.update import CHECKPOINT_NAME, do_import, do_scrape
+from openstates.exceptions import CommandError
+from openstates.scrape import Bill, State
+from openstates.scrape.base import Scraper
+
+
+class BillScraper(Scraper):
+    def scrape(self, session):
+        for n in range(3):
+            # records which process scraped it
+            b = Bill(f"HB {n}", session, str(os.getpid()), chamber="lower")
+            b.add_source("http://example.com")
+            yield b
+
+
+class NewJersey(State):
+    scrapers = {"bills": BillScraper}
+
+
+def make_args(**kwargs):
+    args = dict(
+        module="nj",
+        strict=True,
+        validation="strict",
+        fastmode=False,
+        realtime=False,
+        archive=False,
+        http_resilience=False,
+        session_parallelism=1,
+    )
+    args.update(kwargs)
+    return argparse.Namespace(**args)
+
+
+@pytest.mark.parametrize("session_parallelism", [1, 3])
+def test_do_scrape_sessions(tmp_path, session_parallelism):
+    with mock.patch.object(settings, "SCRAPED_DATA_DIR", str(tmp_path)), mock.patch.object(
+        settings, "CACHE_DIR", str(tmp_path / "cache")
+    ):
+        report = do_scrape(
+            NewJersey(),
+            make_args(session_parallelism=session_parallelism),
+            {"bills": {}},
+            {"2021", "2022", "2023"},
+        )
+
+    # reports of each session are merged
+    assert report["bills"]["objects"] == {"bill": 9}
+    assert report["bills"]["validation"] == {"mode": "strict", "validated": 9}
+    assert report["bills"]["start"] < report["bills"]["end"]
+
+    bills = []
+    for name in os.listdir(tmp_path / "nj"):
+        if name.startswith("bill_"):
+            with open(tmp_path / "nj" / name) as f:
+                bills.append(json.load(f))
+    assert sorted(b["legislative_session"] for b in bills) == sorted(
+        ["2021", "2022", "2023"] * 3
+    )
+    pids = {b["title"] for b in bills}
+    if session_parallelism > 1:
+        # scraped in worker processes
+        assert str(os.getpid()) not in pids
+    else:
+        assert pids == {str(os.getpid())}
+
+
+def test_do_scrape_clears_checkpoint(tmp_path):
+    from openstates.importers import BillImporter
+    from openstates.importers.checkpoint import ImportCheckpoint
+
+    # left behind by an import of an earlier scrape that didn't finish
+    datadir = tmp_path / "nj"
+    datadir.mkdir()
+    stale = json.dumps(["bill", {"json_to_db_id": {"old": "ocd-bill/old"}}]) + "\n"
+    (datadir / CHECKPOINT_NAME).write_text(stale)
+    (datadir / (CHECKPOINT_NAME + ".tmp")).write_text(stale)
+
+    with mock.patch.object(settings, "SCRAPED_DATA_DIR", str(tmp_path)), mock.patch.object(
+        settings, "CACHE_DIR", str(tmp_path / "cache")
+    ):
+        do_scrape(NewJersey(), make_args(), {"bills": {}}, {"2021"})
+
+    assert not [name for name in os.listdir(datadir) if name.startswith(CHECKPOINT_NAME)]
+    # so --resume on the new data starts over
+    checkpoint = ImportCheckpoint.load(str(datadir / CHECKPOINT_NAME))
+    importer = BillImporter("jid")
+    checkpoint.restore(importer)
+    assert checkpoint.state == {}
+    assert importer.json_to_db_id == {}
+
+
+def test_do_scrape_session_parallelism_realtime():
+    with pytest.raises(CommandError):
+        do_scrape(
+            NewJersey(),
+            make_args(session_parallelism=2, realtime=True),
+            {"bills": {}},
+            {"2021", "2022"},
+        )
+
+
+def test_do_import_force_full_diff_requires_skip_unchanged():
+    with pytest.raises(CommandError):
+        do_import(NewJersey(), make_args(force_full_diff=True, skip_unchanged=False))
@@ -1,4 +1,5 @@
 import argparse
+import concurrent.futures
 import contextlib
 import datetime
 import glob
@@ -7,6 +8,7 @@ import importlib
 import inspect
 import logging
 import logging.config
+import multiprocessing
 import os
 import sys
 import time
@@ -20,6 +22,7 @@ from django.db import transaction  # type: ignore
 from .. import settings, utils
 from ..exceptions import CommandError
 from ..scrape import JurisdictionScraper, State
+from ..scrape.validation import parse_validation_mode
 from ..utils.django import init_django
 from ..utils.instrument import Instrumentation
 from .reports import generate_session_report, print_report, save_report
@@ -35,6 +38,9 @@ BUCKET_NAME = os.environ.get("BUCKET_NAME", None)
 SCRAPE_LAKE_PREFIX = os.environ.get("BUCKET_PREFIX", "legislation")
 DAG_RUN_START = os.environ.get("DAG_RUN_START", None)
 
+# in the data dir, see --commit-every
+CHECKPOINT_NAME = "import_checkpoint.jsonl"
+
 
 class _Unset:
     pass
@@ -67,18 +73,56 @@ def get_jurisdiction(module_name: str) -> tuple[State, ModuleType]:
     raise CommandError(f"Unable to import State subclass from {module_name}")
 
 
+def _scrape_session(
+    ScraperCls: type,
+    juris: State,
+    datadir: str,
+    scraper_kwargs: dict[str, typing.Any],
+    scrape_args: dict[str, str],
+    session: str,
+) -> dict[str, typing.Any]:
+    """scrape one session with a new scraper, in a worker process with --session-parallelism"""
+    scraper = ScraperCls(juris, datadir, **scraper_kwargs)
+    partial_report = scraper.do_scrape(**scrape_args, session=session)
+    if scraper_kwargs["realtime"]:
+        scraper.upload_to_gcs_real_time(force_upload=True)
+    return partial_report
+
+
+def merge_scrape_report(
+    report: dict[str, typing.Any], partial_report: dict[str, typing.Any]
+) -> None:
+    """add the report of one session's scrape to the report of all of them"""
+    if not report["start"] or partial_report["start"] < report["start"]:
+        report["start"] = partial_report["start"]
+    if not report["end"] or partial_report["end"] > report["end"]:
+        report["end"] = partial_report["end"]
+    for obj, val in partial_report["objects"].items():
+        report["objects"][obj] += val
+    report["validation"]["validated"] += partial_report["validation"]["validated"]
+
+
 def do_scrape(
     juris: State,
     args: argparse.Namespace,
     scrapers: dict[str, dict[str, str]],
     active_sessions: set[str],
 ) -> dict[str, typing.Any]:
+    if args.session_parallelism > 1 and args.realtime:
+        # realtime uploads each type's JSONL and deletes it, from every process
+        raise CommandError("--session-parallelism can't be used with --realtime")
+
     # make output and cache dirs
     utils.makedirs(settings.CACHE_DIR)
     datadir = os.path.join(settings.SCRAPED_DATA_DIR, args.module)
     utils.makedirs(datadir)
-    # clear json from data dir
-    for f in glob.glob(datadir + "/*.json"):
+    # clear json (and bundles & their indexes, see importers.readers) from data dir,
+    # and the checkpoint of an import of the previous scrape, which --resume can't use
+    for f in (
+        glob.glob(datadir + "/*.json")
+        + glob.glob(datadir + "/scrape_bundle*")
+        + glob.glob(os.path.join(datadir, CHECKPOINT_NAME) + "*")
+    ):
         os.remove(f)
 
     report = {}
@@ -88,6 +132,7 @@ def do_scrape(
         juris,
         datadir,
         strict_validation=args.strict,
+        validation_mode=args.validation,
         fastmode=args.fastmode,
         realtime=args.realtime,
         file_archiving_enabled=args.archive,
@@ -121,49 +166,63 @@ def do_scrape(
                 "start": None,
                 "end": None,
                 "objects": defaultdict(int),
+                "validation": {"mode": args.validation, "validated": 0},
             }
-            for session in active_sessions:
-                # new scraper each time
-                scraper = ScraperCls(
-                    juris,
-                    datadir,
-                    strict_validation=args.strict,
-                    fastmode=args.fastmode,
-                    realtime=args.realtime,
-                    file_archiving_enabled=args.archive,
-                    http_resilience_mode=args.http_resilience,
-                )
-                partial_report = scraper.do_scrape(**scrape_args, session=session)
-                stats.write_stats(
-                    [
-                        {
-                            "metric": "session_scrapes",
-                            "fields": {"total": 1},
-                            "tags": {"jurisdiction": juris.name, "session": session},
-                        }
-                    ]
-                )
-                if not report[scraper_name]["start"]:
-                    report[scraper_name]["start"] = partial_report["start"]
-                report[scraper_name]["end"] = partial_report["end"]
-                for obj, val in partial_report["objects"].items():
-                    report[scraper_name]["objects"][obj] += val
-                stats.write_stats(
-                    [
-                        {
-                            "metric": "last_session_scrape",
-                            "fields": {"time": int(time.time())},
-                            "tags": {"jurisdiction": juris.name, "session": session},
-                        }
-                    ]
+            # new scraper each time
+            scraper_kwargs = dict(
+                strict_validation=args.strict,
+                validation_mode=args.validation,
+                fastmode=args.fastmode,
+                realtime=args.realtime,
+                file_archiving_enabled=args.archive,
+                http_resilience_mode=args.http_resilience,
+            )
+            sessions = list(active_sessions)
+            session_args = [
+                (ScraperCls, juris, datadir, scraper_kwargs, scrape_args, session)
+                for session in sessions
+            ]
+            if args.session_parallelism > 1 and len(session_args) > 1:
+                # forked, each process has its own scrapelib session & rate limit
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    min(args.session_parallelism, len(session_args)),
+                    mp_context=multiprocessing.get_context("fork"),
                 )
-                if args.realtime:
-                    scraper.upload_to_gcs_real_time(force_upload=True)
+                futures = [executor.submit(_scrape_session, *a) for a in session_args]
+                partial_reports = (future.result() for future in futures)
+            else:
+                executor = None
+                partial_reports = (_scrape_session(*a) for a in session_args)
+            try:
+                for session, partial_report in zip(sessions, partial_reports):
+                    stats.write_stats(
+                        [
+                            {
+                                "metric": "session_scrapes",
+                                "fields": {"total": 1},
+                                "tags": {"jurisdiction": juris.name, "session": session},
+                            }
+                        ]
+                    )
+                    merge_scrape_report(report[scraper_name], partial_report)
+                    stats.write_stats(
+                        [
+                            {
+                                "metric": "last_session_scrape",
+                                "fields": {"time": int(time.time())},
+                                "tags": {"jurisdiction": juris.name, "session": session},
+                            }
+                        ]
+                    )
+            finally:
+                if executor:
+                    executor.shutdown(cancel_futures=True)
         else:
             scraper = ScraperCls(
                 juris,
                 datadir,
                 strict_validation=args.strict,
+                validation_mode=args.validation,
                 fastmode=args.fastmode,
                 realtime=args.realtime,
                 file_archiving_enabled=args.archive,
@@ -240,9 +299,11 @@ def archive_to_cloud_storage(
             f"{SCRAPE_LAKE_PREFIX}/{jurisdiction_id}/{last_scrape_datetime}"
         )
 
-        # read files in directory and upload
+        # read files (and bundles, see scrape.bundle) in directory and upload
         files_count = 0
-        for file_path in glob.glob(datadir + "/*.json"):
+        for file_path in glob.glob(datadir + "/*.json") + glob.glob(
+            datadir + "/scrape_bundle*"
+        ):
             files_count += 1
             blob_name = os.path.join(destination_prefix, os.path.basename(file_path))
             blob = bucket.blob(blob_name)
@@ -266,51 +327,126 @@ def archive_to_cloud_storage(
 def do_import(juris: State, args: argparse.Namespace) -> dict[str, typing.Any]:
     # import inside here because to avoid loading Django code unnecessarily
     from openstates.data.models import Jurisdiction as DatabaseJurisdiction
+    from openstates.data.models import SessionDataQualityReport
     from openstates.importers import (
         BillImporter,
         EventImporter,
         JurisdictionImporter,
         VoteEventImporter,
     )
+    from openstates.importers.checkpoint import ImportCheckpoint
+    from openstates.importers.diff import ImportDiff
+    from openstates.importers.pipeline import ImportPipeline
+    from openstates.importers.readers import DirectoryReader
+
+    if args.force_full_diff and not args.skip_unchanged:
+        raise CommandError("--force-full-diff requires --skip-unchanged")
 
     datadir = os.path.join(settings.SCRAPED_DATA_DIR, args.module)
+    # lists the directory once for all of the importers
+    reader = DirectoryReader(datadir)
 
     juris_importer = JurisdictionImporter(juris.jurisdiction_id)
     bill_importer = BillImporter(juris.jurisdiction_id)
     vote_event_importer = VoteEventImporter(juris.jurisdiction_id, bill_importer)
     event_importer = EventImporter(juris.jurisdiction_id, vote_event_importer)
+    import_order = (juris_importer, bill_importer, vote_event_importer, event_importer)
+    for importer in (bill_importer, vote_event_importer, event_importer):
+        importer.bulk_loader = args.bulk_loader
+    for importer in import_order:
+        importer.defer_signals = args.defer_signals
     report = {}
 
-    with transaction.atomic():
+    # with --commit-every, each chunk is committed and checkpointed by the importers
+    checkpoint = None
+    checkpoint_kwargs: dict[str, typing.Any] = {}
+    if args.commit_every:
+        checkpoint_path = os.path.join(datadir, CHECKPOINT_NAME)
+        if args.resume:
+            checkpoint = ImportCheckpoint.load(checkpoint_path)
+            for importer in import_order:
+                checkpoint.restore(importer)
+        else:
+            checkpoint = ImportCheckpoint(checkpoint_path)
+        checkpoint_kwargs = {"chunk_size": args.commit_every, "checkpoint": checkpoint}
+    elif args.resume:
+        raise CommandError("--resume requires --commit-every")
+
+    # with --dry-run, changes are written to a diff and the transaction is rolled back
+    diff = None
+    if args.dry_run:
+        if checkpoint:
+            raise CommandError("--dry-run can't be used with --commit-every")
+        diff_path = os.path.join(datadir, "import_diff.jsonl")
+        diff = ImportDiff(diff_path)
+        checkpoint_kwargs["diff"] = diff
+
+    pipeline = None
+    if args.import_workers:
+        # workers read & transform each type while the types before it are imported
+        pipeline = ImportPipeline(reader, import_order, args.import_workers)
+
+    def import_type(importer: typing.Any, **kwargs: typing.Any) -> dict[str, typing.Any]:
+        if pipeline:
+            return importer.import_data(pipeline.stream(importer._type), **kwargs)
+        return importer.import_directory(datadir, reader=reader, **kwargs)
+
+    import_kwargs = {
+        "allow_duplicates": args.allow_duplicates,
+        "chunk_size": args.import_chunk_size,
+        "skip_unchanged": args.skip_unchanged,
+        "force_full_diff": args.force_full_diff,
+        **checkpoint_kwargs,
+    }
+    import_transaction = contextlib.nullcontext if checkpoint else transaction.atomic
+
+    with pipeline or contextlib.nullcontext(), import_transaction():
         logger.info("import jurisdictions...")
-        report.update(juris_importer.import_directory(datadir))
+        report.update(import_type(juris_importer, **checkpoint_kwargs))
         logger.info("import bills...")
-        report.update(
-            bill_importer.import_directory(
-                datadir, allow_duplicates=args.allow_duplicates
-            )
-        )
+        report.update(import_type(bill_importer, **import_kwargs))
         logger.info("import vote events...")
-        report.update(
-            vote_event_importer.import_directory(
-                datadir, allow_duplicates=args.allow_duplicates
-            )
-        )
+        report.update(import_type(vote_event_importer, **import_kwargs))
         logger.info("import events...")
-        report.update(
-            event_importer.import_directory(
-                datadir, allow_duplicates=args.allow_duplicates
-            )
-        )
+        report.update(import_type(event_importer, **import_kwargs))
         DatabaseJurisdiction.objects.filter(id=juris.jurisdiction_id).update(
             latest_bill_update=datetime.datetime.utcnow()
         )
+        if diff:
+            # lookups like event locations can still have been created
+            transaction.set_rollback(True)
+
+    if diff:
+        diff.close()
+        logger.info(
+            "dry run, wrote %s to %s",
+            ", ".join(
+                f"{num} {_type} {action}"
+                for (_type, action), num in sorted(diff.counts.items())
+            )
+            or "no changes",
+            diff_path,
+        )
+        return report
+
+    if checkpoint:
+        # everything is imported, a later run starts over
+        checkpoint.clear()
 
     # compile info on all sessions that were updated in this run
     seen_sessions = set()
     seen_sessions.update(bill_importer.get_seen_sessions())
     seen_sessions.update(vote_event_importer.get_seen_sessions())
-    for session in seen_sessions:
+    # a session's existing report is still current if none of its bills or votes changed
+    changed_sessions = set()
+    changed_sessions.update(bill_importer.get_changed_sessions())
+    changed_sessions.update(vote_event_importer.get_changed_sessions())
+    reported_sessions = set(
+        SessionDataQualityReport.objects.filter(
+            legislative_session_id__in=seen_sessions
+        ).values_list("legislative_session_id", flat=True)
+    )
+    for session in changed_sessions | (seen_sessions - reported_sessions):
         generate_session_report(session)
 
     return report
@@ -466,7 +602,8 @@ def do_update(
         report["success"] = False
         report["exception"] = exc
         report["traceback"] = traceback.format_exc()
-        if "import" in args.actions:
+        # a dry run didn't import anything to report on
+        if "import" in args.actions and not args.dry_run:
             save_report(report, juris.jurisdiction_id)
         raise
     else:
@@ -515,14 +652,41 @@ def do_update(
                         }
                     ]
                 )
+            stats.write_stats(
+                [
+                    {
+                        "metric": "import_stage",
+                        "fields": {
+                            "wall": times["wall"],
+                            "cpu": times["cpu"],
+                            "queries": times["queries"],
+                        },
+                        "tags": {
+                            "jurisdiction": juris.name,
+                            "scrape_type": scrape_type,
+                            "stage": stage,
+                        },
+                    }
+                    for stage, times in details.get("stages", {}).items()
+                ]
+            )
 
-        if "import" in args.actions:
+        # a dry run didn't import anything to report on
+        if "import" in args.actions and not args.dry_run:
             save_report(report, juris.jurisdiction_id)
 
         print_report(report)
         return report
 
 
+def validation_mode(mode: str) -> str:
+    try:
+        parse_validation_mode(mode)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return mode
+
+
 def parse_args() -> tuple[argparse.Namespace, list[str]]:
     parser = argparse.ArgumentParser("openstates", description="openstates CLI")
     parser.add_argument("--debug", action="store_true", help="open debugger on error")
@@ -553,6 +717,16 @@ def parse_args() -> tuple[argparse.Namespace, list[str]]:
         dest="strict",
         help="skip validation on save",
     )
+    parser.add_argument(
+        "--validation",
+        type=validation_mode,
+        default="strict",
+        help=(
+            "strict validates each object as it's saved, deferred validates them in "
+            "worker processes and reports errors at the end of the scrape, sampled:N%% "
+            "validates N%% of them"
+        ),
+    )
     parser.add_argument(
         "--allow_duplicates",
         action="store_true",
@@ -562,6 +736,80 @@ def parse_args() -> tuple[argparse.Namespace, list[str]]:
     parser.add_argument(
         "--fastmode", action="store_true", help="use cache and turn off throttling"
     )
+    parser.add_argument(
+        "--session-parallelism",
+        type=int,
+        default=1,
+        dest="session_parallelism",
+        help=(
+            "scrape up to N active sessions at once in separate processes, when a "
+            "scraper takes a session and none is given"
+        ),
+    )
+
+    # importer arguments
+    parser.add_argument(
+        "--import-chunk-size",
+        type=int,
+        dest="import_chunk_size",
+        help="look up existing objects N at a time during import instead of one by one",
+    )
+    parser.add_argument(
+        "--bulk-loader",
+        choices=("bulk_create", "copy"),
+        default="bulk_create",
+        help="how related objects are written, copy uses PostgreSQL's COPY FROM STDIN",
+    )
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        dest="skip_unchanged",
+        help="skip diffing objects whose data hasn't changed since they were last imported",
+    )
+    parser.add_argument(
+        "--force-full-diff",
+        action="store_true",
+        dest="force_full_diff",
+        help="with --skip-unchanged, diff every object anyway and refresh the stored hashes",
+    )
+    parser.add_argument(
+        "--import-workers",
+        type=int,
+        dest="import_workers",
+        help="parse scraped JSON with N worker processes while importing",
+    )
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        dest="commit_every",
+        help=(
+            "commit the import every N objects (instead of --import-chunk-size chunks) "
+            "and save a checkpoint that --resume can continue from"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="with --commit-every, continue the import from its last checkpoint",
+    )
+    parser.add_argument(
+        "--defer-signals",
+        action="store_true",
+        dest="defer_signals",
+        help=(
+            "send a batched objects_imported signal for each type once the import "
+            "commits, instead of a post_save for each inserted object"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        dest="dry_run",
+        help=(
+            "import without changing the database, writing the changes the import "
+            "would make to import_diff.jsonl in the data directory"
+        ),
+    )
 
     # settings overrides
     parser.add_argument("--datadir", help="data directory", dest="SCRAPED_DATA_DIR")
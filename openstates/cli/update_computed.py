@@ -5,19 +5,13 @@ from ..utils.django import init_django
 
 
 def update_bill_fields_for_state(abbr: str) -> None:
-    from ..data.models import Bill
-    from ..importers.computed_fields import update_bill_fields
+    from ..importers.computed_fields import update_bill_fields_in_bulk
 
     state = metadata.lookup(abbr=abbr)
 
     with transaction.atomic():
-        bills = Bill.objects.filter(
-            legislative_session__jurisdiction=state.jurisdiction_id
-        )
-
-        with click.progressbar(bills, label=f"updating {abbr} bills") as bills_p:
-            for bill in bills_p:
-                update_bill_fields(bill, save=True)
+        updated = update_bill_fields_in_bulk(jurisdiction_id=state.jurisdiction_id)
+    click.echo(f"updated {updated} {abbr} bills")
 
 
 @click.command()
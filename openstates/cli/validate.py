@@ -1,13 +1,7 @@
 import click
 import json
-import datetime
 import jsonschema
-from jsonschema import validate, Draft3Validator
-from ..scrape.schemas.bill import schema as bill_schema
-from ..scrape.schemas.event import schema as event_schema
-from ..scrape.schemas.jurisdiction import schema as jurisdiction_schema
-from ..scrape.schemas.organization import schema as organization_schema
-from ..scrape.schemas.vote_event import schema as vote_event_schema
+from ..scrape.validation import SCHEMAS, get_validator
 
 
 @click.command()
@@ -22,32 +16,16 @@ def main(
     with open(filepath) as json_file:
         entity_instance = json.load(json_file)
 
-    schema = None
-    if scraper_entity_type == "bill":
-        schema = bill_schema
-    elif scraper_entity_type == "event":
-        schema = event_schema
-    elif scraper_entity_type == "jurisdiction":
-        schema = jurisdiction_schema
-    elif scraper_entity_type == "organization":
-        schema = organization_schema
-    elif scraper_entity_type == "vote_event":
-        schema = vote_event_schema
+    if scraper_entity_type not in SCHEMAS:
+        raise click.BadParameter(
+            "must be one of " + ", ".join(SCHEMAS), param_hint="scraper_entity_type"
+        )
 
-    # See openstates/scrape/base.py for source of this validation code
-    type_checker = Draft3Validator.TYPE_CHECKER.redefine(
-        "datetime", lambda c, d: isinstance(d, (datetime.date, datetime.datetime))
-    )
-    type_checker = type_checker.redefine(
-        "date",
-        lambda c, d: (
-            isinstance(d, datetime.date) and not isinstance(d, datetime.datetime)
-        ),
-    )
-    ValidatorCls = jsonschema.validators.extend(
-        Draft3Validator, type_checker=type_checker
-    )
-    validate(instance=entity_instance, schema=schema, cls=ValidatorCls)  # type: ignore
+    # the same validator scraped objects are validated with, see openstates/scrape/validation.py
+    validator = get_validator(SCHEMAS[scraper_entity_type])
+    error = jsonschema.exceptions.best_match(validator.iter_errors(entity_instance))
+    if error is not None:
+        raise error
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0045_auto_20240705_1812'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportHash',
+            fields=[
+                ('object_id', models.CharField(max_length=300, primary_key=True, serialize=False)),
+                ('object_type', models.CharField(choices=[('jurisdiction', 'Jurisdiction'), ('person', 'Person'), ('organization', 'Organization'), ('post', 'Post'), ('membership', 'Membership'), ('bill', 'Bill'), ('vote_event', 'VoteEvent'), ('event', 'Event')], max_length=20)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'pupa_importhash',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='importhash',
+            index=models.Index(fields=['object_type', 'content_hash'], name='pupa_import_object__e25b63_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.14 on 2026-10-18 20:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0046_importhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importobjects',
+            name='stages',
+            field=models.JSONField(default=dict),
+        ),
+    ]
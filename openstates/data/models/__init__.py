@@ -44,5 +44,6 @@ from .reports import (
     ScrapeReport,
     ScrapeObjects,
     ImportObjects,
+    ImportHash,
     SessionDataQualityReport,
 )
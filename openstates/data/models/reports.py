@@ -60,11 +60,26 @@ class ImportObjects(models.Model):
     noop_count = models.PositiveIntegerField()
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
+    # stage name mapped to its calls, wall & cpu seconds and queries
+    stages = models.JSONField(default=dict)
 
     class Meta:
         db_table = "pupa_importobjects"
 
 
+class ImportHash(models.Model):
+    """hash of the data an object was last imported from, used to skip unchanged objects"""
+
+    object_id = models.CharField(max_length=300, primary_key=True)
+    object_type = models.CharField(max_length=20, choices=OBJECT_TYPES)
+    content_hash = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "pupa_importhash"
+        indexes = [models.Index(fields=["object_type", "content_hash"])]
+
+
 class SessionDataQualityReport(models.Model):
     legislative_session = models.ForeignKey(
         LegislativeSession, on_delete=models.CASCADE
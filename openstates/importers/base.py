@@ -1,18 +1,25 @@
-import os
-import copy
-import glob
-import json
+import contextlib
 import logging
 import re
 import typing
-from datetime import datetime
+from collections import Counter
+from django.db import connection, transaction
 from django.db.models import Q, Model
 from django.db.models.signals import post_save
 from .. import settings
-from ..data.models import LegislativeSession, Person, Bill
+from ..data.models import LegislativeSession, Person, ImportHash
 from ..exceptions import DuplicateItemError, UnresolvedIdError, DataImportError
-from ..utils import get_pseudo_id, utcnow
+from ..utils import fingerprint, get_pseudo_id, utcnow
 from ._types import _ID, _JsonDict, _RelatedModels, _TransformerMapping
+from .checkpoint import ImportCheckpoint
+from .profiling import ImportProfiler
+from .readers import DirectoryReader
+from .related import RELATED_WRITERS
+from .resolvers import LEGISLATIVE_CLASSIFICATIONS, PersonIndex, SessionBillIndex
+from .signals import objects_imported
+
+if typing.TYPE_CHECKING:
+    from .diff import ImportDiff
 
 _PersonCacheKey = typing.Tuple[str, typing.Optional[str], typing.Optional[str]]
 
@@ -29,26 +36,157 @@ def omnihash(obj: typing.Any) -> int:
         return hash(obj)
 
 
-def _match(
-    dbitem: Model,
-    jsonitem: _JsonDict,
-    keys: typing.Iterable[str],
-    subfield_dict: typing.Dict[str, typing.Any],
-) -> bool:
-    # check if all keys (excluding subfields) match
-    for k in keys:
-        if k not in subfield_dict and getattr(dbitem, k) != jsonitem.get(k, None):
-            return False
+def prepared_json_default(obj: typing.Any) -> typing.Any:
+    """JSON serialization of values in prepared import data that JSON doesn't have"""
+    # prepare_for_db can put model instances (e.g. an EventLocation) in the data
+    if isinstance(obj, Model):
+        return obj.pk
+    return str(obj)
+
+
+def content_hash(data: _JsonDict) -> str:
+    """stable hash of prepared import data, used to detect unchanged objects"""
+    return fingerprint(data, default=prepared_json_default)
+
+
+_Transform = typing.Callable[[typing.Any], typing.Any]
+
+
+def compile_transformers(transformers: _TransformerMapping) -> _Transform:
+    """
+    turn a transformer mapping (see IMPORT_TRANSFORMERS) into a single function
+
+    the mapping is only walked once, the function applies each key's transformers
+    directly (to every item of lists) and returns the data it was given
+    """
+    steps: typing.List[typing.Tuple[str, _Transform]] = []
+    for key, key_transformers in transformers.items():
+        if isinstance(key_transformers, list):
+            steps.append((key, _chain(key_transformers)))
+        elif isinstance(key_transformers, dict):
+            steps.append((key, compile_transformers(key_transformers)))
+        else:
+            steps.append((key, key_transformers))
+
+    def transform(data: typing.Any) -> typing.Any:
+        if isinstance(data, list):
+            for item in data:
+                transform(item)
+        else:
+            for key, step in steps:
+                if key in data:
+                    data[key] = step(data[key])
+        return data
+
+    return transform
+
+
+def _chain(funcs: typing.List[_Transform]) -> _Transform:
+    if len(funcs) == 1:
+        return funcs[0]
+
+    def chained(value: typing.Any) -> typing.Any:
+        for func in funcs:
+            value = func(value)
+        return value
+
+    return chained
+
+
+def pop_json_id(_type: str, data: _JsonDict) -> str:
+    """take the JSON _id (and other fields that aren't part of the data) off an item"""
+    if _type == "vote_event":
+        data.pop("bill_identifier", None)
+    return data.pop("_id")
+
+
+class TransformedItem(dict):
+    """
+    an item that was read ahead of its import (see ImportPipeline) by transform_item
 
-    # all fields match so far, possibly equal, just check subfields now
-    for k in subfield_dict:
-        jsonsubitems = jsonitem[k]
-        dbsubitems = list(getattr(dbitem, k).all())
-        if items_differ(jsonsubitems, dbsubitems, subfield_dict[k][2]):
-            return False
+    the dict is the item as it is after apply_transformers, json_id its JSON _id and
+    fingerprint what _prepare_imports maps duplicates with
+    """
 
-    # if we got here, item values match
-    return True
+    json_id: str
+    fingerprint: str
+
+
+def transform_item(_type: str, data: _JsonDict, transform: _Transform) -> TransformedItem:
+    """do the parts of importing an item that don't need the database, see prepare_item"""
+    json_id = pop_json_id(_type, data)
+    objhash = fingerprint(data)
+    data.pop("jurisdiction", None)
+    data.pop("scraped_at", None)
+    item = TransformedItem(transform(data))
+    item.json_id = json_id
+    item.fingerprint = objhash
+    return item
+
+
+# (keys to compare, {subfield: (ordered, plan for subfield)})
+_DiffPlan = typing.Tuple[typing.List[str], typing.Dict[str, typing.Tuple[bool, typing.Any]]]
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    """turn a JSON-ish value into a hashable value that compares the same way"""
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    elif isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _diff_plan(
+    jsonitems: typing.List[_JsonDict], subfield_dict: typing.Dict[str, typing.Any]
+) -> _DiffPlan:
+    # compare on every key that appears in the json (missing keys are compared as None)
+    keys: typing.Dict[str, None] = {}
+    for item in jsonitems:
+        for k in item:
+            if k not in subfield_dict:
+                keys[k] = None
+
+    subplans = {}
+    for k, (Subtype, _, subsubdict) in subfield_dict.items():
+        subitems = [sub for item in jsonitems for sub in item.get(k, [])]
+        subplans[k] = (
+            hasattr(Subtype, "order"),
+            _diff_plan(subitems, subsubdict),
+        )
+    return list(keys), subplans
+
+
+def _json_multiset(
+    jsonitems: typing.List[_JsonDict], plan: _DiffPlan, ordered: bool
+) -> typing.Counter[typing.Hashable]:
+    keys, subplans = plan
+    return Counter(
+        (i if ordered else None,)
+        + tuple(_freeze(item.get(k)) for k in keys)
+        + tuple(
+            frozenset(_json_multiset(item.get(k, []), subplan, subordered).items())
+            for k, (subordered, subplan) in subplans.items()
+        )
+        for i, item in enumerate(jsonitems)
+    )
+
+
+def _db_multiset(
+    dbitems: typing.Iterable[Model], plan: _DiffPlan
+) -> typing.Counter[typing.Hashable]:
+    keys, subplans = plan
+    return Counter(
+        (getattr(item, "order", None),)
+        + tuple(_freeze(getattr(item, k)) for k in keys)
+        + tuple(
+            frozenset(_db_multiset(getattr(item, k).all(), subplan).items())
+            for k, (_, subplan) in subplans.items()
+        )
+        for item in dbitems
+    )
 
 
 def items_differ(
@@ -56,7 +194,12 @@ def items_differ(
     dbitems: typing.List[Model],
     subfield_dict: _JsonDict,
 ) -> bool:
-    """check whether or not jsonitems and dbitems differ"""
+    """check whether or not jsonitems and dbitems differ
+
+    each item (and each of its subfields, recursively) is turned into a hashable tuple
+    and the two sides are compared as multisets, items with an order are also compared
+    by position
+    """
 
     # short circuit common cases
     if len(jsonitems) == len(dbitems) == 0:
@@ -66,41 +209,9 @@ def items_differ(
         # if lengths differ, they're definitely different
         return True
 
-    original_jsonitems = jsonitems
-    jsonitems = copy.deepcopy(jsonitems)
-    keys = jsonitems[0].keys()
-
-    # go over dbitems looking for matches
-    for dbitem in dbitems:
-        order = getattr(dbitem, "order", None)
-
-        match = None
-
-        # if we have an order, we can just check one item
-        if order is not None:
-            # use original so that pop calls don't affect ordering
-            if not _match(dbitem, original_jsonitems[order], keys, subfield_dict):
-                # short circuit if there isn't a match in the right spot
-                return True
-
-        # need to get position of match to remove
-        for i, jsonitem in enumerate(jsonitems):
-            if _match(dbitem, jsonitem, keys, subfield_dict):
-                match = i
-
-        if match is not None:
-            # item exists in both, remove from jsonitems
-            jsonitems.pop(match)
-        else:
-            # exists in db but not json
-            return True
-
-    # if we get here, jsonitems has to be empty because we asserted that the length was
-    # the same and we found a match for each thing in dbitems, here's a safety check just in case
-    if jsonitems:  # pragma: no cover
-        return True
-
-    return False
+    plan = _diff_plan(jsonitems, subfield_dict)
+    ordered = getattr(dbitems[0], "order", None) is not None
+    return _json_multiset(jsonitems, plan, ordered) != _db_multiset(dbitems, plan)
 
 
 class BaseImporter:
@@ -108,6 +219,8 @@ class BaseImporter:
 
     Override:
         get_object(data)
+        get_object_key(data)            [optional, required for chunked imports]
+        get_objects(data_items)         [optional, required for chunked imports]
         limit_spec(spec)                [optional, required if pseudo_ids are used]
         prepare_for_db(data)            [optional]
         postimport()                    [optional]
@@ -119,16 +232,50 @@ class BaseImporter:
     related_models: _RelatedModels = {}
     preserve_order: typing.Set[str] = set()
     merge_related: typing.Dict[str, typing.List[str]] = {}
+    # how related objects are written, one of related.RELATED_WRITERS
+    bulk_loader = "bulk_create"
+    # send objects_imported for all the objects after commit, instead of a post_save each
+    defer_signals = False
     cached_transformers: _TransformerMapping = {}
+    _compiled_for: typing.Optional[_TransformerMapping] = None
+    _compiled_transformers: _Transform
 
     def __init__(self, jurisdiction_id: str, do_postimport=True) -> None:
         self.jurisdiction_id = jurisdiction_id
         self.do_postimport = do_postimport
         self.json_to_db_id: typing.Dict[str, _ID] = {}
+        # reverse of json_to_db_id, for checking if a db object was already imported
+        self.db_to_json_id: typing.Dict[_ID, str] = {}
         self.duplicates: typing.Dict[str, str] = {}
+        # json ids already imported by the run a checkpoint was restored from
+        self.resumed_ids: typing.Set[str] = set()
+        self.last_json_id: typing.Optional[str] = None
         self.pseudo_id_cache: typing.Dict[str, typing.Optional[_ID]] = {}
+        # objects preloaded by get_objects() for the chunk currently being imported
+        self.object_cache: typing.Dict[typing.Hashable, typing.Optional[Model]] = {}
+        # content hash bookkeeping, see import_data(skip_unchanged=True)
+        self.record_hashes = False
+        self.check_hashes = False
+        self.unchanged_cache: typing.Dict[str, typing.Optional[_ID]] = {}
+        self.pending_hashes: typing.Dict[_ID, str] = {}
+        # objects changed by an import that doesn't record hashes, their stored hash is stale
+        self.stale_hashes: typing.Set[_ID] = set()
+        # related objects are buffered, and written after each item or each chunk
+        self.related_writer = RELATED_WRITERS[self.bulk_loader]()
+        self.defer_related = False
+        # time & queries spent in each stage of the import, see import_data
+        self.profiler = ImportProfiler()
+        # set for a dry run, which writes the changes it would make here instead
+        self.diff: typing.Optional["ImportDiff"] = None
+        # with defer_signals, ids for objects_imported, by whether they were created
+        self.imported_ids: typing.Dict[bool, typing.List[_ID]] = {True: [], False: []}
         self.person_cache: typing.Dict[_PersonCacheKey, typing.Optional[str]] = {}
+        # loaded on first use, see resolve_person
+        self.person_index: typing.Optional[PersonIndex] = None
+        self.bill_index: typing.Optional[SessionBillIndex] = None
         self.session_cache: typing.Dict[str, LegislativeSession] = {}
+        # ids of sessions with objects inserted, updated or deleted by this import
+        self.changed_sessions: typing.Set[str] = set()
         # Get all_session_cache is a list of all sessions available for this jurisdiction.
         # It is different from session_cache: which is a dictionary session(s) that is loaded a session
         # session_cache may not contain all jurisdiction legislative sessions while all_session_cache will.
@@ -164,6 +311,19 @@ class BaseImporter:
     def get_object(self, object: _JsonDict) -> Model:
         raise NotImplementedError()
 
+    def get_object_key(self, data: _JsonDict) -> typing.Optional[typing.Hashable]:
+        """natural key that get_objects() uses to map prepared data to an object
+
+        returning None means the item can't be preloaded and get_object() is used
+        """
+        return None
+
+    def get_objects(
+        self, data_items: typing.List[_JsonDict]
+    ) -> typing.Iterable[typing.Tuple[typing.Hashable, Model]]:
+        """load existing objects for a chunk of prepared data as (key, object) pairs"""
+        raise NotImplementedError()
+
     # no-ops to be overriden
     def prepare_for_db(self, data: _JsonDict) -> _JsonDict:
         return data
@@ -178,30 +338,15 @@ class BaseImporter:
         bill_transform_func = settings.IMPORT_TRANSFORMERS.get("bill", {}).get(
             "identifier", None
         )
-        all_sessions = self.get_all_sessions()
         if bill_transform_func:
             bill_id = bill_transform_func(bill_id)
 
         # Some steps here to first find the session that matches the incoming entity using the entity date
         # If a unique session is not found, then use the session with the latest "start_date"
-        date = datetime.fromisoformat(date).strftime("%Y-%m-%d")
-        session_ids = [
-            session.id
-            for session in all_sessions
-            if session.start_date <= date
-            and (session.end_date >= date or not session.end_date)
-        ]
-
-        if len(session_ids) == 1:
-            session_id = session_ids.pop()
-        else:
-            session_id = all_sessions[0].id if all_sessions else None
-
-        objects = Bill.objects.filter(
-            legislative_session__id=session_id,
-            identifier=bill_id,
-        )
-        ids = {each.id for each in objects}
+        if self.bill_index is None:
+            self.bill_index = SessionBillIndex(self.get_all_sessions())
+        date, session_id = self.bill_index.session_for_date(date)
+        ids = set(self.bill_index.bill_ids(session_id, bill_id))
 
         if len(ids) == 1:
             return ids.pop()
@@ -213,6 +358,15 @@ class BaseImporter:
             )
         return None
 
+    def match_pseudo_id(self, spec: _JsonDict) -> typing.Set[_ID]:
+        """ids of all objects matching a pseudo id's spec"""
+        spec = self.limit_spec(spec)
+        if isinstance(spec, Q):
+            objects = self.model_class.objects.filter(spec)
+        else:
+            objects = self.model_class.objects.filter(**spec)
+        return {each.id for each in objects}
+
     def resolve_json_id(
         self, json_id: str, allow_no_match: bool = False
     ) -> typing.Optional[_ID]:
@@ -235,14 +389,7 @@ class BaseImporter:
         if json_id.startswith("~"):
             # keep caches of all the pseudo-ids to avoid doing 1000s of lookups during import
             if json_id not in self.pseudo_id_cache:
-                spec = get_pseudo_id(json_id)
-                spec = self.limit_spec(spec)
-
-                if isinstance(spec, Q):
-                    objects = self.model_class.objects.filter(spec)
-                else:
-                    objects = self.model_class.objects.filter(**spec)
-                ids = {each.id for each in objects}
+                ids = self.match_pseudo_id(get_pseudo_id(json_id))
                 if len(ids) == 1:
                     self.pseudo_id_cache[json_id] = ids.pop()
                     errmsg = None
@@ -275,17 +422,32 @@ class BaseImporter:
             raise UnresolvedIdError("cannot resolve id: {}".format(json_id))
 
     def import_directory(
-        self, datadir: str, allow_duplicates=False
+        self,
+        datadir: str,
+        allow_duplicates=False,
+        chunk_size: typing.Optional[int] = None,
+        skip_unchanged=False,
+        force_full_diff=False,
+        checkpoint: typing.Optional[ImportCheckpoint] = None,
+        reader: typing.Optional[DirectoryReader] = None,
+        diff: typing.Optional["ImportDiff"] = None,
     ) -> typing.Dict[str, typing.Dict]:
-        """import a JSON directory into the database"""
-
-        def json_stream() -> typing.Iterator[_JsonDict]:
-            # load all json, mapped by json_id
-            for fname in glob.glob(os.path.join(datadir, self._type + "_*.json")):
-                with open(fname) as f:
-                    yield json.load(f)
+        """import a JSON directory into the database
 
-        return self.import_data(json_stream(), allow_duplicates)
+        reader can be shared between importers, so the directory is only listed once
+        """
+        if reader is None:
+            reader = DirectoryReader(datadir)
+
+        return self.import_data(
+            reader.read(self._type),
+            allow_duplicates,
+            chunk_size=chunk_size,
+            skip_unchanged=skip_unchanged,
+            force_full_diff=force_full_diff,
+            checkpoint=checkpoint,
+            diff=diff,
+        )
 
     def _prepare_imports(
         self, dicts: typing.Iterable[_JsonDict]
@@ -298,23 +460,160 @@ class BaseImporter:
         # hash(json): id
         seen_hashes = {}
 
-        for data in dicts:
-            json_id = data.pop("_id")
-            if self._type == "vote_event":
-                data.pop("bill_identifier", None)
-
-            # map duplicates (using omnihash to tell if json dicts are identical-ish)
-            objhash = omnihash(data)
+        for data in self.profiler.iterate("read", dicts):
+            if isinstance(data, TransformedItem):
+                json_id, objhash = data.json_id, data.fingerprint
+            else:
+                json_id = pop_json_id(self._type, data)
+                # map duplicates (using fingerprint to tell if json dicts are identical-ish)
+                with self.profiler.stage("dedupe"):
+                    objhash = fingerprint(data)
             if objhash not in seen_hashes:
                 seen_hashes[objhash] = json_id
-                yield json_id, data
+                if json_id not in self.resumed_ids:
+                    yield json_id, data
             else:
                 self.duplicates[json_id] = seen_hashes[objhash]
 
+    def _prepare_chunks(
+        self, dicts: typing.Iterable[_JsonDict], chunk_size: int
+    ) -> typing.Iterator[typing.List[typing.Tuple[str, typing.Optional[_JsonDict]]]]:
+        """split the import stream into chunks of prepared items, preloading their objects"""
+        chunk: typing.List[typing.Tuple[str, typing.Optional[_JsonDict]]] = []
+
+        def flush() -> typing.List[typing.Tuple[str, typing.Optional[_JsonDict]]]:
+            self.object_cache = {}
+            self.unchanged_cache = {}
+            prepared = [data for _, data in chunk if data is not None]
+            with self.profiler.stage("prepare"):
+                self.prepare_chunk(prepared)
+            with self.profiler.stage("lookup"):
+                if prepared and self.check_hashes:
+                    prepared = self.preload_unchanged(prepared)
+                if prepared:
+                    self.preload_objects(prepared)
+            return chunk
+
+        for json_id, data in self._prepare_imports(dicts):
+            chunk.append((json_id, self.prepare_item(data)))
+            if len(chunk) >= chunk_size:
+                yield flush()
+                chunk = []
+        if chunk:
+            yield flush()
+
+    def preload_objects(self, data_items: typing.List[_JsonDict]) -> None:
+        """fill object_cache for a chunk of prepared items
+
+        keys that don't match an object are cached as None so get_object() isn't called,
+        keys matching more than one object are left out so get_object() raises as usual
+        """
+        keys = {}
+        for data in data_items:
+            key = self.get_object_key(data)
+            if key is not None:
+                keys[key] = data
+        if not keys:
+            return
+
+        found: typing.Dict[typing.Hashable, typing.List[Model]] = {}
+        for key, obj in self.get_objects(list(keys.values())):
+            found.setdefault(key, []).append(obj)
+
+        for key in keys:
+            objs = found.get(key, [])
+            if len(objs) <= 1:
+                self.object_cache[key] = objs[0] if objs else None
+
+    def preload_unchanged(self, data_items: typing.List[_JsonDict]) -> typing.List[_JsonDict]:
+        """fill unchanged_cache for a chunk of prepared items
+
+        returns the items that weren't found unchanged and need a full import
+        """
+        hashes = {content_hash(data): data for data in data_items}
+        found: typing.Dict[str, typing.List[_ID]] = {}
+        for object_id, chash in self._unchanged_objects(hashes):
+            found.setdefault(chash, []).append(object_id)
+
+        remaining = []
+        for chash, data in hashes.items():
+            ids = found.get(chash, [])
+            self.unchanged_cache[chash] = ids[0] if len(ids) == 1 else None
+            if len(ids) != 1:
+                remaining.append(data)
+        return remaining
+
+    def _unchanged_objects(
+        self, hashes: typing.Iterable[str]
+    ) -> typing.Iterable[typing.Tuple[_ID, str]]:
+        # only count hashes whose object still exists
+        return ImportHash.objects.filter(
+            object_type=self._type,
+            content_hash__in=hashes,
+            object_id__in=self.model_class.objects.values("id"),
+        ).values_list("object_id", "content_hash")
+
+    def find_unchanged(self, data: _JsonDict, chash: str) -> typing.Optional[_ID]:
+        """return the id of the object last imported from data that hashed to chash"""
+        if chash in self.unchanged_cache:
+            return self.unchanged_cache.pop(chash)
+        ids = [object_id for object_id, _ in self._unchanged_objects([chash])]
+        return ids[0] if len(ids) == 1 else None
+
+    def save_hashes(self) -> None:
+        """write content hashes of objects imported since the last call"""
+        if self.stale_hashes:
+            ImportHash.objects.filter(object_id__in=self.stale_hashes).delete()
+            self.stale_hashes = set()
+        if not self.pending_hashes:
+            return
+        ImportHash.objects.filter(object_id__in=self.pending_hashes).delete()
+        ImportHash.objects.bulk_create(
+            ImportHash(object_id=object_id, object_type=self._type, content_hash=chash)
+            for object_id, chash in self.pending_hashes.items()
+        )
+        self.pending_hashes = {}
+
     def import_data(
-        self, data_items: typing.Iterable[_JsonDict], allow_duplicates=False
+        self,
+        data_items: typing.Iterable[_JsonDict],
+        allow_duplicates=False,
+        chunk_size: typing.Optional[int] = None,
+        skip_unchanged=False,
+        force_full_diff=False,
+        checkpoint: typing.Optional[ImportCheckpoint] = None,
+        diff: typing.Optional["ImportDiff"] = None,
     ) -> typing.Dict[str, typing.Dict]:
-        """import a bunch of dicts together"""
+        """import a bunch of dicts together
+
+        if chunk_size is given, items are prepared and looked up chunk_size at a time
+        with get_objects() instead of one get_object() query per item
+
+        if skip_unchanged is set, a hash of each item is stored and items that hash the
+        same as the last time their object was imported are a noop without any diffing,
+        force_full_diff diffs everything anyway (while still updating the hashes)
+
+        if a checkpoint is given, each chunk is committed in its own transaction and
+        saved to the checkpoint, and postimport runs once everything is imported
+
+        if a diff is given, this is a dry run: objects are compared as usual but the
+        changes are written to the diff instead of the database (lookups like
+        EventImporter.get_location can still write, so run it in a transaction that's
+        rolled back)
+        """
+        if checkpoint and not chunk_size:
+            raise ValueError("importing with a checkpoint requires a chunk_size")
+        if checkpoint and diff:
+            raise ValueError("a dry run can't be checkpointed")
+        self.diff = diff
+        # each chunk is committed on its own, otherwise the caller's transaction is used
+        chunk_transaction = transaction.atomic if checkpoint else contextlib.nullcontext
+        self.record_hashes = skip_unchanged
+        self.check_hashes = skip_unchanged and not force_full_diff
+        self.related_writer = RELATED_WRITERS[self.bulk_loader]()
+        # when importing in chunks, related objects for the whole chunk are written at once
+        self.defer_related = bool(chunk_size)
+
         # keep counts of all actions
         record = {
             "insert": 0,
@@ -324,51 +623,154 @@ class BaseImporter:
             "records": {"insert": [], "update": [], "noop": []},
         }
 
-        for json_id, data in self._prepare_imports(data_items):
-            obj_id, what = self.import_item(data, allow_duplicates)
+        def record_item(json_id: str, obj_id: _ID, what: str) -> None:
             if not obj_id or not what:
                 "Skipping data because it did not have an associated ID or type"
-                continue
+                return
             self.json_to_db_id[json_id] = obj_id
+            self.db_to_json_id[obj_id] = json_id
             record["records"][what].append(obj_id)
             record[what] += 1
 
-        # all objects are loaded, a perfect time to do inter-object resolution and other tasks
-        if self.json_to_db_id and self.do_postimport:
-            # only do postimport step if requested by client code AND there are some items of this type
-            # resolution of bills take a long time if not
-            # and events & votes get deleted!
-            self.postimport()
+        # anything not in a more specific stage (like waiting on commits) is "other"
+        self.profiler = ImportProfiler()
+        with connection.execute_wrapper(self.profiler.count_query), self.profiler.stage(
+            "other"
+        ):
+            if chunk_size:
+                for chunk in self._prepare_chunks(data_items, chunk_size):
+                    with chunk_transaction():
+                        for json_id, data in chunk:
+                            if data is None:
+                                continue
+                            obj_id, what = self.import_prepared_item(data, allow_duplicates)
+                            record_item(json_id, obj_id, what)
+                        with self.profiler.stage("write"):
+                            self.related_writer.flush()
+                            self.object_cache = {}
+                            self.unchanged_cache = {}
+                            self.save_hashes()
+                        self.send_imported_on_commit()
+                    self.last_json_id = chunk[-1][0]
+                    if checkpoint:
+                        checkpoint.save(self)
+            else:
+                for json_id, data in self._prepare_imports(data_items):
+                    obj_id, what = self.import_item(data, allow_duplicates)
+                    record_item(json_id, obj_id, what)
+                with self.profiler.stage("write"):
+                    self.save_hashes()
+                self.send_imported_on_commit()
+            self.defer_related = False
+
+            # all objects are loaded, a perfect time to do inter-object resolution and other tasks
+            if self.json_to_db_id and self.do_postimport:
+                # only do postimport step if requested by client code AND there are some items of this type
+                # resolution of bills take a long time if not
+                # and events & votes get deleted!
+                with chunk_transaction(), self.profiler.stage("postimport"):
+                    self.postimport()
 
         record["end"] = utcnow()
+        record["stages"] = self.profiler.as_dict()
 
         return {self._type: record}
 
-    def import_item(
-        self, data: _JsonDict, allow_duplicates=False
-    ) -> typing.Tuple[_ID, str]:
-        """function used by import_data"""
-        what = "noop"
+    def checkpoint_state(self) -> _JsonDict:
+        """everything needed to resume this import, see ImportCheckpoint"""
+        return {
+            "last_json_id": self.last_json_id,
+            "json_to_db_id": self.json_to_db_id,
+            "duplicates": self.duplicates,
+            "sessions": list(self.session_cache),
+            "changed_sessions": [str(session) for session in self.changed_sessions],
+        }
+
+    def restore_checkpoint(self, state: _JsonDict) -> None:
+        self.json_to_db_id.update(state["json_to_db_id"])
+        self.db_to_json_id.update((v, k) for k, v in state["json_to_db_id"].items())
+        self.duplicates.update(state["duplicates"])
+        self.resumed_ids.update(state["json_to_db_id"])
+        for identifier in state["sessions"]:
+            self.get_session(identifier)
+        self.changed_sessions.update(state.get("changed_sessions", ()))
+        self.info(
+            "resuming %s import after %s (%s already imported)",
+            self._type,
+            state["last_json_id"],
+            len(state["json_to_db_id"]),
+        )
 
-        # remove the JSON _id (may still be there if called directly)
-        data.pop("_id", None)
-        # Drop "jurisdiction" and "scraped_at" that is not needed for import
-        data.pop("jurisdiction", None)
-        data.pop("scraped_at", None)
-        if self._type == "vote_event":
-            data.pop("bill_identifier", None)
+    def prepare_item(self, data: _JsonDict) -> typing.Optional[_JsonDict]:
+        """clean up, transform and resolve ids for a single item
 
-        # add fields/etc.
-        data = self.apply_transformers(data)
+        returns None if the item can't be imported
+        """
+        # a TransformedItem has already been through everything before prepare_for_db
+        if not isinstance(data, TransformedItem):
+            # remove the JSON _id (may still be there if called directly)
+            data.pop("_id", None)
+            # Drop "jurisdiction" and "scraped_at" that is not needed for import
+            data.pop("jurisdiction", None)
+            data.pop("scraped_at", None)
+            if self._type == "vote_event":
+                data.pop("bill_identifier", None)
+
+            # add fields/etc.
+            with self.profiler.stage("transform"):
+                data = self.apply_transformers(data)
         try:
-            data = self.prepare_for_db(data)
+            with self.profiler.stage("prepare"):
+                return self.prepare_for_db(data)
         except UnresolvedIdError:
-            return None, what
+            return None
+
+    def prepare_chunk(self, data_items: typing.List[_JsonDict]) -> None:
+        """finish preparing a chunk of prepared items (in import order) together
+
+        for lookups that are cheaper done for many items at once than in prepare_for_db
+        """
+        pass
 
+    def import_item(
+        self, data: _JsonDict, allow_duplicates=False
+    ) -> typing.Tuple[_ID, str]:
+        """function used by import_data"""
+        prepared = self.prepare_item(data)
+        if prepared is None:
+            return None, "noop"
+        with self.profiler.stage("prepare"):
+            self.prepare_chunk([prepared])
+        return self.import_prepared_item(prepared, allow_duplicates)
+
+    def _lookup_object(self, data: _JsonDict) -> typing.Optional[Model]:
+        # preloaded objects are only used once, any later lookup of the same key
+        # (a duplicate in the stream) goes to the database like it would unchunked
+        key = self.get_object_key(data) if self.object_cache else None
+        if key is not None and key in self.object_cache:
+            return self.object_cache.pop(key)
         try:
-            obj = self.get_object(data)
+            return self.get_object(data)
         except self.model_class.DoesNotExist:
-            obj = None
+            return None
+
+    def import_prepared_item(
+        self, data: _JsonDict, allow_duplicates=False
+    ) -> typing.Tuple[_ID, str]:
+        """import an item that has already been through prepare_item"""
+        what = "noop"
+
+        chash = None
+        with self.profiler.stage("lookup"):
+            if self.record_hashes:
+                chash = content_hash(data)
+                if self.check_hashes:
+                    obj_id = self.find_unchanged(data, chash)
+                    # an object that was already imported goes through the usual duplicate checks
+                    if obj_id is not None and obj_id not in self.db_to_json_id:
+                        return obj_id, what
+
+            obj = self._lookup_object(data)
 
         # pull related fields off
         related = {}
@@ -379,60 +781,113 @@ class BaseImporter:
         if obj:
             # If --allow_duplicates flag is set on client CLI command
             # then we ignore duplicates instead of raising an exception
-            if not allow_duplicates and obj.id in self.json_to_db_id.values():
+            if not allow_duplicates and obj.id in self.db_to_json_id:
                 raise DuplicateItemError(data, obj, related.get("sources", []))
-            elif allow_duplicates and obj.id in self.json_to_db_id.values():
+            elif allow_duplicates and obj.id in self.db_to_json_id:
                 self.logger.warning(f"Ignored a DuplicateItemError for {obj.id}")
-            # check base object for changes
-            for key, value in data.items():
-                if getattr(obj, key) != value:
-                    setattr(obj, key, value)
+                # buffered related objects might belong to this object, write them before diffing
+                self.related_writer.flush()
+            with self.profiler.stage("diff"):
+                # check base object for changes
+                changed = {}
+                for key, value in data.items():
+                    if getattr(obj, key) != value:
+                        changed[key] = (getattr(obj, key), value)
+                        setattr(obj, key, value)
+                        what = "update"
+
+                if self.diff is not None:
+                    related_changes = self.related_changes(obj, related)
+                    if related_changes:
+                        what = "update"
+                    if what == "update":
+                        self.diff.write(
+                            self._type, what, obj.id, fields=changed, related=related_changes
+                        )
+                elif self._update_related(obj, related, self.related_models):
                     what = "update"
 
-            updated = self._update_related(obj, related, self.related_models)
-            if updated:
-                what = "update"
-
-            if what == "update":
+            if what == "update" and self.diff is None:
                 # make sure to do this after create related
-                self.update_computed_fields(obj)
-                obj.save()
+                self.related_writer.after_flush(lambda: self._finish_update(obj))
 
         # need to create the data
+        elif self.diff is not None:
+            what = "insert"
+            # never saved, but has the id it would be inserted with
+            obj = self.model_class(**data)
+            self.diff.write(self._type, what, obj.id, data=dict(data, **related))
+
         else:
             what = "insert"
-            try:
-                obj = self.model_class(**data)
-                obj.save()
-            except Exception as e:
-                raise DataImportError(
-                    "{} while importing {} as {}".format(e, data, self.model_class)
-                )
-            self._create_related(obj, related, self.related_models)
+            with self.profiler.stage("write"):
+                try:
+                    obj = self.model_class(**data)
+                    obj.save()
+                except Exception as e:
+                    raise DataImportError(
+                        "{} while importing {} as {}".format(e, data, self.model_class)
+                    )
+                self._create_related(obj, related, self.related_models)
 
             # make sure to do this after create related
-            self.update_computed_fields(obj)
+            self.related_writer.after_flush(lambda: self._finish_insert(obj))
+
+        if not self.defer_related:
+            with self.profiler.stage("write"):
+                self.related_writer.flush()
+
+        if chash and self.diff is None:
+            self.pending_hashes[obj.id] = chash
+        elif what == "update" and self.diff is None:
+            # a later skip_unchanged import mustn't compare against the old data's hash
+            self.stale_hashes.add(obj.id)
+
+        if what != "noop":
+            session_id = getattr(obj, "legislative_session_id", None)
+            if session_id:
+                self.changed_sessions.add(session_id)
+
+        return obj.id, what
+
+    def _finish_update(self, obj: Model) -> None:
+        self.update_computed_fields(obj)
+        obj.save()
+        if self.defer_signals:
+            self.imported_ids[False].append(obj.id)
+
+    def _finish_insert(self, obj: Model) -> None:
+        self.update_computed_fields(obj)
 
+        if self.defer_signals:
+            self.imported_ids[True].append(obj.id)
+        else:
             # Fire post-save signal after related objects are created to allow
             # for handlers make use of related objects
             post_save.send(sender=self.model_class, instance=obj, created=True)
 
-        return obj.id, what
+    def send_imported_on_commit(self) -> None:
+        """send objects_imported for the objects imported so far, once they're committed"""
+        for created, ids in self.imported_ids.items():
+            if ids:
+                transaction.on_commit(
+                    lambda created=created, ids=ids: objects_imported.send(
+                        sender=self.model_class, ids=ids, created=created
+                    )
+                )
+        self.imported_ids = {True: [], False: []}
 
-    def _update_related(
+    def _related_plan(
         self,
         obj: Model,
         related: typing.Dict[str, typing.List[Model]],
         subfield_dict: _JsonDict,
-    ) -> bool:
+    ) -> typing.Dict[str, typing.Tuple[typing.List[Model], bool, bool]]:
         """
-        update DB objects related to a base object
-            obj:            a base object to create related
-            related:        dict mapping field names to lists of related objects
-            subfield_list:  where to get the next layer of subfields
+        for each related field: its DB objects, and whether they need to be deleted and
+        whether the new ones need to be created
         """
-        # keep track of whether or not anything was updated
-        updated = False
+        plan = {}
 
         # for each related field - check if there are differences
         for field, items in related.items():
@@ -453,6 +908,50 @@ class BaseImporter:
                 do_delete = True
             # otherwise: no items or dbitems, so nothing is done
 
+            plan[field] = (dbitems, do_delete, do_update)
+        return plan
+
+    def related_changes(
+        self, obj: Model, related: typing.Dict[str, typing.List[Model]]
+    ) -> typing.Dict[str, str]:
+        """
+        what _update_related would do to each related field that would change, without
+        doing it: "insert", "update" or "delete"
+        """
+        changes = {}
+        plan = self._related_plan(obj, related, self.related_models)
+        for field, (dbitems, do_delete, do_update) in plan.items():
+            if field in self.merge_related:
+                # merged items are updated or added, never deleted
+                if do_update:
+                    changes[field] = "update" if dbitems else "insert"
+            elif do_delete and do_update:
+                changes[field] = "update"
+            elif do_update:
+                changes[field] = "insert"
+            elif do_delete:
+                changes[field] = "delete"
+        return changes
+
+    def _update_related(
+        self,
+        obj: Model,
+        related: typing.Dict[str, typing.List[Model]],
+        subfield_dict: _JsonDict,
+    ) -> bool:
+        """
+        update DB objects related to a base object
+            obj:            a base object to create related
+            related:        dict mapping field names to lists of related objects
+            subfield_list:  where to get the next layer of subfields
+        """
+        # keep track of whether or not anything was updated
+        updated = False
+
+        plan = self._related_plan(obj, related, subfield_dict)
+        for field, items in related.items():
+            dbitems, do_delete, do_update = plan[field]
+
             # don't delete if field is in merge_related
             if field in self.merge_related:
                 new_items = []
@@ -527,12 +1026,7 @@ class BaseImporter:
                     )
 
             # add all subobjects at once (really great for actions & votes)
-            try:
-                Subtype.objects.bulk_create(subobjects)
-            except Exception as e:
-                raise DataImportError(
-                    "{} while importing {} as {}".format(e, subobjects, Subtype)
-                )
+            self.related_writer.add(Subtype, subobjects)
 
             # after import the subobjects, import their subsubobjects
             for subobj, subrel in zip(subobjects, all_subrelated):
@@ -541,29 +1035,21 @@ class BaseImporter:
     def apply_transformers(
         self, data: _JsonDict, transformers: typing.Optional[_TransformerMapping] = None
     ) -> _JsonDict:
-        if transformers is None:
-            transformers = self.cached_transformers
-
-        if isinstance(data, list):
-            for data_item in data:
-                self.apply_transformers(data_item, transformers)
-        else:
-            for key, key_transformers in transformers.items():
-                if key not in data:
-                    continue
-                if isinstance(key_transformers, list):
-                    for transformer in key_transformers:
-                        data[key] = transformer(data[key])
-                elif isinstance(key_transformers, dict):
-                    self.apply_transformers(data[key], key_transformers)
-                else:
-                    data[key] = key_transformers(data[key])
+        if transformers is not None:
+            return compile_transformers(transformers)(data)
 
-        return data
+        # compiled once, and again only if cached_transformers is replaced
+        if self._compiled_for is not self.cached_transformers:
+            self._compiled_transformers = compile_transformers(self.cached_transformers)
+            self._compiled_for = self.cached_transformers
+        return self._compiled_transformers(data)
 
     def get_seen_sessions(self) -> typing.List[str]:
         return [s.id for s in self.session_cache.values()]
 
+    def get_changed_sessions(self) -> typing.List[str]:
+        return list(self.changed_sessions)
+
     def resolve_person(
         self,
         psuedo_person_id: str,
@@ -575,7 +1061,7 @@ class BaseImporter:
         if cache_key in self.person_cache:
             return self.person_cache[cache_key]
 
-        # turn spec into DB query
+        # parse the pseudo id
         spec = get_pseudo_id(psuedo_person_id)
 
         # if chamber is included in pseudo_person_id, use that as org_classification
@@ -583,6 +1069,57 @@ class BaseImporter:
             org_classification = spec["chamber"]
             del spec["chamber"]
 
+        query_result = None
+        if list(spec.keys()) == ["name"] and (
+            org_classification is None
+            or org_classification in LEGISLATIVE_CLASSIFICATIONS
+        ):
+            # name-only lookups of legislators are answered from an in-memory index,
+            # falling back to the database for anyone missing from it
+            if self.person_index is None:
+                self.person_index = PersonIndex(self.jurisdiction_id)
+            query_result = [
+                {"id": person_id, "current_role": current_role}
+                for person_id, current_role in self.person_index.match(
+                    spec["name"], start_date, end_date, org_classification
+                )
+            ]
+
+        if not query_result:
+            query_result = self._query_people(
+                spec, start_date, end_date, org_classification
+            )
+
+        result_set = set([p["id"] for p in query_result])
+        errmsg = None
+        if len(result_set) == 1:
+            self.person_cache[cache_key] = result_set.pop()
+        elif not result_set:
+            errmsg = "no people returned for spec"
+        else:
+            # If there are multiple rows returned see we can get the active legislator.
+            ids = set([p["id"] for p in query_result if p["current_role"] is not None])
+            if len(ids) == 1:
+                self.person_cache[cache_key] = ids.pop()
+            else:
+                errmsg = "multiple people returned for spec"
+
+        # either raise or log error
+        if errmsg:
+            self.error(errmsg)
+            self.person_cache[cache_key] = None
+
+        # return the newly-cached object
+        return self.person_cache[cache_key]
+
+    def _query_people(
+        self,
+        spec: _JsonDict,
+        start_date: typing.Optional[str],
+        end_date: typing.Optional[str],
+        org_classification: typing.Optional[str],
+    ) -> typing.List[_JsonDict]:
+        """turn a person pseudo id spec into a DB query, see resolve_person"""
         if list(spec.keys()) == ["name"]:
             # if we're just resolving on name, include other names and family name
             name = spec["name"]
@@ -603,11 +1140,7 @@ class BaseImporter:
             spec &= Q(memberships__organization__classification=org_classification)
         else:
             spec &= Q(
-                memberships__organization__classification__in=(
-                    "upper",
-                    "lower",
-                    "legislature",
-                )
+                memberships__organization__classification__in=LEGISLATIVE_CLASSIFICATIONS
             )
 
         # we don't know what dates we have available to us... it can be any configuration
@@ -625,25 +1158,4 @@ class BaseImporter:
                 memberships__start_date__lt=end_date
             )
 
-        query_result = Person.objects.filter(spec).values("id", "current_role")
-        result_set = set([p["id"] for p in query_result])
-        errmsg = None
-        if len(result_set) == 1:
-            self.person_cache[cache_key] = result_set.pop()
-        elif not result_set:
-            errmsg = "no people returned for spec"
-        else:
-            # If there are multiple rows returned see we can get the active legislator.
-            ids = set([p["id"] for p in query_result if p["current_role"] is not None])
-            if len(ids) == 1:
-                self.person_cache[cache_key] = ids.pop()
-            else:
-                errmsg = "multiple people returned for spec"
-
-        # either raise or log error
-        if errmsg:
-            self.error(errmsg)
-            self.person_cache[cache_key] = None
-
-        # return the newly-cached object
-        return self.person_cache[cache_key]
+        return list(Person.objects.filter(spec).values("id", "current_role"))
@@ -1,4 +1,7 @@
+import logging
+import typing
 from typing import Union
+from django.db import connection
 from .base import BaseImporter
 from ._types import _JsonDict, Model
 from ..data.models import (
@@ -16,61 +19,66 @@ from ..data.models import (
     BillDocumentLink,
     BillVersionLink,
 )
-from .computed_fields import update_bill_fields
+from .computed_fields import compute_bill_fields
 from .organizations import OrganizationImporter
 
 
+# link unresolved relationships to the bill with the same identifier in the related
+# session of the same jurisdiction, all at once
+_RESOLVE_RELATED_BILLS_SQL = """
+UPDATE opencivicdata_relatedbill AS rb
+SET related_bill_id = related.id
+FROM opencivicdata_bill AS bill
+JOIN opencivicdata_legislativesession AS session
+    ON session.id = bill.legislative_session_id,
+opencivicdata_bill AS related
+JOIN opencivicdata_legislativesession AS related_session
+    ON related_session.id = related.legislative_session_id
+WHERE rb.related_bill_id IS NULL
+    AND rb.bill_id = bill.id
+    AND session.jurisdiction_id = %(jurisdiction_id)s
+    {session_filter}
+    AND related_session.jurisdiction_id = %(jurisdiction_id)s
+    AND related_session.identifier = rb.legislative_session
+    AND related.identifier = rb.identifier
+RETURNING rb.legislative_session, bill.identifier
+"""
+
+
 def resolve_related_bills(jurisdiction_id: str, session: Union[str, None], logger) -> None:
     # go through all RelatedBill objs that are attached to a bill in this jurisdiction and
     # are currently unresolved
+    related_bills = RelatedBill.objects.filter(
+        bill__legislative_session__jurisdiction_id=jurisdiction_id,
+        related_bill=None,
+    )
+    params = {"jurisdiction_id": jurisdiction_id}
     if session is not None:
         session_log = f"-{session}"
-        related_bills = RelatedBill.objects.filter(
-            bill__legislative_session__jurisdiction_id=jurisdiction_id,
-            bill__legislative_session__identifier=session,
-            related_bill=None,
-        )
+        related_bills = related_bills.filter(bill__legislative_session__identifier=session)
+        session_filter = "AND session.identifier = %(session)s"
+        params["session"] = session
     else:
         session_log = ""
-        related_bills = RelatedBill.objects.filter(
-            bill__legislative_session__jurisdiction_id=jurisdiction_id,
-            related_bill=None,
-        )
-    logger.info(f"Found {len(related_bills)} unresolved bill relationships in {jurisdiction_id}{session_log}")
-
-    # go session-by-session and see if we can find matching candidates
-    # we do this to reduce the number of SELECT queries we run in cases where there are many relations unresolved
-    sessions = {}
-    for rb in related_bills:
-        if rb.legislative_session not in sessions:
-            sessions[rb.legislative_session] = [rb.identifier]
-        else:
-            sessions[rb.legislative_session].append(rb.identifier)
-
-    session_candidate_bills = {}
-    for session in dict.keys(sessions):
-        candidates = list(
-            Bill.objects.filter(
-                identifier__in=sessions[session],
-                legislative_session__identifier=session,
-                legislative_session__jurisdiction_id=jurisdiction_id,
-            )
-        )
-        session_candidate_bills[session] = {}
-        for bill in candidates:
-            session_candidate_bills[session][bill.identifier] = bill
+        session_filter = ""
+    unresolved = related_bills.count()
+    logger.info(f"Found {unresolved} unresolved bill relationships in {jurisdiction_id}{session_log}")
+
+    # a single UPDATE ... FROM matches every relationship to its bill, rather than a
+    # save() per relationship
+    with connection.cursor() as cursor:
+        cursor.execute(_RESOLVE_RELATED_BILLS_SQL.format(session_filter=session_filter), params)
+        resolved = cursor.fetchall()
 
-    matches_found = 0
-    for rb in related_bills:
-        if rb.identifier in session_candidate_bills[rb.legislative_session]:
-            rb.related_bill = session_candidate_bills[rb.legislative_session][rb.identifier]
-            rb.save()
-            matches_found += 1
-            logger.debug(f"Resolved {rb.legislative_session} {rb.bill.identifier}")
-        else:
-            logger.debug(f"FAILED to resolve {rb.legislative_session} {rb.bill.identifier}")
+    if logger.isEnabledFor(logging.DEBUG):
+        for legislative_session, identifier in resolved:
+            logger.debug(f"Resolved {legislative_session} {identifier}")
+        for legislative_session, identifier in related_bills.values_list(
+            "legislative_session", "bill__identifier"
+        ):
+            logger.debug(f"FAILED to resolve {legislative_session} {identifier}")
 
-    logger.info(f"Resolved {matches_found} bills out of {len(related_bills)} bills needing resolution")
+    logger.info(f"Resolved {len(resolved)} bills out of {unresolved} bills needing resolution")
 
 
 class BillImporter(BaseImporter):
@@ -117,6 +125,24 @@ class BillImporter(BaseImporter):
             "actions__related_entities", "versions__links", "documents__links"
         ).get(**spec)
 
+    def get_object_key(self, bill: _JsonDict) -> typing.Hashable:
+        return (bill["legislative_session_id"], bill["identifier"])
+
+    def get_objects(
+        self, bills: typing.List[_JsonDict]
+    ) -> typing.Iterable[typing.Tuple[typing.Hashable, Model]]:
+        keys = {self.get_object_key(bill) for bill in bills}
+        objects = self.model_class.objects.prefetch_related(
+            "actions__related_entities", "versions__links", "documents__links"
+        ).filter(
+            legislative_session_id__in={session_id for session_id, _ in keys},
+            identifier__in={identifier for _, identifier in keys},
+        )
+        for obj in objects:
+            key = (obj.legislative_session_id, obj.identifier)
+            if key in keys:
+                yield key, obj
+
     def limit_spec(self, spec: _JsonDict) -> _JsonDict:
         spec["legislative_session__jurisdiction_id"] = self.jurisdiction_id
         return spec
@@ -156,10 +182,16 @@ class BillImporter(BaseImporter):
                     sponsor["organization_id"], allow_no_match=True
                 )
 
+        # actions are imported in order, so the computed fields can come straight from them
+        data.update(
+            compute_bill_fields(
+                (action["date"], action["description"], action["classification"])
+                for action in data["actions"]
+            )
+        )
         return data
 
     def postimport(self) -> None:
-        resolve_related_bills(self.jurisdiction_id, None, self.logger)
-
-    def update_computed_fields(self, obj: Model) -> None:
-        update_bill_fields(obj, save=False)
+        # a dry run doesn't link related bills, the bills it'd link to may not exist yet
+        if self.diff is None:
+            resolve_related_bills(self.jurisdiction_id, None, self.logger)
@@ -0,0 +1,120 @@
+"""
+on-disk checkpoints for imports that commit as they go, so a failed import can resume
+"""
+import itertools
+import json
+import logging
+import os
+import typing
+from ._types import _JsonDict
+
+if typing.TYPE_CHECKING:
+    from .base import BaseImporter
+
+logger = logging.getLogger("openstates")
+
+
+def merge_state(state: _JsonDict, delta: _JsonDict) -> None:
+    """add a delta written by ImportCheckpoint.save to an importer's state"""
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            state.setdefault(key, {}).update(value)
+        elif isinstance(value, list):
+            state.setdefault(key, []).extend(value)
+        else:
+            state[key] = value
+
+
+class ImportCheckpoint:
+    """
+    what each importer had committed when the checkpoint was last saved
+
+    saved after every committed chunk, the state of each importer (see
+    BaseImporter.checkpoint_state) includes its json_to_db_id map, so items that were
+    already imported can be skipped and later types can still resolve them
+
+    the checkpoint is a JSON lines file, each save appends a line with only what changed
+    since the last one: the new entries of the state's maps and lists (which only ever
+    grow) and its other values, loading a checkpoint compacts it to a line per type
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: typing.Dict[str, _JsonDict] = {}
+        # per type, how much of each map and which list items are already written
+        self.written: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        # a new checkpoint replaces whatever a previous run left at path
+        self.started = False
+
+    @classmethod
+    def load(cls, path: str) -> "ImportCheckpoint":
+        checkpoint = cls(path)
+        if os.path.exists(path):
+            with open(path) as f:
+                lines = f.read().splitlines()
+            for lineno, line in enumerate(lines, 1):
+                try:
+                    _type, delta = json.loads(line)
+                except ValueError:
+                    if lineno < len(lines):
+                        raise
+                    # cut short by whatever stopped the import, that chunk was
+                    # committed but is imported (and updated) again
+                    logger.warning("ignoring incomplete last line of checkpoint %s", path)
+                    break
+                merge_state(checkpoint.state.setdefault(_type, {}), delta)
+            checkpoint.compact()
+            logger.info(
+                "resuming import from checkpoint %s: %s",
+                path,
+                ", ".join(
+                    "{} {}".format(len(state["json_to_db_id"]), _type)
+                    for _type, state in checkpoint.state.items()
+                ),
+            )
+        else:
+            logger.info("no checkpoint found at %s, importing everything", path)
+        return checkpoint
+
+    def restore(self, importer: "BaseImporter") -> None:
+        if importer._type in self.state:
+            importer.restore_checkpoint(self.state[importer._type])
+
+    def _delta(self, _type: str, state: _JsonDict) -> _JsonDict:
+        written = self.written.setdefault(_type, {})
+        delta: _JsonDict = {}
+        for key, value in state.items():
+            if isinstance(value, dict):
+                # maps are only added to, so new entries are the ones past the end
+                delta[key] = dict(itertools.islice(value.items(), written.get(key, 0), None))
+                written[key] = len(value)
+            elif isinstance(value, list):
+                seen = written.setdefault(key, set())
+                delta[key] = [item for item in value if item not in seen]
+                seen.update(delta[key])
+            else:
+                delta[key] = value
+        return delta
+
+    def compact(self) -> None:
+        """rewrite the checkpoint as a single line per type"""
+        self.written = {}
+        # never leave a half-written checkpoint behind
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for _type, state in self.state.items():
+                f.write(json.dumps([_type, self._delta(_type, state)]) + "\n")
+        os.replace(tmp_path, self.path)
+        self.started = True
+
+    def save(self, importer: "BaseImporter") -> None:
+        self.state[importer._type] = state = importer.checkpoint_state()
+        if not self.started:
+            self.compact()
+            return
+        with open(self.path, "a") as f:
+            f.write(json.dumps([importer._type, self._delta(importer._type, state)]) + "\n")
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -4,11 +4,19 @@ functions in this module should take a single object and update it in place
 optionally, they can take a save parameter, that should default to False
 but can be set to True to force a save if changes were made
 (this allows for usage from CLI)
+
+the *_in_bulk variants update many objects at once in the database instead
 """
+import typing
+from django.db import connection
 from ._types import Model
 
+# (date, description, classification) of an action
+_Action = typing.Tuple[str, str, typing.Sequence[str]]
 
-def update_bill_fields(bill: Model, *, save: bool = False) -> None:
+
+def compute_bill_fields(actions: typing.Iterable[_Action]) -> typing.Dict[str, typing.Any]:
+    """computed fields of a bill with these actions, given in order"""
     first_action_date = None
     latest_action_date = None
     latest_action_description = ""
@@ -17,25 +25,98 @@ def update_bill_fields(bill: Model, *, save: bool = False) -> None:
     # iterate over according to order
     # first action date will use first by order (<)
     # latest will use latest by order (>=)
-    for action in bill.actions.order_by("order"):
-        if not first_action_date or action.date < first_action_date:
-            first_action_date = action.date
-        if not latest_action_date or action.date >= latest_action_date:
-            latest_action_date = action.date
-            latest_action_description = action.description
-        if "passage" in action.classification and (
-            not latest_passage_date or action.date >= latest_passage_date
+    for date, description, classification in actions:
+        # actions without a date can't be placed relative to the others
+        if not date:
+            continue
+        if not first_action_date or date < first_action_date:
+            first_action_date = date
+        if not latest_action_date or date >= latest_action_date:
+            latest_action_date = date
+            latest_action_description = description
+        if "passage" in classification and (
+            not latest_passage_date or date >= latest_passage_date
         ):
-            latest_passage_date = action.date
-
-    if (
-        bill.first_action_date != first_action_date
-        or bill.latest_action_date != latest_action_date
-        or bill.latest_passage_date != latest_passage_date
-        or bill.latest_action_description != latest_action_description
-    ):
-        bill.first_action_date = first_action_date
-        bill.latest_passage_date = latest_passage_date
-        bill.latest_action_date = latest_action_date
-        bill.latest_action_description = latest_action_description
+            latest_passage_date = date
+
+    return {
+        "first_action_date": first_action_date,
+        "latest_action_date": latest_action_date,
+        "latest_action_description": latest_action_description,
+        "latest_passage_date": latest_passage_date,
+    }
+
+
+def update_bill_fields(bill: Model, *, save: bool = False) -> None:
+    fields = compute_bill_fields(
+        bill.actions.order_by("order").values_list(
+            "date", "description", "classification"
+        )
+    )
+
+    if any(getattr(bill, field) != value for field, value in fields.items()):
+        for field, value in fields.items():
+            setattr(bill, field, value)
         bill.save()
+
+
+# the same rules as compute_bill_fields, for every bill in scope at once:
+# dates compare as plain strings (like Python), ties on date go to the later action,
+# actions without a date are skipped
+_UPDATE_BILL_FIELDS_SQL = """
+WITH scope AS (
+    SELECT id FROM opencivicdata_bill WHERE {where}
+), computed AS (
+    -- one row per bill with actions: its latest action, and the dates of all of them
+    SELECT DISTINCT ON (bill_id)
+        bill_id,
+        MIN(date COLLATE "C") OVER bill_actions AS first_action_date,
+        date AS latest_action_date,
+        description AS latest_action_description,
+        MAX(date COLLATE "C") FILTER (WHERE 'passage' = ANY(classification))
+            OVER bill_actions AS latest_passage_date
+    FROM opencivicdata_billaction
+    WHERE bill_id IN (SELECT id FROM scope) AND date <> ''
+    WINDOW bill_actions AS (PARTITION BY bill_id)
+    ORDER BY bill_id, date COLLATE "C" DESC, "order" DESC
+)
+UPDATE opencivicdata_bill AS bill
+SET first_action_date = computed.first_action_date,
+    latest_action_date = computed.latest_action_date,
+    latest_action_description = COALESCE(computed.latest_action_description, ''),
+    latest_passage_date = computed.latest_passage_date
+FROM scope LEFT JOIN computed ON computed.bill_id = scope.id
+WHERE bill.id = scope.id AND (
+    bill.first_action_date IS DISTINCT FROM computed.first_action_date
+    OR bill.latest_action_date IS DISTINCT FROM computed.latest_action_date
+    OR bill.latest_action_description
+        IS DISTINCT FROM COALESCE(computed.latest_action_description, '')
+    OR bill.latest_passage_date IS DISTINCT FROM computed.latest_passage_date
+)
+"""
+
+
+def update_bill_fields_in_bulk(
+    *,
+    jurisdiction_id: typing.Optional[str] = None,
+    bill_ids: typing.Optional[typing.Collection[str]] = None,
+) -> int:
+    """
+    update the computed fields of every bill of a jurisdiction (or just the given
+    bills) with a single statement, returns how many bills changed
+    """
+    if jurisdiction_id is not None:
+        where = (
+            "legislative_session_id IN (SELECT id FROM opencivicdata_legislativesession"
+            " WHERE jurisdiction_id = %s)"
+        )
+        params: typing.List[typing.Any] = [jurisdiction_id]
+    elif bill_ids is not None:
+        where = "id = ANY(%s)"
+        params = [list(bill_ids)]
+    else:
+        raise ValueError("either jurisdiction_id or bill_ids is required")
+
+    with connection.cursor() as cursor:
+        cursor.execute(_UPDATE_BILL_FIELDS_SQL.format(where=where), params)
+        return cursor.rowcount
@@ -0,0 +1,43 @@
+"""
+the changes a dry run import would make, see BaseImporter.import_data
+"""
+import json
+import typing
+from collections import Counter
+from ._types import _ID
+from .base import prepared_json_default
+
+
+class ImportDiff:
+    """
+    writes each object a dry run would insert, update or delete as a line of JSON
+
+    every line has the object's "type", "action" and "id", plus:
+        insert: "data", the prepared data the object would be created from
+        update: "fields", each changed field's [old, new] value, and "related", what
+                would be done to each changed related field ("insert", "update" or
+                "delete")
+
+    objects that would be inserted get the id they'd be created with, which won't be
+    the id of a later real import
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "w")
+        self.counts: typing.Counter[typing.Tuple[str, str]] = Counter()
+
+    def __enter__(self) -> "ImportDiff":
+        return self
+
+    def __exit__(self, *exc: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def write(self, _type: str, action: str, obj_id: _ID, **details: typing.Any) -> None:
+        line = {"type": _type, "action": action, "id": obj_id, **details}
+        self.file.write(json.dumps(line, default=prepared_json_default))
+        self.file.write("\n")
+        self.counts[_type, action] += 1
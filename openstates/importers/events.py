@@ -12,6 +12,7 @@ from ..data.models import (
     EventAgendaItem,
     EventRelatedEntity,
     EventAgendaMedia,
+    ImportHash,
 )
 from .organizations import OrganizationImporter
 from .vote_events import VoteEventImporter
@@ -66,6 +67,42 @@ class EventImporter(BaseImporter):
             }
         return self.model_class.objects.get(**spec)
 
+    def get_object_key(self, event: _JsonDict) -> typing.Hashable:
+        if event.get("dedupe_key"):
+            return ("dedupe_key", event["dedupe_key"])
+        return (
+            "name",
+            event["name"],
+            event["description"],
+            event["start_date"],
+            event["end_date"],
+        )
+
+    def get_objects(
+        self, events: typing.List[_JsonDict]
+    ) -> typing.Iterable[typing.Tuple[typing.Hashable, Event]]:
+        keys = {self.get_object_key(event) for event in events}
+        dedupe_keys = {key[1] for key in keys if key[0] == "dedupe_key"}
+        names = {key[1] for key in keys if key[0] == "name"}
+        jurisdiction_events = self.model_class.objects.filter(
+            jurisdiction_id=self.jurisdiction_id
+        )
+
+        if dedupe_keys:
+            for obj in jurisdiction_events.filter(dedupe_key__in=dedupe_keys):
+                yield ("dedupe_key", obj.dedupe_key), obj
+        if names:
+            for obj in jurisdiction_events.filter(name__in=names):
+                key = (
+                    "name",
+                    obj.name,
+                    obj.description,
+                    obj.start_date,
+                    obj.end_date,
+                )
+                if key in keys:
+                    yield key, obj
+
     def get_location(self, location_data: _JsonDict) -> EventLocation:
         obj, created = EventLocation.objects.get_or_create(
             name=location_data["name"],
@@ -142,8 +179,15 @@ class EventImporter(BaseImporter):
         return data
 
     def postimport(self) -> None:
-        all_db_ids = self.json_to_db_id.values()
+        all_db_ids = list(self.db_to_json_id)
         update_set = Event.objects.filter(
             jurisdiction_id=self.jurisdiction_id, deleted=False
         ).exclude(id__in=all_db_ids)
+        if self.diff is not None:
+            # events are only marked deleted
+            for event_id in update_set.values_list("id", flat=True):
+                self.diff.write(self._type, "delete", event_id)
+            return
+        # deleted events no longer match the data they were imported from
+        ImportHash.objects.filter(object_id__in=update_set.values("id")).delete()
         update_set.update(deleted=True)
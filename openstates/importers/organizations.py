@@ -1,32 +1,64 @@
-import re
+import typing
 from django.db.models import Q
-from ._types import _JsonDict
+from ._types import _ID, _JsonDict
 from .base import BaseImporter
+from .checkpoint import ImportCheckpoint
+from .resolvers import OrganizationIndex, org_pseudo_name
 from ..data.models import Organization
 
+if typing.TYPE_CHECKING:
+    from .diff import ImportDiff
+
 
 class OrganizationImporter(BaseImporter):
     _type = "organization"
     model_class = Organization
 
+    def __init__(self, jurisdiction_id: str, do_postimport: bool = True):
+        super().__init__(jurisdiction_id, do_postimport)
+        self.org_index: typing.Optional[OrganizationIndex] = None
+
+    def import_data(
+        self,
+        data_items: typing.Iterable[_JsonDict],
+        allow_duplicates=False,
+        chunk_size: typing.Optional[int] = None,
+        skip_unchanged=False,
+        force_full_diff=False,
+        checkpoint: typing.Optional[ImportCheckpoint] = None,
+        diff: typing.Optional["ImportDiff"] = None,
+    ) -> typing.Dict[str, typing.Dict]:
+        # newly imported organizations aren't in the index
+        self.org_index = None
+        return super().import_data(
+            data_items,
+            allow_duplicates=allow_duplicates,
+            chunk_size=chunk_size,
+            skip_unchanged=skip_unchanged,
+            force_full_diff=force_full_diff,
+            checkpoint=checkpoint,
+            diff=diff,
+        )
+
+    def match_pseudo_id(self, spec: _JsonDict) -> typing.Set[_ID]:
+        # load every organization once instead of querying for each pseudo id
+        if self.org_index is None:
+            self.org_index = OrganizationIndex(self.jurisdiction_id)
+        ids = self.org_index.match(spec)
+        if ids is None:
+            return super().match_pseudo_id(spec)
+        return ids
+
     def limit_spec(self, spec: _JsonDict) -> _JsonDict:
         if spec.get("classification") != "party":
             spec["jurisdiction_id"] = self.jurisdiction_id
 
-        org_name_prepositions = ["and", "at", "by", "for", "in", "on", "of", "the"]
         name = spec.pop("name", None)
         # if chamber is included in pseudo_person_id, we assume this is a committee
         # and chamber is here to help us find its parent
         chamber_classification = spec.pop("chamber", None)
         if name:
-            # __icontains doesn't work for JSONField ArrayField
-            # so name follows "title" naming pattern
-            name = name.title()
-            pattern = "(" + "|".join(org_name_prepositions) + ")"
-            name = re.sub(
-                pattern, lambda match: match.group(0).lower(), name, flags=re.IGNORECASE
-            )
-            name = name.replace(" & ", " and ")
+            name = org_pseudo_name(name)
 
             if chamber_classification:
                 return (
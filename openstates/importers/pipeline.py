@@ -0,0 +1,99 @@
+"""
+loading of scraped JSON in worker processes, ahead of the importers that use it
+
+the importers themselves run in a single process: prepare_for_db resolves ids against
+objects written earlier in the same (uncommitted) transaction, which other database
+connections can't see, so workers only do what doesn't need the database: reading,
+parsing, fingerprinting and transforming each item (see base.transform_item)
+"""
+import concurrent.futures
+import multiprocessing
+import typing
+from collections import deque
+from ._types import _TransformerMapping
+from .base import BaseImporter, TransformedItem, compile_transformers, transform_item
+from .readers import DirectoryReader, load_json_file
+
+# files parsed per task, so results come back in reasonably large pieces
+BATCH_SIZE = 100
+
+
+def load_transformed_files(
+    _type: str, paths: typing.List[str], transformers: _TransformerMapping
+) -> typing.List[TransformedItem]:
+    transform = compile_transformers(transformers)
+    return [transform_item(_type, load_json_file(path), transform) for path in paths]
+
+
+class ImportPipeline:
+    """
+    reads a data directory's JSON files with a pool of worker processes
+
+    types are read in the order of the importers given (their import dependency
+    order) and must be read back with stream() in that order, so while one type is
+    being imported the workers are already reading the next one
+
+    bundles can't be split between workers, so they're read by stream() itself
+    """
+
+    def __init__(
+        self,
+        reader: DirectoryReader,
+        importers: typing.Sequence[BaseImporter],
+        workers: int,
+    ):
+        self.reader = reader
+        self.batches: typing.Deque[
+            typing.Tuple[str, typing.List[str], _TransformerMapping]
+        ] = deque()
+        for importer in importers:
+            _type = importer._type
+            if reader.type_bundles(_type):
+                continue
+            # same files, in the same order, as BaseImporter.import_directory
+            fnames = reader.files(_type)
+            for i in range(0, len(fnames), BATCH_SIZE):
+                self.batches.append(
+                    (_type, fnames[i:i + BATCH_SIZE], importer.cached_transformers)
+                )
+        # bounds how far ahead of the importers the workers get
+        self.max_pending = workers * 2
+        self.pending: typing.Deque[
+            typing.Tuple[str, "concurrent.futures.Future[typing.List[TransformedItem]]"]
+        ] = deque()
+        # workers are forked so they don't need to set up Django again
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("fork")
+        )
+
+    def __enter__(self) -> "ImportPipeline":
+        return self
+
+    def __exit__(self, *exc: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for _, future in self.pending:
+            future.cancel()
+        self.executor.shutdown()
+
+    def _submit(self) -> None:
+        while self.batches and len(self.pending) < self.max_pending:
+            _type, fnames, transformers = self.batches.popleft()
+            self.pending.append(
+                (
+                    _type,
+                    self.executor.submit(load_transformed_files, _type, fnames, transformers),
+                )
+            )
+
+    def stream(self, _type: str) -> typing.Iterator[typing.Any]:
+        """every item of this type, transformed when it was read by a worker"""
+        if self.reader.type_bundles(_type):
+            yield from self.reader.read(_type)
+            return
+        self._submit()
+        while self.pending and self.pending[0][0] == _type:
+            _, future = self.pending.popleft()
+            self._submit()
+            yield from future.result()
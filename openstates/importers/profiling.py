@@ -0,0 +1,115 @@
+"""
+timing of the stages of an import, see BaseImporter.import_data
+"""
+import time
+import typing
+from ._types import _JsonDict
+
+# in the order they happen to an item, for reports
+STAGES = (
+    "read",
+    "dedupe",
+    "transform",
+    "prepare",
+    "lookup",
+    "diff",
+    "write",
+    "postimport",
+    "other",
+)
+
+
+class StageStats:
+    __slots__ = ("calls", "wall", "cpu", "queries")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.queries = 0
+
+    def as_dict(self) -> _JsonDict:
+        return {
+            "calls": self.calls,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "queries": self.queries,
+        }
+
+
+class ImportProfiler:
+    """
+    wall time, CPU time and database queries spent in each stage of an import
+
+    stages nest, time and queries are only counted towards the innermost one, so the
+    stages of an import add up to its total
+    """
+
+    def __init__(self) -> None:
+        self.stages: typing.Dict[str, StageStats] = {}
+        self._stack: typing.List[StageStats] = []
+        self._mark = (time.perf_counter(), time.process_time())
+
+    def _charge(self) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._stack:
+            current = self._stack[-1]
+            current.wall += wall - self._mark[0]
+            current.cpu += cpu - self._mark[1]
+        self._mark = (wall, cpu)
+
+    def stage(self, name: str) -> "_Stage":
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return _Stage(self, stats)
+
+    def iterate(self, name: str, items: typing.Iterable[typing.Any]) -> typing.Iterator[typing.Any]:
+        """iterate over items, counting the time spent producing them as a stage"""
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count_query(
+        self,
+        execute: typing.Callable,
+        sql: str,
+        params: typing.Any,
+        many: bool,
+        context: typing.Dict[str, typing.Any],
+    ) -> typing.Any:
+        """a connection.execute_wrapper counting queries towards the current stage"""
+        if self._stack:
+            self._stack[-1].queries += 1
+        return execute(sql, params, many, context)
+
+    def as_dict(self) -> typing.Dict[str, _JsonDict]:
+        order = {name: i for i, name in enumerate(STAGES)}
+        return {
+            name: self.stages[name].as_dict()
+            for name in sorted(self.stages, key=lambda name: order.get(name, len(order)))
+        }
+
+
+class _Stage:
+    """context manager for ImportProfiler.stage, cheaper than a contextmanager generator"""
+
+    __slots__ = ("profiler", "stats")
+
+    def __init__(self, profiler: ImportProfiler, stats: StageStats):
+        self.profiler = profiler
+        self.stats = stats
+
+    def __enter__(self) -> None:
+        self.profiler._charge()
+        self.stats.calls += 1
+        self.profiler._stack.append(self.stats)
+
+    def __exit__(self, *exc: typing.Any) -> None:
+        self.profiler._charge()
+        self.profiler._stack.pop()
@@ -0,0 +1,93 @@
+"""
+reading of scraped data out of a data directory
+
+orjson is used to decode when it is installed
+"""
+import gzip
+import json
+import os
+import re
+import typing
+from ._types import _JsonDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# bundles of every object of a type (see openstates.scrape.bundle), one per line, in
+# parts when they're written by several processes
+_TYPE_BUNDLE_RE = re.compile(r"^scrape_bundle\.([a-z_]+)(?:\.\d+)?\.jsonl(?:\.gz)?$")
+
+
+def loads(data: typing.Union[bytes, str]) -> typing.Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # stdlib json also accepts NaN, Infinity and huge integers
+            pass
+    return json.loads(data)
+
+
+def load_json_file(path: str) -> _JsonDict:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+class DirectoryReader:
+    """
+    reads the scraped objects of each type from a data directory
+
+    the directory is listed once, however many types are read from it, and the
+    bundles of a type (see _TYPE_BUNDLE_RE) are read instead of its individual JSON
+    files if there are any
+    """
+
+    def __init__(self, datadir: str):
+        self.datadir = datadir
+        self._names: typing.Optional[typing.List[str]] = None
+
+    @property
+    def names(self) -> typing.List[str]:
+        if self._names is None:
+            try:
+                with os.scandir(self.datadir) as entries:
+                    self._names = [entry.name for entry in entries if entry.is_file()]
+            except FileNotFoundError:
+                # like glob, a missing directory has nothing in it
+                self._names = []
+        return self._names
+
+    def type_bundles(self, _type: str) -> typing.List[str]:
+        paths = []
+        for name in sorted(self.names):
+            match = _TYPE_BUNDLE_RE.match(name)
+            if match and match.group(1) == _type:
+                paths.append(os.path.join(self.datadir, name))
+        return paths
+
+    def files(self, _type: str) -> typing.List[str]:
+        """paths of the JSON files of a type, matching glob('<type>_*.json')"""
+        prefix = _type + "_"
+        return [
+            os.path.join(self.datadir, name)
+            for name in self.names
+            if name.startswith(prefix) and name.endswith(".json")
+        ]
+
+    def read(self, _type: str) -> typing.Iterator[_JsonDict]:
+        bundles = self.type_bundles(_type)
+        if bundles:
+            for bundle in bundles:
+                yield from self.read_bundle(bundle)
+        else:
+            for path in self.files(_type):
+                yield load_json_file(path)
+
+    def read_bundle(self, path: str) -> typing.Iterator[_JsonDict]:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
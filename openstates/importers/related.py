@@ -0,0 +1,119 @@
+"""
+writers for the related objects (actions, sponsorships, votes, ...) created during import
+
+related objects have their UUID primary keys assigned client-side when they're built, so
+children can reference their parents before anything is written, and rows for many
+parents can be buffered and written together
+"""
+import io
+import typing
+from django.db import connection
+from django.db.models import Model
+from ..exceptions import DataImportError
+
+_Callback = typing.Callable[[], None]
+
+
+class RelatedObjectWriter:
+    """buffers related objects and writes them with one bulk_create per model"""
+
+    def __init__(self) -> None:
+        # insertion order of models matters, parents always get added before their children
+        self.pending: typing.Dict[typing.Type[Model], typing.List[Model]] = {}
+        self.callbacks: typing.List[_Callback] = []
+
+    def add(self, model: typing.Type[Model], objects: typing.List[Model]) -> None:
+        if objects:
+            self.pending.setdefault(model, []).extend(objects)
+
+    def after_flush(self, callback: _Callback) -> None:
+        """run callback once the currently buffered objects are written"""
+        self.callbacks.append(callback)
+
+    def flush(self) -> None:
+        pending, callbacks = self.pending, self.callbacks
+        self.pending = {}
+        self.callbacks = []
+
+        for model, objects in pending.items():
+            try:
+                self.write(model, objects)
+            except Exception as e:
+                raise DataImportError(
+                    "{} while importing {} as {}".format(e, objects, model)
+                )
+        for callback in callbacks:
+            callback()
+
+    def write(self, model: typing.Type[Model], objects: typing.List[Model]) -> None:
+        model.objects.bulk_create(objects)
+
+
+def _copy_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+
+
+def _array_literal(values: typing.Iterable[typing.Any]) -> str:
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        else:
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            elements.append(f'"{value}"')
+    return "{" + ",".join(elements) + "}"
+
+
+def _copy_value(value: typing.Any) -> str:
+    """format a prepared db value for COPY's text format"""
+    if value is None:
+        return "\\N"
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    elif isinstance(value, (list, tuple)):
+        return _copy_escape(_array_literal(value))
+    return _copy_escape(str(value))
+
+
+class CopyRelatedObjectWriter(RelatedObjectWriter):
+    """buffers related objects and streams them into PostgreSQL with COPY FROM STDIN
+
+    falls back to bulk_create on other databases
+    """
+
+    def write(self, model: typing.Type[Model], objects: typing.List[Model]) -> None:
+        if connection.vendor != "postgresql":
+            return super().write(model, objects)
+
+        fields = model._meta.concrete_fields
+        buffer = io.StringIO()
+        for obj in objects:
+            for field in fields:
+                # fill in defaults the same way a save would
+                field.pre_save(obj, add=True)
+            buffer.write(
+                "\t".join(
+                    _copy_value(field.get_db_prep_save(getattr(obj, field.attname), connection))
+                    for field in fields
+                )
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN", buffer
+            )
+
+
+RELATED_WRITERS: typing.Dict[str, typing.Type[RelatedObjectWriter]] = {
+    "bulk_create": RelatedObjectWriter,
+    "copy": CopyRelatedObjectWriter,
+}
@@ -0,0 +1,244 @@
+"""
+in-memory indexes used to resolve pseudo ids without a database query per id
+"""
+import re
+import typing
+from bisect import bisect_right
+from datetime import datetime
+from collections import defaultdict
+from django.db.models import Q
+from ..data.models import (
+    Bill,
+    LegislativeSession,
+    Membership,
+    Organization,
+    Person,
+    PersonName,
+)
+
+LEGISLATIVE_CLASSIFICATIONS = ("upper", "lower", "legislature")
+ORG_NAME_PREPOSITIONS = ["and", "at", "by", "for", "in", "on", "of", "the"]
+
+# (person id, current_role)
+_PersonRow = typing.Tuple[str, typing.Optional[dict]]
+# (organization classification, start_date, end_date)
+_MembershipRow = typing.Tuple[str, str, str]
+
+
+def normalize_name(name: str) -> str:
+    """a scraped name as BaseImporter._query_people matches it (name__iexact)"""
+    return re.sub(r"\s+", " ", name).lower()
+
+
+def org_pseudo_name(name: str) -> str:
+    """the form organization names in pseudo ids are looked up in"""
+    # __icontains doesn't work for JSONField ArrayField
+    # so name follows "title" naming pattern
+    name = name.title()
+    pattern = "(" + "|".join(ORG_NAME_PREPOSITIONS) + ")"
+    name = re.sub(
+        pattern, lambda match: match.group(0).lower(), name, flags=re.IGNORECASE
+    )
+    return name.replace(" & ", " and ")
+
+
+class PersonIndex:
+    """
+    legislators of a jurisdiction, indexed by name, other names and family name
+
+    matches return the same rows that BaseImporter.resolve_person's query does
+    """
+
+    def __init__(self, jurisdiction_id: str):
+        self.jurisdiction_id = jurisdiction_id
+        self.names: typing.Dict[str, typing.Set[str]] = defaultdict(set)
+        self.memberships: typing.Dict[str, typing.List[_MembershipRow]] = defaultdict(
+            list
+        )
+        self.current_roles: typing.Dict[str, typing.Optional[dict]] = {}
+        self.load()
+
+    def load(self) -> None:
+        for person_id, classification, start_date, end_date in Membership.objects.filter(
+            person__isnull=False,
+            organization__jurisdiction_id=self.jurisdiction_id,
+            organization__classification__in=LEGISLATIVE_CLASSIFICATIONS,
+        ).values_list(
+            "person_id", "organization__classification", "start_date", "end_date"
+        ):
+            self.memberships[person_id].append((classification, start_date, end_date))
+
+        person_ids = list(self.memberships)
+        for person_id, name, family_name, current_role in Person.objects.filter(
+            id__in=person_ids
+        ).values_list("id", "name", "family_name", "current_role"):
+            self.current_roles[person_id] = current_role
+            for n in (name, family_name):
+                if n:
+                    # only case-folded, whitespace in stored names is matched as-is
+                    self.names[n.lower()].add(person_id)
+        for person_id, name in PersonName.objects.filter(
+            person_id__in=person_ids
+        ).values_list("person_id", "name"):
+            self.names[name.lower()].add(person_id)
+
+    def match(
+        self,
+        name: str,
+        start_date: typing.Optional[str] = None,
+        end_date: typing.Optional[str] = None,
+        org_classification: typing.Optional[str] = None,
+    ) -> typing.List[_PersonRow]:
+        """people with this name and a legislative membership overlapping the dates"""
+        if org_classification:
+            classifications: typing.Iterable[str] = (org_classification,)
+        else:
+            classifications = LEGISLATIVE_CLASSIFICATIONS
+
+        rows = []
+        for person_id in self.names.get(normalize_name(name), ()):
+            for classification, m_start, m_end in self.memberships[person_id]:
+                if classification not in classifications:
+                    continue
+                # same rules as resolve_person: exclude people definitely not serving
+                if start_date and not (m_end == "" or (m_end and m_end > start_date)):
+                    continue
+                if end_date and not (m_start == "" or (m_start and m_start < end_date)):
+                    continue
+                rows.append((person_id, self.current_roles[person_id]))
+                break
+        return rows
+
+
+class _OrgRow(typing.NamedTuple):
+    id: str
+    classification: str
+    jurisdiction_id: typing.Optional[str]
+    parent_classification: typing.Optional[str]
+
+
+class OrganizationIndex:
+    """
+    organizations of a jurisdiction (plus all parties), indexed by name and other names
+
+    matches return the same ids that OrganizationImporter.limit_spec's query does
+    """
+
+    # pseudo id fields the index knows how to match, others go to the database
+    fields = {"name", "chamber", "classification"}
+
+    def __init__(self, jurisdiction_id: str):
+        self.jurisdiction_id = jurisdiction_id
+        self.orgs: typing.List[_OrgRow] = []
+        # name__iexact is case-insensitive, other_names__contains is not
+        self.names: typing.Dict[str, typing.List[_OrgRow]] = defaultdict(list)
+        self.other_names: typing.Dict[str, typing.List[_OrgRow]] = defaultdict(list)
+        self.load()
+
+    def load(self) -> None:
+        for (
+            org_id,
+            name,
+            other_names,
+            classification,
+            jurisdiction_id,
+            parent_classification,
+        ) in Organization.objects.filter(
+            Q(jurisdiction_id=self.jurisdiction_id) | Q(classification="party")
+        ).values_list(
+            "id",
+            "name",
+            "other_names",
+            "classification",
+            "jurisdiction_id",
+            "parent__classification",
+        ):
+            row = _OrgRow(org_id, classification, jurisdiction_id, parent_classification)
+            self.orgs.append(row)
+            self.names[name.lower()].append(row)
+            for other in other_names or ():
+                if isinstance(other, dict) and isinstance(other.get("name"), str):
+                    self.other_names[other["name"]].append(row)
+
+    def match(self, spec: typing.Dict[str, typing.Any]) -> typing.Optional[typing.Set[str]]:
+        """
+        ids of the organizations matching a pseudo id spec
+
+        returns None if the spec has fields the index can't match
+        """
+        if not set(spec) <= self.fields:
+            return None
+
+        classification = spec.get("classification")
+        name = spec.get("name")
+        chamber = spec.get("chamber")
+
+        if name:
+            name = org_pseudo_name(name)
+            candidates = self.names.get(name.lower(), []) + self.other_names.get(
+                name, []
+            )
+        else:
+            candidates = self.orgs
+
+        ids = set()
+        for org in candidates:
+            if "classification" in spec and org.classification != classification:
+                continue
+            if classification != "party" and org.jurisdiction_id != self.jurisdiction_id:
+                continue
+            # chamber is only used alongside a name, to find a committee's parent
+            if name and chamber and org.parent_classification != chamber:
+                continue
+            ids.add(org.id)
+        return ids
+
+
+class SessionBillIndex:
+    """
+    a jurisdiction's sessions, sorted by start date, and the ids of their bills
+
+    bills are loaded with one query per session, the first time a session is used
+    """
+
+    def __init__(self, sessions: typing.Sequence[LegislativeSession]):
+        # sessions come newest first, the newest is used when a date is ambiguous
+        self.latest_id = sessions[0].id if sessions else None
+        ordered = sorted(sessions, key=lambda s: s.start_date)
+        self.starts = [session.start_date for session in ordered]
+        self.ends = [(session.id, session.end_date) for session in ordered]
+        # raw date -> (normalized date, session id)
+        self.dates: typing.Dict[str, typing.Tuple[str, typing.Optional[str]]] = {}
+        # session id -> identifier -> bill ids
+        self.bills: typing.Dict[str, typing.Dict[str, typing.List[str]]] = {}
+
+    def session_for_date(self, date: str) -> typing.Tuple[str, typing.Optional[str]]:
+        """normalize date and find the session it falls in"""
+        if date not in self.dates:
+            normalized = datetime.fromisoformat(date).strftime("%Y-%m-%d")
+            # only sessions starting on or before the date can contain it
+            session_ids = [
+                session_id
+                for session_id, end_date in self.ends[
+                    : bisect_right(self.starts, normalized)
+                ]
+                if end_date >= normalized or not end_date
+            ]
+            if len(session_ids) == 1:
+                session_id = session_ids[0]
+            else:
+                session_id = self.latest_id
+            self.dates[date] = (normalized, session_id)
+        return self.dates[date]
+
+    def bill_ids(self, session_id: typing.Optional[str], identifier: str) -> typing.List[str]:
+        if session_id is None:
+            return []
+        if session_id not in self.bills:
+            bills: typing.Dict[str, typing.List[str]] = defaultdict(list)
+            for bill_identifier, bill_id in Bill.objects.filter(
+                legislative_session_id=session_id
+            ).values_list("identifier", "id"):
+                bills[bill_identifier].append(bill_id)
+            self.bills[session_id] = bills
+        return self.bills[session_id].get(identifier, [])
@@ -0,0 +1,11 @@
+"""
+signals sent by importers
+"""
+from django.dispatch import Signal
+
+# sent once the transaction an import ran in commits, if the importer's defer_signals
+# is set, instead of a post_save for each inserted object
+#   sender:  the model class
+#   ids:     ids of the objects that were imported
+#   created: True for inserted objects, False for updated ones
+objects_imported = Signal()
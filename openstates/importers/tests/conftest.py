@@ -0,0 +1,26 @@
+import pytest
+from openstates.scrape import Bill as ScrapeBill
+from openstates.data.models import Division, Jurisdiction, Organization
+
+
+@pytest.fixture
+def jurisdiction(db):
+    """jurisdiction "jid" with a 1900 session and a lower chamber"""
+    Division.objects.create(id="ocd-division/country:us", name="USA")
+    j = Jurisdiction.objects.create(id="jid", division_id="ocd-division/country:us")
+    j.legislative_sessions.create(identifier="1900", name="1900")
+    Organization.objects.create(name="House", classification="lower", jurisdiction=j)
+    return j
+
+
+@pytest.fixture
+def bill_dicts():
+    """makes n scraped bills (HB 0, HB 1...) in the 1900 session, as dicts to import"""
+
+    def make(n, title="Axe & Tack Tax Act"):
+        return [
+            ScrapeBill(f"HB {i}", "1900", title, chamber="lower").as_dict()
+            for i in range(n)
+        ]
+
+    return make
@@ -1,9 +1,12 @@
 import os
 import json
 import shutil
+import subprocess
+import sys
 import tempfile
 import datetime
 import pytest
+import openstates
 from unittest import mock
 from openstates.data.models import (
     Bill,
@@ -14,9 +17,15 @@ from openstates.data.models import (
     Person,
 )
 from openstates.scrape import Bill as ScrapeBill
-from openstates.importers.base import omnihash, BaseImporter
+from openstates.importers.base import omnihash, items_differ, BaseImporter
 from openstates.importers import BillImporter
-from openstates.exceptions import UnresolvedIdError, DataImportError
+from openstates.importers.resolvers import PersonIndex
+from openstates.utils import fingerprint
+from openstates.exceptions import (
+    UnresolvedIdError,
+    DataImportError,
+    DuplicateItemError,
+)
 
 
 def create_jurisdiction():
@@ -48,6 +57,113 @@ def test_omnihash_python_types():
     )
 
 
+def test_fingerprint():
+    assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+    assert fingerprint({"a": [1, 2]}) != fingerprint({"a": [2, 1]})
+    assert fingerprint({"a": 1}) != fingerprint({"a": "1"})
+    assert fingerprint({"and", "a", "set"}) == fingerprint({"set", "set", "and", "a"})
+    assert fingerprint({"d": {"nested": {"x": None}}}) == fingerprint(
+        {"d": {"nested": {"x": None}}}
+    )
+
+
+def test_fingerprint_is_stable_across_processes():
+    data = {"title": "Axe & Tack Tax Act", "actions": [{"description": "passage"}]}
+    code = (
+        "import json, sys; from openstates.utils import fingerprint; "
+        "print(fingerprint(json.load(sys.stdin)))"
+    )
+    hashes = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            input=json.dumps(data),
+            capture_output=True,
+            text=True,
+            check=True,
+            # the directory openstates is in
+            cwd=os.path.dirname(os.path.dirname(openstates.__file__)),
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert hashes == {fingerprint(data)}
+
+
+class FakeManager:
+    def __init__(self, items):
+        self.items = items
+
+    def all(self):
+        return self.items
+
+
+class FakeDBItem:
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+
+class FakeOrderedDBItem(FakeDBItem):
+    order = None
+
+
+def test_items_differ_unordered():
+    dbitems = [FakeDBItem(url="a", note=""), FakeDBItem(url="b", note="")]
+    assert not items_differ(
+        [{"url": "b", "note": ""}, {"url": "a", "note": ""}], dbitems, {}
+    )
+    assert items_differ(
+        [{"url": "b", "note": ""}, {"url": "c", "note": ""}], dbitems, {}
+    )
+    assert items_differ([{"url": "b", "note": ""}], dbitems, {})
+    # duplicates are counted
+    assert items_differ(
+        [{"url": "a", "note": ""}, {"url": "a", "note": ""}], dbitems, {}
+    )
+    # unhashable values
+    dbitems = [FakeDBItem(classification=["passage"], extras={"a": [1]})]
+    assert not items_differ(
+        [{"classification": ["passage"], "extras": {"a": [1]}}], dbitems, {}
+    )
+    assert items_differ(
+        [{"classification": ["passage"], "extras": {"a": [2]}}], dbitems, {}
+    )
+
+
+def test_items_differ_ordered():
+    dbitems = [
+        FakeOrderedDBItem(description="x", order=0),
+        FakeOrderedDBItem(description="y", order=1),
+    ]
+    assert not items_differ([{"description": "x"}, {"description": "y"}], dbitems, {})
+    assert items_differ([{"description": "y"}, {"description": "x"}], dbitems, {})
+
+
+def test_items_differ_subfields():
+    subfield_dict = {"links": (FakeDBItem, "version_id", {})}
+    dbitems = [
+        FakeDBItem(
+            note="v1",
+            links=FakeManager(
+                [FakeDBItem(url="a", media_type=""), FakeDBItem(url="b", media_type="")]
+            ),
+        ),
+        FakeDBItem(note="v2", links=FakeManager([])),
+    ]
+    jsonitems = [
+        {"note": "v2", "links": []},
+        {
+            "note": "v1",
+            "links": [{"url": "b", "media_type": ""}, {"url": "a", "media_type": ""}],
+        },
+    ]
+    assert not items_differ(jsonitems, dbitems, subfield_dict)
+    jsonitems[1]["links"][0]["url"] = "c"
+    assert items_differ(jsonitems, dbitems, subfield_dict)
+    # the json isn't modified by the comparison
+    assert jsonitems[1]["links"][0] == {"url": "c", "media_type": ""}
+
+
 def test_import_directory():
     # write out some temp data to filesystem
     datadir = tempfile.mkdtemp()
@@ -95,6 +211,27 @@ def test_apply_transformers():
     assert output["nested"]["replace"] == "replaced"
 
 
+def test_apply_transformers_lists():
+    ti = FakeImporter("jid")
+    ti.cached_transformers = {"docs": {"note": str.upper}}
+    data = {"docs": [{"note": "a"}, {"url": "b"}], "other": [{"note": "c"}]}
+    assert ti.apply_transformers(data) == {
+        "docs": [{"note": "A"}, {"url": "b"}],
+        "other": [{"note": "c"}],
+    }
+    assert ti.apply_transformers([{"docs": [{"note": "d"}]}]) == [
+        {"docs": [{"note": "D"}]}
+    ]
+
+    # replacing the transformers recompiles them
+    ti.cached_transformers = {"docs": {"note": str.lower}}
+    assert ti.apply_transformers({"docs": [{"note": "E"}]}) == {"docs": [{"note": "e"}]}
+    # as do transformers passed in
+    assert ti.apply_transformers({"x": "f"}, {"x": [str.upper, lambda x: x * 2]}) == {
+        "x": "FF"
+    }
+
+
 # doing these next few tests just on a Bill because it is the same code that handles it
 # but for completeness maybe it is better to do these on each type?
 
@@ -122,6 +259,36 @@ def test_exception_on_identical_objects_in_import_stream():
     assert Bill.objects.count() == 1
 
 
+class NoScanDict(dict):
+    """a dict that fails if something scans its values"""
+
+    def values(self):
+        raise AssertionError("json_to_db_id.values() scanned during import")
+
+
+@pytest.mark.django_db
+def test_duplicate_detection_uses_reverse_index():
+    create_jurisdiction()
+    bi = BillImporter("jid")
+    # lots of previously imported (synthetic) objects
+    bi.json_to_db_id = NoScanDict(
+        (f"json-{n}", f"ocd-bill/{n}") for n in range(50000)
+    )
+    bi.db_to_json_id = {v: k for k, v in bi.json_to_db_id.items()}
+
+    bi.import_data([ScrapeBill("HB 1", "2020", "Title").as_dict()])
+    db_id = Bill.objects.get().id
+    assert bi.db_to_json_id[db_id] in bi.json_to_db_id
+
+    # same bill again under a different title: it resolves to an already imported object
+    with pytest.raises(DuplicateItemError):
+        bi.import_data([ScrapeBill("HB 1", "2020", "New Title").as_dict()])
+    bi.import_data(
+        [ScrapeBill("HB 1", "2020", "New Title").as_dict()], allow_duplicates=True
+    )
+    assert Bill.objects.get().title == "New Title"
+
+
 @pytest.mark.django_db
 def test_resolve_json_id():
     create_jurisdiction()
@@ -198,6 +365,69 @@ def test_resolve_person_case_insensitive():
     assert bi.resolve_person('~{"name": "JohN mCgUIrk"}') == p.id
 
 
+@pytest.mark.django_db
+def test_resolve_person_index(django_assert_num_queries):
+    create_jurisdiction()
+    org = Organization.objects.get(jurisdiction_id="jid", classification="legislature")
+    lower = Organization.objects.create(jurisdiction_id="jid", classification="lower")
+    current = Person.objects.create(
+        name="John McGuirk", family_name="McGuirk", current_role={"title": "Rep"}
+    )
+    current.memberships.create(organization=lower, start_date="2019")
+    former = Person.objects.create(name="Jane McGuirk", family_name="McGuirk")
+    former.memberships.create(organization=org, start_date="2010", end_date="2015")
+    former.other_names.create(name="Janie")
+
+    bi = BillImporter("jid")
+    # the index is loaded once
+    with django_assert_num_queries(3):
+        assert bi.resolve_person('~{"name": "john mcguirk"}') == current.id
+    with django_assert_num_queries(0):
+        assert bi.resolve_person('~{"name": "Janie"}') == former.id
+        # family name matches both, current_role breaks the tie
+        assert bi.resolve_person('~{"name": "McGuirk"}') == current.id
+        assert (
+            bi.resolve_person('~{"name": "mcguirk"}', org_classification="legislature")
+            == former.id
+        )
+    # dates exclude the former member (and misses are checked against the database)
+    assert bi.resolve_person('~{"name": "Janie"}', start_date="2020-01-01") is None
+    # so does the chamber
+    assert bi.resolve_person('~{"name": "Janie", "chamber": "lower"}') is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "stored", ["John McGuirk", "John  McGuirk", "JOHN MCGUIRK", "John McGuirk "]
+)
+def test_resolve_person_index_matches_query(stored):
+    create_jurisdiction()
+    org = Organization.objects.get(jurisdiction_id="jid", classification="legislature")
+    p = Person.objects.create(name=stored)
+    p.memberships.create(organization=org)
+
+    bi = BillImporter("jid")
+    index = PersonIndex("jid")
+    for scraped in ("John McGuirk", "john  mcguirk", "John\tMcGuirk", stored):
+        queried = bi._query_people({"name": scraped}, None, None, None)
+        assert {person_id for person_id, _ in index.match(scraped)} == {
+            row["id"] for row in queried
+        }
+
+
+@pytest.mark.django_db
+def test_resolve_person_index_miss_uses_db():
+    create_jurisdiction()
+    org = Organization.objects.get(jurisdiction_id="jid", classification="legislature")
+    bi = BillImporter("jid")
+    assert bi.resolve_person('~{"name": "John McGuirk"}') is None
+
+    # added after the index was loaded
+    p = Person.objects.create(name="Jim McGuirk")
+    p.memberships.create(organization=org)
+    assert bi.resolve_person('~{"name": "Jim McGuirk"}') == p.id
+
+
 @pytest.mark.django_db
 def test_resolve_bill_by_date():
     j = create_jurisdiction()
@@ -246,3 +476,33 @@ def test_resolve_bill_by_date_open_session():
     )
 
     assert bi.resolve_bill("HB 1", date="2021-05-06") == b.id
+
+
+@pytest.mark.django_db
+def test_resolve_bill_one_query_per_session(django_assert_num_queries):
+    j = create_jurisdiction()
+    # a session without dates would overlap both of these
+    j.legislative_sessions.update(start_date="2020-01-01", end_date="2020-12-31")
+    s2021 = j.legislative_sessions.create(
+        name="2021", identifier="2021", start_date="2021-01-01", end_date="2021-12-31"
+    )
+    s2022 = j.legislative_sessions.create(
+        name="2022", identifier="2022", start_date="2022-01-01", end_date="2022-12-31"
+    )
+    bills = {
+        (session.identifier, n): Bill.objects.create(
+            identifier=f"HB {n}", title="Some Bill", legislative_session=session
+        ).id
+        for session in (s2021, s2022)
+        for n in range(1, 21)
+    }
+    bi = BillImporter("jid")
+
+    # sessions, then one query for each session's bills
+    with django_assert_num_queries(3):
+        for n in range(1, 21):
+            assert bi.resolve_bill(f"HB {n}", date="2021-05-06") == bills["2021", n]
+            assert bi.resolve_bill(f"HB {n}", date="2022-02-01") == bills["2022", n]
+        # dates outside of every session use the latest session
+        assert bi.resolve_bill("HB 1", date="2030-01-01") == bills["2022", 1]
+        assert bi.resolve_bill("HB 99", date="2021-05-06") is None
@@ -1,13 +1,19 @@
+import logging
 import pytest
+from unittest import mock
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from openstates.scrape import Bill as ScrapeBill
-from openstates.importers import BillImporter
+from openstates.importers import BillImporter, resolve_related_bills
 from openstates.data.models import (
     Jurisdiction,
+    LegislativeSession,
     Person,
     Organization,
     Membership,
     Division,
     Bill,
+    ImportHash,
 )
 from openstates.utils.transformers import fix_bill_id
 from openstates.utils.generic import _make_pseudo_id
@@ -193,19 +199,28 @@ def test_bill_update():
     create_org()
 
     bill = ScrapeBill("HB 1", "1900", "First Bill", chamber="lower")
+    session_id = LegislativeSession.objects.get(identifier="1900").id
 
-    _, what = BillImporter("jid").import_item(bill.as_dict())
+    importer = BillImporter("jid")
+    _, what = importer.import_item(bill.as_dict())
     assert what == "insert"
-    _, what = BillImporter("jid").import_item(bill.as_dict())
+    assert importer.get_changed_sessions() == [session_id]
+    importer = BillImporter("jid")
+    _, what = importer.import_item(bill.as_dict())
     assert what == "noop"
+    # the session was seen, but nothing in it changed
+    assert importer.get_seen_sessions() == [session_id]
+    assert importer.get_changed_sessions() == []
 
     # ensure no new object was created
     assert Bill.objects.count() == 1
 
     # test basic update
     bill = ScrapeBill("HB 1", "1900", "1st Bill", chamber="lower")
-    _, what = BillImporter("jid").import_item(bill.as_dict())
+    importer = BillImporter("jid")
+    _, what = importer.import_item(bill.as_dict())
     assert what == "update"
+    assert importer.get_changed_sessions() == [session_id]
     assert Bill.objects.get().title == "1st Bill"
 
 
@@ -530,3 +545,243 @@ def test_bill_duplicate_actions_ordering():
     assert result["bill"]["insert"] == 0
     assert result["bill"]["update"] == 0
     assert result["bill"]["noop"] == 1
+
+
+@pytest.mark.django_db
+def test_bill_chunked_import():
+    create_jurisdiction()
+    create_org()
+
+    def _bills(title):
+        bills = []
+        for n in range(5):
+            bill = ScrapeBill(f"HB {n}", "1900", title, chamber="lower")
+            bill.add_action("introduced", "1900-04-01", chamber="lower")
+            bills.append(bill.as_dict())
+        return bills
+
+    result = BillImporter("jid").import_data(_bills("First"), chunk_size=2)
+    assert result["bill"]["insert"] == 5
+    assert Bill.objects.count() == 5
+
+    result = BillImporter("jid").import_data(_bills("First"), chunk_size=2)
+    assert result["bill"]["noop"] == 5
+
+    bills = _bills("First")
+    bills[3]["title"] = "Updated"
+    result = BillImporter("jid").import_data(bills, chunk_size=10)
+    assert result["bill"]["update"] == 1
+    assert result["bill"]["noop"] == 4
+    assert Bill.objects.get(identifier="HB 3").title == "Updated"
+
+
+@pytest.mark.django_db
+def test_bill_chunked_import_duplicate_in_chunk():
+    create_jurisdiction()
+    create_org()
+    Organization.objects.create(
+        id="upper-id", name="Senate", classification="upper", jurisdiction_id="jid"
+    )
+
+    b1 = ScrapeBill("HB 1", "1900", "Axe & Tack Tax Act", chamber="lower")
+    b2 = ScrapeBill("HB 1", "1900", "Axe & Tack Tax Act", chamber="upper")
+
+    with pytest.raises(DuplicateItemError):
+        BillImporter("jid").import_data([b1.as_dict(), b2.as_dict()], chunk_size=10)
+
+
+@pytest.mark.django_db
+def test_bill_skip_unchanged():
+    create_jurisdiction()
+    create_org()
+
+    def _bill(title="First Bill"):
+        bill = ScrapeBill("HB 1", "1900", title, chamber="lower")
+        bill.add_action("introduced", "1900-04-01", chamber="lower")
+        bill.add_source("http://example.com")
+        return bill.as_dict()
+
+    result = BillImporter("jid").import_data([_bill()], skip_unchanged=True)
+    assert result["bill"]["insert"] == 1
+    assert ImportHash.objects.get().object_id == Bill.objects.get().id
+
+    # unchanged: noop without looking the bill up
+    bi = BillImporter("jid")
+    with mock.patch.object(bi, "get_object") as get_object:
+        result = bi.import_data([_bill()], skip_unchanged=True)
+    assert get_object.call_count == 0
+    assert result["bill"]["noop"] == 1
+    assert result["bill"]["records"]["noop"] == [Bill.objects.get().id]
+
+    # escape hatch does the full diff
+    bi = BillImporter("jid")
+    with mock.patch.object(bi, "get_object", wraps=bi.get_object) as get_object:
+        result = bi.import_data([_bill()], skip_unchanged=True, force_full_diff=True)
+    assert get_object.call_count == 1
+    assert result["bill"]["noop"] == 1
+
+    # changed: full import, and the new hash is stored
+    old_hash = ImportHash.objects.get().content_hash
+    result = BillImporter("jid").import_data([_bill("New")], skip_unchanged=True)
+    assert result["bill"]["update"] == 1
+    assert ImportHash.objects.get().content_hash != old_hash
+
+    # a deleted object is inserted again
+    Bill.objects.all().delete()
+    result = BillImporter("jid").import_data(
+        [_bill("New")], skip_unchanged=True, chunk_size=10
+    )
+    assert result["bill"]["insert"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size", [None, 10])
+def test_bill_skip_unchanged_after_full_import(chunk_size):
+    create_jurisdiction()
+    create_org()
+
+    def _bill(title):
+        return ScrapeBill("HB 1", "1900", title, chamber="lower").as_dict()
+
+    BillImporter("jid").import_data([_bill("A")], skip_unchanged=True)
+    # a normal import changes the bill, and its stored hash is no longer valid
+    result = BillImporter("jid").import_data([_bill("B")], chunk_size=chunk_size)
+    assert result["bill"]["update"] == 1
+    assert not ImportHash.objects.exists()
+
+    result = BillImporter("jid").import_data(
+        [_bill("A")], skip_unchanged=True, chunk_size=chunk_size
+    )
+    assert result["bill"]["update"] == 1
+    assert Bill.objects.get().title == "A"
+
+
+@pytest.mark.django_db
+def test_bill_skip_unchanged_chunked():
+    create_jurisdiction()
+    create_org()
+
+    def _bills():
+        return [
+            ScrapeBill(f"HB {n}", "1900", "Title", chamber="lower").as_dict()
+            for n in range(4)
+        ]
+
+    BillImporter("jid").import_data(_bills(), skip_unchanged=True, chunk_size=3)
+    assert ImportHash.objects.count() == 4
+
+    bills = _bills()
+    bills[0]["title"] = "Changed"
+    bi = BillImporter("jid")
+    with mock.patch.object(bi, "get_objects", wraps=bi.get_objects) as get_objects:
+        result = bi.import_data(bills, skip_unchanged=True, chunk_size=3)
+    assert result["bill"]["update"] == 1
+    assert result["bill"]["noop"] == 3
+    # only the changed bill was preloaded
+    assert get_objects.call_count == 1
+    assert len(get_objects.call_args[0][0]) == 1
+
+
+@pytest.mark.django_db
+def test_bill_copy_bulk_loader():
+    create_jurisdiction()
+    create_org()
+    person = Person.objects.create(name="Adam Smith")
+    Membership.objects.create(person_id=person.id, organization_id="org-id")
+
+    def _bill():
+        bill = ScrapeBill("HB 1", "1900", "Axe & Tack Tax Act", chamber="lower")
+        bill.add_action(
+            "introduced\tin\\house",
+            "1900-04-01",
+            chamber="lower",
+            classification=["introduction", 'has "quotes"'],
+        )
+        act = bill.add_action("sent to\ncommittee", "1900-04-04", chamber="lower")
+        act.add_related_entity(
+            "Adam Smith", "person", _make_pseudo_id(name="Adam Smith")
+        )
+        bill.add_sponsorship(
+            "Adam Smith",
+            classification="sponsor",
+            entity_type="person",
+            primary=True,
+            entity_id=_make_pseudo_id(name="Adam Smith"),
+        )
+        bill.add_version_link("v1", "http://example.com/v1", media_type="text/html")
+        bill.add_source("http://example.com")
+        bill.extras = {"key": "value"}
+        return bill.as_dict()
+
+    bi = BillImporter("jid")
+    bi.bulk_loader = "copy"
+    result = bi.import_data([_bill()], chunk_size=10)
+    assert result["bill"]["insert"] == 1
+
+    b = Bill.objects.get()
+    actions = list(b.actions.order_by("order"))
+    assert actions[0].description == "introduced\tin\\house"
+    assert sorted(actions[0].classification) == ['has "quotes"', "introduction"]
+    assert actions[1].description == "sent to\ncommittee"
+    assert actions[1].related_entities.get().person_id == person.id
+    assert b.sponsorships.get().primary is True
+    assert b.versions.get().links.get().url == "http://example.com/v1"
+    # computed fields see the actions written by the loader
+    assert b.latest_action_description == "sent to\ncommittee"
+
+    bi = BillImporter("jid")
+    bi.bulk_loader = "copy"
+    result = bi.import_data([_bill()], chunk_size=10)
+    assert result["bill"]["noop"] == 1
+
+
+@pytest.mark.django_db
+def test_resolve_related_bills(caplog):
+    j = create_jurisdiction()
+    Jurisdiction.objects.create(id="other", division_id="ocd-division/country:us")
+    other = Jurisdiction.objects.get(id="other").legislative_sessions.create(
+        identifier="1900", name="1900"
+    )
+    s1899, s1900 = j.legislative_sessions.order_by("identifier")
+    hb1 = Bill.objects.create(identifier="HB 1", title="", legislative_session=s1900)
+    hb2 = Bill.objects.create(identifier="HB 2", title="", legislative_session=s1899)
+    other_hb2 = Bill.objects.create(identifier="HB 2", title="", legislative_session=other)
+    old = Bill.objects.create(identifier="HB 9", title="", legislative_session=s1899)
+    # one resolvable, one for a bill that doesn't exist, one in the other session
+    resolvable = hb1.related_bills.create(
+        identifier="HB 2", legislative_session="1899", relation_type="companion"
+    )
+    missing = hb1.related_bills.create(
+        identifier="HB 3", legislative_session="1899", relation_type="companion"
+    )
+    other_session = old.related_bills.create(
+        identifier="HB 2", legislative_session="1899", relation_type="companion"
+    )
+    # the other jurisdiction's bills are never linked
+    other_hb2.related_bills.create(
+        identifier="HB 2", legislative_session="1899", relation_type="companion"
+    )
+
+    logger = logging.getLogger("openstates")
+    with caplog.at_level(logging.DEBUG, "openstates"):
+        resolve_related_bills("jid", "1900", logger)
+    resolvable.refresh_from_db()
+    other_session.refresh_from_db()
+    assert resolvable.related_bill == hb2
+    assert other_session.related_bill is None
+    assert "Found 2 unresolved bill relationships in jid-1900" in caplog.text
+    assert "Resolved 1899 HB 1" in caplog.text
+    assert "FAILED to resolve 1899 HB 1" in caplog.text
+    assert "Resolved 1 bills out of 2 bills needing resolution" in caplog.text
+
+    with caplog.at_level(logging.INFO, "openstates"), CaptureQueriesContext(
+        connection
+    ) as queries:
+        resolve_related_bills("jid", None, logger)
+    # a count and the update, however many relationships there are
+    assert len(queries) == 2
+    other_session.refresh_from_db()
+    missing.refresh_from_db()
+    assert other_session.related_bill == hb2
+    assert missing.related_bill is None
+    assert other_hb2.related_bills.get().related_bill is None
@@ -0,0 +1,118 @@
+import copy
+import json
+import pytest
+from unittest import mock
+from openstates.importers import BillImporter, VoteEventImporter
+from openstates.importers.checkpoint import ImportCheckpoint
+from openstates.data.models import Bill
+from openstates.exceptions import DataImportError
+
+
+@pytest.mark.django_db
+def test_resume_from_checkpoint(tmp_path, jurisdiction, bill_dicts):
+    bills = bill_dicts(5)
+    json_ids = [bill["_id"] for bill in bills]
+    path = str(tmp_path / "import_checkpoint.jsonl")
+
+    import_prepared_item = BillImporter.import_prepared_item
+
+    def fail_on_hb3(self, data, allow_duplicates=False):
+        if data["identifier"] == "HB 3":
+            raise DataImportError("failed")
+        return import_prepared_item(self, data, allow_duplicates)
+
+    with mock.patch.object(BillImporter, "import_prepared_item", fail_on_hb3):
+        with mock.patch.object(BillImporter, "postimport") as postimport:
+            with pytest.raises(DataImportError):
+                BillImporter("jid").import_data(
+                    copy.deepcopy(bills), chunk_size=2, checkpoint=ImportCheckpoint(path)
+                )
+    # the first chunk was committed, the failed one rolled back
+    assert postimport.call_count == 0
+    assert sorted(Bill.objects.values_list("identifier", flat=True)) == ["HB 0", "HB 1"]
+    state = ImportCheckpoint.load(path).state["bill"]
+    assert len(state["json_to_db_id"]) == 2
+    assert state["last_json_id"] == json_ids[1]
+    assert state["sessions"] == ["1900"]
+
+    checkpoint = ImportCheckpoint.load(path)
+    bi = BillImporter("jid")
+    checkpoint.restore(bi)
+    with mock.patch.object(BillImporter, "postimport") as postimport:
+        # the same files are imported again
+        result = bi.import_data(bills, chunk_size=2, checkpoint=checkpoint)
+    assert postimport.call_count == 1
+    assert result["bill"]["insert"] == 3
+    assert Bill.objects.count() == 5
+    # ids imported before the failure can still be resolved
+    assert len(bi.json_to_db_id) == 5
+    assert bi.resolve_json_id(json_ids[0]) == Bill.objects.get(identifier="HB 0").id
+
+    checkpoint.clear()
+    assert ImportCheckpoint.load(path).state == {}
+
+
+@pytest.mark.django_db
+def test_checkpoint_saves_deltas(tmp_path, jurisdiction, bill_dicts):
+    bills = bill_dicts(5)
+    json_ids = [bill["_id"] for bill in bills]
+    path = tmp_path / "import_checkpoint.jsonl"
+    # left behind by an earlier run
+    path.write_text(json.dumps(["event", {"json_to_db_id": {"a": "b"}}]) + "\n")
+
+    with mock.patch.object(BillImporter, "postimport"):
+        bi = BillImporter("jid")
+        bi.import_data(bills, chunk_size=2, checkpoint=ImportCheckpoint(str(path)))
+
+    # a line per chunk, each with just the bills it imported
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [_type for _type, _ in lines] == ["bill"] * 3
+    assert [list(delta["json_to_db_id"]) for _, delta in lines] == [
+        json_ids[:2],
+        json_ids[2:4],
+        json_ids[4:],
+    ]
+    assert [delta["sessions"] for _, delta in lines] == [["1900"], [], []]
+    assert lines[-1][1]["last_json_id"] == json_ids[4]
+
+    # an incomplete last line is skipped, and loading compacts what's left
+    with open(path, "a") as f:
+        f.write('["bill", {"json_to_db_id": {"x')
+    checkpoint = ImportCheckpoint.load(str(path))
+    assert checkpoint.state["bill"]["json_to_db_id"] == bi.json_to_db_id
+    assert checkpoint.state["bill"]["last_json_id"] == json_ids[4]
+    assert len(path.read_text().splitlines()) == 1
+
+    # and later saves still only append what's new
+    restored = BillImporter("jid")
+    checkpoint.restore(restored)
+    restored.json_to_db_id["new"] = "ocd-bill/new"
+    checkpoint.save(restored)
+    _, delta = json.loads(path.read_text().splitlines()[-1])
+    assert delta["json_to_db_id"] == {"new": "ocd-bill/new"}
+    assert ImportCheckpoint.load(str(path)).state["bill"]["json_to_db_id"] == dict(
+        bi.json_to_db_id, new="ocd-bill/new"
+    )
+
+
+@pytest.mark.django_db
+def test_checkpoint_requires_chunks(tmp_path):
+    with pytest.raises(ValueError):
+        BillImporter("jid").import_data(
+            [], checkpoint=ImportCheckpoint(str(tmp_path / "checkpoint.json"))
+        )
+
+
+def test_vote_event_checkpoint_state():
+    bi = BillImporter("jid")
+    vi = VoteEventImporter("jid", bi)
+    vi.json_to_db_id = {"vote": "ocd-vote/1"}
+    vi.seen_bill_ids = {"ocd-bill/1"}
+    vi.seen_action_ids = {"action"}
+
+    restored = VoteEventImporter("jid", bi)
+    restored.restore_checkpoint(json.loads(json.dumps(vi.checkpoint_state())))
+    assert restored.db_to_json_id == {"ocd-vote/1": "vote"}
+    assert restored.resumed_ids == {"vote"}
+    assert restored.seen_bill_ids == {"ocd-bill/1"}
+    assert restored.seen_action_ids == {"action"}
@@ -1,6 +1,10 @@
 import pytest
 from openstates.data.models import Jurisdiction, Division, Organization, Bill
-from ..computed_fields import update_bill_fields
+from ..computed_fields import (
+    compute_bill_fields,
+    update_bill_fields,
+    update_bill_fields_in_bulk,
+)
 
 
 def create_data():
@@ -45,3 +49,107 @@ def test_update_bill_basic():
     assert b.latest_action_date == "2020-04-22"
     assert b.latest_passage_date == "2020-04-21"
     assert b.latest_action_description == "Amended in Senate"
+
+
+def bill_fields(bill):
+    bill.refresh_from_db()
+    return (
+        bill.first_action_date,
+        bill.latest_action_date,
+        bill.latest_action_description,
+        bill.latest_passage_date,
+    )
+
+
+@pytest.mark.django_db
+def test_update_bill_fields_in_bulk():
+    session, org = create_data()
+    actions = {
+        "HB1": [
+            ("2020-04-20", "Introduced", []),
+            ("2020-04-22", "Something Else", []),
+            ("2020-04-21", "Passed House", ["passage"]),
+            ("2020-04-22", "Amended in Senate", []),
+        ],
+        "HB2": [
+            ("2020-01-02T10:00:00", "Later that day", ["passage"]),
+            ("2020-01-02", "Filed", []),
+            ("2020-01-10", "Passed", ["passage", "became-law"]),
+        ],
+        "HB3": [],
+        "HB4": [("2021-02-01", "Referred", ["referral-committee"])],
+        # blank dates, first and last, are ignored by both
+        "HB5": [
+            ("", "Prefiled", ["passage"]),
+            ("2021-03-01", "Introduced", []),
+            ("2021-03-02", "Passed", ["passage"]),
+            ("", "Undated", []),
+        ],
+        "HB6": [("", "Undated", ["passage"])],
+    }
+    bills = []
+    for identifier, bill_actions in actions.items():
+        bill = Bill.objects.create(
+            identifier=identifier,
+            title=identifier,
+            legislative_session_id=session,
+            # stale values that should all get updated
+            first_action_date="1999-01-01",
+            latest_action_description="stale",
+        )
+        for order, (date, description, classification) in enumerate(bill_actions):
+            bill.actions.create(
+                date=date,
+                description=description,
+                classification=classification,
+                order=order,
+                organization=org,
+            )
+        bills.append(bill)
+
+    assert update_bill_fields_in_bulk(jurisdiction_id="jid") == 6
+    bulk = [bill_fields(bill) for bill in bills]
+    # nothing left to change
+    assert update_bill_fields_in_bulk(jurisdiction_id="jid") == 0
+
+    # the same as one bill at a time
+    Bill.objects.update(first_action_date="1999-01-01")
+    for bill in bills:
+        bill.refresh_from_db()
+        update_bill_fields(bill)
+    assert [bill_fields(bill) for bill in bills] == bulk
+    assert bulk[0] == ("2020-04-20", "2020-04-22", "Amended in Senate", "2020-04-21")
+    assert bulk[1][1:] == ("2020-01-10", "Passed", "2020-01-10")
+    assert bulk[2] == (None, None, "", None)
+    assert bulk[4] == ("2021-03-01", "2021-03-02", "Passed", "2021-03-02")
+    assert bulk[5] == (None, None, "", None)
+
+
+@pytest.mark.django_db
+def test_update_bill_fields_in_bulk_bill_ids():
+    session, org = create_data()
+    b1 = Bill.objects.create(identifier="HB1", title="One", legislative_session_id=session)
+    b2 = Bill.objects.create(identifier="HB2", title="Two", legislative_session_id=session)
+    for bill in (b1, b2):
+        bill.actions.create(date="2020-04-20", description="Introduced", order=0, organization=org)
+
+    assert update_bill_fields_in_bulk(bill_ids=[b1.id]) == 1
+    assert bill_fields(b1)[0] == "2020-04-20"
+    assert bill_fields(b2)[0] is None
+    with pytest.raises(ValueError):
+        update_bill_fields_in_bulk()
+
+
+def test_compute_bill_fields():
+    assert compute_bill_fields(
+        [
+            ("2020-04-20", "Introduced", []),
+            ("2020-04-22", "Passed", ["passage"]),
+            ("2020-04-22", "Sent to Governor", []),
+        ]
+    ) == {
+        "first_action_date": "2020-04-20",
+        "latest_action_date": "2020-04-22",
+        "latest_action_description": "Sent to Governor",
+        "latest_passage_date": "2020-04-22",
+    }
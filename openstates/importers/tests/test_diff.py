@@ -0,0 +1,93 @@
+import json
+import pytest
+from openstates.scrape import Bill as ScrapeBill, VoteEvent as ScrapeVoteEvent
+from openstates.importers import BillImporter, VoteEventImporter
+from openstates.importers.diff import ImportDiff
+from openstates.data.models import (
+    Bill,
+    ImportHash,
+    Organization,
+    VoteEvent,
+)
+
+
+def read_diff(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_dry_run_bills(tmp_path, chunk_size, jurisdiction):
+    hb1 = ScrapeBill("HB 1", "1900", "First Bill", chamber="lower")
+    hb1.add_action("Introduced", date="1900-01-01", chamber="lower")
+    hb2 = ScrapeBill("HB 2", "1900", "Second Bill", chamber="lower")
+    BillImporter("jid").import_data([hb1.as_dict(), hb2.as_dict()])
+    hb1_id = Bill.objects.get(identifier="HB 1").id
+
+    hb1 = ScrapeBill("HB 1", "1900", "1st Bill", chamber="lower")
+    hb1.add_action("Introduced", date="1900-01-01", chamber="lower")
+    hb1.add_action("Passed", date="1900-02-01", chamber="lower")
+    hb3 = ScrapeBill("HB 3", "1900", "Third Bill", chamber="lower")
+
+    path = str(tmp_path / "import_diff.jsonl")
+    with ImportDiff(path) as diff:
+        result = BillImporter("jid").import_data(
+            [hb1.as_dict(), hb2.as_dict(), hb3.as_dict()],
+            chunk_size=chunk_size,
+            skip_unchanged=True,
+            diff=diff,
+        )
+    assert result["bill"]["insert"] == 1
+    assert result["bill"]["update"] == 1
+    assert result["bill"]["noop"] == 1
+    assert diff.counts == {("bill", "insert"): 1, ("bill", "update"): 1}
+
+    update, insert = read_diff(path)
+    assert update["type"] == "bill"
+    assert update["action"] == "update"
+    assert update["id"] == hb1_id
+    assert update["fields"]["title"] == ["First Bill", "1st Bill"]
+    assert update["related"] == {"actions": "update"}
+    assert insert["action"] == "insert"
+    assert insert["id"].startswith("ocd-bill/")
+    assert insert["data"]["identifier"] == "HB 3"
+
+    # nothing was written
+    assert Bill.objects.count() == 2
+    hb1_obj = Bill.objects.get(id=hb1_id)
+    assert hb1_obj.title == "First Bill"
+    assert hb1_obj.actions.count() == 1
+    assert not ImportHash.objects.exists()
+
+
+@pytest.mark.django_db
+def test_dry_run_vote_event_delete(tmp_path, jurisdiction):
+    bill = Bill.objects.create(
+        identifier="HB 1",
+        legislative_session=jurisdiction.legislative_sessions.get(),
+        from_organization=Organization.objects.get(),
+    )
+    vote_events = [
+        ScrapeVoteEvent(
+            legislative_session="1900",
+            start_date="1900-04-01",
+            classification="passage",
+            result="passed",
+            motion_text=motion_text,
+            bill="HB 1",
+            bill_chamber="lower",
+            chamber="lower",
+        )
+        for motion_text in ("a vote", "another vote")
+    ]
+    bi = BillImporter("jid")
+    VoteEventImporter("jid", bi).import_data([ve.as_dict() for ve in vote_events])
+    gone = VoteEvent.objects.get(motion_text="another vote")
+
+    path = str(tmp_path / "import_diff.jsonl")
+    with ImportDiff(path) as diff:
+        VoteEventImporter("jid", bi).import_data([vote_events[0].as_dict()], diff=diff)
+
+    assert read_diff(path) == [{"type": "vote_event", "action": "delete", "id": gone.id}]
+    assert bill.votes.count() == 2
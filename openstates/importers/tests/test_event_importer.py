@@ -386,3 +386,26 @@ def test_event_soft_deletion():
     assert result["event"]["noop"] == 1
     assert Event.objects.count() == 2
     assert Event.objects.filter(deleted=True).count() == 0
+
+
+@pytest.mark.django_db
+def test_event_soft_deletion_skip_unchanged():
+    create_jurisdiction()
+    event1 = ge()
+    event2 = ge()
+    event2.name = "Other Event"
+    EventImporter(jid, vei).import_data(
+        [event1.as_dict(), event2.as_dict()], skip_unchanged=True
+    )
+
+    # delete, the deleted event's hash no longer applies
+    EventImporter(jid, vei).import_data([event1.as_dict()], skip_unchanged=True)
+    assert Event.objects.get(deleted=True).name == "Other Event"
+
+    # undelete
+    result = EventImporter(jid, vei).import_data(
+        [event1.as_dict(), event2.as_dict()], skip_unchanged=True
+    )
+    assert result["event"]["update"] == 1
+    assert result["event"]["noop"] == 1
+    assert Event.objects.filter(deleted=True).count() == 0
@@ -0,0 +1,98 @@
+import pytest
+from openstates.importers import OrganizationImporter
+from openstates.importers.base import BaseImporter
+from openstates.data.models import Jurisdiction, Organization, Division
+from openstates.exceptions import UnresolvedIdError
+from openstates.utils.generic import _make_pseudo_id
+
+
+def create_orgs():
+    Division.objects.create(id="ocd-division/country:us", name="USA")
+    Jurisdiction.objects.create(id="jid", division_id="ocd-division/country:us")
+    Jurisdiction.objects.create(id="other", division_id="ocd-division/country:us")
+    upper = Organization.objects.create(
+        id="upper", name="Senate", classification="upper", jurisdiction_id="jid"
+    )
+    lower = Organization.objects.create(
+        id="lower", name="House", classification="lower", jurisdiction_id="jid"
+    )
+    Organization.objects.create(
+        id="senate-finance",
+        name="Finance and Taxation",
+        classification="committee",
+        jurisdiction_id="jid",
+        parent=upper,
+    )
+    Organization.objects.create(
+        id="house-finance",
+        name="Finance and Taxation",
+        classification="committee",
+        jurisdiction_id="jid",
+        parent=lower,
+        other_names=[{"name": "Ways and Means"}],
+    )
+    Organization.objects.create(
+        id="other-house",
+        name="House",
+        classification="lower",
+        jurisdiction_id="other",
+    )
+    Organization.objects.create(
+        id="democratic", name="Democratic", classification="party"
+    )
+
+
+@pytest.mark.django_db
+def test_resolve_org_pseudo_ids(django_assert_num_queries):
+    create_orgs()
+    oi = OrganizationImporter("jid")
+
+    # the index is loaded with one query, everything after that is in memory
+    with django_assert_num_queries(1):
+        assert oi.resolve_json_id(_make_pseudo_id(classification="lower")) == "lower"
+        assert oi.resolve_json_id(_make_pseudo_id(name="house")) == "lower"
+        assert (
+            oi.resolve_json_id(_make_pseudo_id(name="finance & taxation", chamber="upper"))
+            == "senate-finance"
+        )
+        assert oi.resolve_json_id(_make_pseudo_id(name="ways and means")) == "house-finance"
+        assert (
+            oi.resolve_json_id(_make_pseudo_id(classification="party", name="Democratic"))
+            == "democratic"
+        )
+        with pytest.raises(UnresolvedIdError) as e:
+            oi.resolve_json_id(_make_pseudo_id(name="Finance and Taxation"))
+        assert "multiple objects returned for Organization pseudo id" in str(e.value)
+        with pytest.raises(UnresolvedIdError) as e:
+            oi.resolve_json_id(_make_pseudo_id(name="Appropriations"))
+        assert "cannot resolve pseudo id to Organization" in str(e.value)
+
+
+@pytest.mark.django_db
+def test_resolve_org_pseudo_ids_match_query():
+    create_orgs()
+    indexed = OrganizationImporter("jid")
+    queried = OrganizationImporter("jid")
+    specs = [
+        {"classification": "lower"},
+        {"classification": "committee"},
+        {"classification": "party"},
+        {"name": "house"},
+        {"name": "House", "chamber": "lower"},
+        {"name": "Finance & Taxation"},
+        {"name": "Finance and Taxation", "chamber": "lower"},
+        {"name": "Ways and Means"},
+        {"name": "ways and means"},
+        {"name": "Democratic", "classification": "party"},
+        {"name": "Democratic"},
+    ]
+    for spec in specs:
+        # BaseImporter.match_pseudo_id runs limit_spec's query
+        assert indexed.match_pseudo_id(dict(spec)) == BaseImporter.match_pseudo_id(
+            queried, dict(spec)
+        ), spec
+
+
+def test_do_postimport():
+    assert OrganizationImporter("jid").do_postimport
+    assert not OrganizationImporter("jid", do_postimport=False).do_postimport
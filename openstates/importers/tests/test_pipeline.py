@@ -0,0 +1,100 @@
+import glob
+import json
+import os
+import pytest
+from openstates.scrape import Bill as ScrapeBill
+from openstates.importers import BillImporter, EventImporter, JurisdictionImporter
+from openstates.importers.base import TransformedItem
+from openstates.importers.pipeline import ImportPipeline
+from openstates.importers.readers import DirectoryReader
+from openstates.data.models import Bill, Division, Jurisdiction, Organization
+
+
+def write_bills(datadir, count, title="Axe & Tack Tax Act"):
+    for n in range(count):
+        bill = ScrapeBill(f"HB {n}", "1900", title, chamber="lower")
+        with open(os.path.join(datadir, f"bill_{bill._id}.json"), "w") as f:
+            json.dump(bill.as_dict(), f)
+
+
+def test_pipeline_streams_in_directory_order(tmp_path):
+    write_bills(tmp_path, 250)
+    for n in range(3):
+        with open(tmp_path / f"event_{n}.json", "w") as f:
+            json.dump({"_id": str(n)}, f)
+
+    expected_ids = []
+    for fname in glob.glob(os.path.join(tmp_path, "bill_*.json")):
+        with open(fname) as f:
+            expected_ids.append(json.load(f)["_id"])
+
+    importers = [
+        JurisdictionImporter("jid"),
+        BillImporter("jid"),
+        EventImporter("jid", None),
+    ]
+    reader = DirectoryReader(str(tmp_path))
+    with ImportPipeline(reader, importers, 2) as pipeline:
+        assert list(pipeline.stream("jurisdiction")) == []
+        bills = list(pipeline.stream("bill"))
+        assert [b.json_id for b in bills] == expected_ids
+        assert sorted(e.json_id for e in pipeline.stream("event")) == ["0", "1", "2"]
+
+
+def test_pipeline_transforms_in_workers(tmp_path):
+    write_bills(tmp_path, 3)
+    bill_importer = BillImporter("jid")
+    bill_importer.cached_transformers = {"title": str.upper}
+
+    with ImportPipeline(DirectoryReader(str(tmp_path)), [bill_importer], 2) as pipeline:
+        bills = list(pipeline.stream("bill"))
+
+    for bill in bills:
+        assert isinstance(bill, TransformedItem)
+        assert bill["title"] == "AXE & TACK TAX ACT"
+        assert "_id" not in bill
+        assert "jurisdiction" not in bill
+
+
+@pytest.mark.django_db
+def test_pipeline_import(tmp_path):
+    Division.objects.create(id="ocd-division/country:us", name="USA")
+    j = Jurisdiction.objects.create(id="jid", division_id="ocd-division/country:us")
+    j.legislative_sessions.create(identifier="1900", name="1900")
+    Organization.objects.create(name="House", classification="lower", jurisdiction=j)
+    write_bills(tmp_path, 5)
+    # duplicates are found from the fingerprints the workers computed
+    write_bills(tmp_path, 1)
+
+    bill_importer = BillImporter("jid")
+    with ImportPipeline(DirectoryReader(str(tmp_path)), [bill_importer], 2) as pipeline:
+        result = bill_importer.import_data(pipeline.stream("bill"))
+    assert result["bill"]["insert"] == 5
+    assert len(bill_importer.duplicates) == 1
+    assert Bill.objects.count() == 5
+
+    # the same report as importing without workers
+    datadir = tmp_path / "changed"
+    datadir.mkdir()
+    write_bills(datadir, 6, "Tack Tax Act")
+    with ImportPipeline(DirectoryReader(str(datadir)), [bill_importer], 2) as pipeline:
+        piped = BillImporter("jid").import_data(pipeline.stream("bill"))
+    Bill.objects.update(title="Axe & Tack Tax Act")
+    Bill.objects.filter(identifier="HB 5").delete()
+    direct = BillImporter("jid").import_directory(str(datadir))
+    assert piped["bill"]["insert"] == direct["bill"]["insert"] == 1
+    assert piped["bill"]["update"] == direct["bill"]["update"] == 5
+
+
+def test_pipeline_type_bundle(tmp_path):
+    with open(tmp_path / "scrape_bundle.bill.jsonl", "w") as f:
+        for n in range(3):
+            f.write(json.dumps({"_id": str(n)}) + "\n")
+    with open(tmp_path / "event_1.json", "w") as f:
+        json.dump({"_id": "e"}, f)
+
+    reader = DirectoryReader(str(tmp_path))
+    importers = [BillImporter("jid"), EventImporter("jid", None)]
+    with ImportPipeline(reader, importers, 2) as pipeline:
+        assert [b["_id"] for b in pipeline.stream("bill")] == ["0", "1", "2"]
+        assert [e.json_id for e in pipeline.stream("event")] == ["e"]
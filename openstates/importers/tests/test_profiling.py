@@ -0,0 +1,84 @@
+import time
+import pytest
+from django.db import connection
+from openstates.importers import BillImporter
+from openstates.importers.profiling import ImportProfiler
+from openstates.data.models import Jurisdiction
+
+
+def test_nested_stages_are_exclusive():
+    profiler = ImportProfiler()
+    start = time.perf_counter()
+    with profiler.stage("other"):
+        time.sleep(0.01)
+        for _ in range(2):
+            with profiler.stage("write"):
+                time.sleep(0.02)
+    elapsed = time.perf_counter() - start
+
+    stages = profiler.as_dict()
+    assert stages["write"]["calls"] == 2
+    assert stages["write"]["wall"] >= 0.04
+    assert stages["other"]["wall"] >= 0.01
+    # time spent in write isn't also counted in other
+    assert stages["write"]["wall"] + stages["other"]["wall"] <= elapsed
+
+
+def test_iterate():
+    profiler = ImportProfiler()
+
+    def slow_items():
+        for n in range(3):
+            time.sleep(0.01)
+            yield n
+
+    start = time.perf_counter()
+    with profiler.stage("other"):
+        items = []
+        for item in profiler.iterate("read", slow_items()):
+            items.append(item)
+            time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    assert items == [0, 1, 2]
+    stages = profiler.as_dict()
+    # one call per item, and one more to find the end
+    assert stages["read"]["calls"] == 4
+    assert stages["read"]["wall"] >= 0.03
+    assert stages["other"]["wall"] >= 0.03
+    # the consumer's time isn't counted as reading
+    assert stages["read"]["wall"] + stages["other"]["wall"] <= elapsed
+    # in the order of STAGES
+    assert list(stages) == ["read", "other"]
+
+
+@pytest.mark.django_db
+def test_count_query():
+    profiler = ImportProfiler()
+    with connection.execute_wrapper(profiler.count_query):
+        with profiler.stage("lookup"):
+            Jurisdiction.objects.count()
+            with profiler.stage("write"):
+                Jurisdiction.objects.count()
+        # outside any stage, not counted
+        Jurisdiction.objects.count()
+    stages = profiler.as_dict()
+    assert stages["lookup"]["queries"] == 1
+    assert stages["write"]["queries"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_import_data_stages(chunk_size, jurisdiction, bill_dicts):
+    bills = bill_dicts(3)
+
+    result = BillImporter("jid").import_data(bills, chunk_size=chunk_size)
+    stages = result["bill"]["stages"]
+    assert {"read", "dedupe", "transform", "prepare", "lookup", "write", "other"} <= set(
+        stages
+    )
+    assert stages["transform"]["calls"] == 3
+    assert stages["read"]["calls"] == 4
+    # bills are inserted, so they're written but never diffed
+    assert "diff" not in stages
+    assert stages["write"]["queries"] > 0
@@ -0,0 +1,66 @@
+import glob
+import gzip
+import json
+import os
+from unittest import mock
+from openstates.importers.readers import DirectoryReader
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_reader_files_match_glob(tmp_path):
+    for name in ("bill_1", "bill_2", "vote_event_1", "event_1", "event_2"):
+        write(tmp_path / f"{name}.json", {"_id": name})
+    write(tmp_path / "bill_3.jsonl", {})
+    reader = DirectoryReader(str(tmp_path))
+
+    for _type in ("bill", "vote_event", "event", "jurisdiction"):
+        assert reader.files(_type) == glob.glob(
+            os.path.join(tmp_path, _type + "_*.json")
+        )
+    assert sorted(d["_id"] for d in reader.read("event")) == ["event_1", "event_2"]
+
+
+def test_reader_lists_directory_once(tmp_path):
+    write(tmp_path / "bill_1.json", {"_id": "1"})
+    reader = DirectoryReader(str(tmp_path))
+    with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+        for _type in ("jurisdiction", "bill", "vote_event", "event"):
+            list(reader.read(_type))
+    assert scandir.call_count == 1
+
+
+def test_reader_missing_directory(tmp_path):
+    assert list(DirectoryReader(str(tmp_path / "missing")).read("bill")) == []
+
+
+def test_reader_decodes_like_json(tmp_path):
+    data = {"_id": "1", "extras": {"nan": float("nan"), "big": 2**70, "s": "é"}}
+    write(tmp_path / "bill_1.json", data)
+    (read,) = DirectoryReader(str(tmp_path)).read("bill")
+    assert read["extras"]["big"] == 2**70
+    assert read["extras"]["nan"] != read["extras"]["nan"]
+    assert read["extras"]["s"] == "é"
+
+
+def test_reader_bundle(tmp_path):
+    write(tmp_path / "bill_ignored.json", {"_id": "ignored"})
+    write(tmp_path / "event_1.json", {"_id": "1"})
+    with open(tmp_path / "scrape_bundle.bill.jsonl", "w") as f:
+        f.write(json.dumps({"_id": "2"}) + "\n")
+        f.write("\n")
+    # a part written by another process, appended to as another gzip member
+    for n in (3, 4):
+        with gzip.open(tmp_path / "scrape_bundle.bill.123.jsonl.gz", "at") as f:
+            f.write(json.dumps({"_id": str(n)}) + "\n")
+    with open(tmp_path / "scrape_bundle.vote_event.jsonl", "w") as f:
+        f.write(json.dumps({"_id": "5"}) + "\n")
+    reader = DirectoryReader(str(tmp_path))
+
+    assert sorted(d["_id"] for d in reader.read("bill")) == ["2", "3", "4"]
+    assert list(reader.read("vote_event")) == [{"_id": "5"}]
+    # types without a bundle are still read from their files
+    assert list(reader.read("event")) == [{"_id": "1"}]
@@ -0,0 +1,78 @@
+import pytest
+from django.db.models.signals import post_save
+from openstates.scrape import Bill as ScrapeBill
+from openstates.importers import BillImporter
+from openstates.importers.signals import objects_imported
+from openstates.data.models import Bill
+
+
+@pytest.fixture
+def received():
+    calls = []
+
+    def receiver(sender, ids, created, **kwargs):
+        calls.append((sender, sorted(ids), created))
+
+    objects_imported.connect(receiver)
+    yield calls
+    objects_imported.disconnect(receiver)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("chunk_size", [None, 2])
+def test_objects_imported_on_commit(
+    received, django_capture_on_commit_callbacks, chunk_size, jurisdiction, bill_dicts
+):
+    importer = BillImporter("jid")
+    importer.defer_signals = True
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        importer.import_data(bill_dicts(3), chunk_size=chunk_size)
+    # nothing is sent until the transaction commits
+    assert received == []
+    for callback in callbacks:
+        callback()
+
+    ids = sorted(Bill.objects.values_list("id", flat=True))
+    # one signal per chunk
+    assert [(sender, created) for sender, _, created in received] == [
+        (Bill, True)
+    ] * len(callbacks)
+    assert sorted(id for _, chunk_ids, _ in received for id in chunk_ids) == ids
+
+    # updates are sent separately
+    received.clear()
+    importer = BillImporter("jid")
+    importer.defer_signals = True
+    with django_capture_on_commit_callbacks(execute=True):
+        importer.import_data(bill_dicts(3, "Tack Tax Act"))
+    assert received == [(Bill, ids, False)]
+
+
+@pytest.mark.django_db
+def test_defer_signals_skips_post_save(
+    received, django_capture_on_commit_callbacks, jurisdiction, bill_dicts
+):
+    saved = []
+
+    def receiver(sender, instance, created, **kwargs):
+        saved.append(created)
+
+    post_save.connect(receiver, sender=Bill)
+    try:
+        importer = BillImporter("jid")
+        importer.defer_signals = True
+        with django_capture_on_commit_callbacks(execute=True):
+            importer.import_data(bill_dicts(3))
+        # only the post_save from each save(), not the one sent after related objects
+        assert saved == [True] * 3
+
+        saved.clear()
+        with django_capture_on_commit_callbacks(execute=True):
+            BillImporter("jid").import_data(
+                [ScrapeBill("HB 9", "1900", "Ninth", chamber="lower").as_dict()]
+            )
+        assert saved == [True, True]
+    finally:
+        post_save.disconnect(receiver, sender=Bill)
+    assert len(received) == 1
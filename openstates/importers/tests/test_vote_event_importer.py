@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from openstates.scrape import VoteEvent as ScrapeVoteEvent, Bill as ScrapeBill
 from openstates.importers import VoteEventImporter, BillImporter
 from openstates.data.models import (
@@ -275,6 +277,13 @@ def test_vote_event_bill_clearing():
     )
     assert VoteEvent.objects.count() == 2
 
+    # only deleting a vote event still changes its session
+    importer = VoteEventImporter("jid", bi)
+    result = importer.import_data([vote_event2.as_dict()])
+    assert result["vote_event"]["noop"] == 1
+    assert VoteEvent.objects.count() == 1
+    assert importer.get_changed_sessions() == [LegislativeSession.objects.get().id]
+
 
 @pytest.mark.django_db
 def test_vote_event_bill_actions():
@@ -414,7 +423,8 @@ def test_vote_event_bill_actions_two_stage():
 
 
 @pytest.mark.django_db
-def test_vote_event_bill_actions_errors():
+@pytest.mark.parametrize("chunk_size", [None, 4])
+def test_vote_event_bill_actions_errors(chunk_size, caplog):
     create_jurisdiction()
     bill = ScrapeBill("HB 1", "1900", "Axe & Tack Tax Act", chamber="lower")
 
@@ -479,9 +489,22 @@ def test_vote_event_bill_actions_errors():
     bi = BillImporter("jid")
     bi.import_data([bill.as_dict()])
 
-    VoteEventImporter("jid", bi).import_data(
-        [ve1.as_dict(), ve2.as_dict(), ve3.as_dict(), ve4.as_dict()]
+    with CaptureQueriesContext(connection) as queries:
+        VoteEventImporter("jid", bi).import_data(
+            [ve1.as_dict(), ve2.as_dict(), ve3.as_dict(), ve4.as_dict()],
+            chunk_size=chunk_size,
+        )
+    action_queries = [
+        q for q in queries if q["sql"].startswith('SELECT "opencivicdata_billaction"')
+    ]
+    # actions are loaded once per chunk
+    assert len(action_queries) == (1 if chunk_size else 4)
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert warnings[0].endswith(
+        "passage 1900-04-01: get() returned more than one BillAction -- it returned 2!"
     )
+    assert "could not match VoteEvent to" in warnings[1]
+    assert "can not match two VoteEvents to" in warnings[2]
 
     bill = Bill.objects.get()
     votes = list(VoteEvent.objects.all().order_by("identifier"))
@@ -531,3 +554,55 @@ def test_fix_bill_id():
 
     ve = VoteEvent.objects.get()
     ve.bill.identifier == "HB 1"
+
+
+@pytest.mark.django_db
+def test_vote_event_chunked_import():
+    create_jurisdiction()
+    bill = ScrapeBill("HB 1", "1900", "Axe & Tack Tax Act", chamber="lower")
+    bi = BillImporter("jid")
+    bi.import_data([bill.as_dict()])
+
+    def _vote_events(result):
+        vote_events = []
+        for n in range(3):
+            ve = ScrapeVoteEvent(
+                legislative_session="1900",
+                start_date="2013",
+                classification="anything",
+                result=result,
+                motion_text=f"vote {n}",
+                bill=bill,
+                chamber="lower",
+            )
+            ve.dedupe_key = f"vote-{n}"
+            vote_events.append(ve.as_dict())
+        # an identifier-based vote event without a dedupe key
+        ve = ScrapeVoteEvent(
+            legislative_session="1900",
+            start_date="2013",
+            classification="anything",
+            result=result,
+            motion_text="a vote on something",
+            identifier="Roll Call No. 1",
+            bill=bill,
+            chamber="lower",
+        )
+        vote_events.append(ve.as_dict())
+        return vote_events
+
+    result = VoteEventImporter("jid", bi).import_data(
+        _vote_events("passed"), chunk_size=2
+    )
+    assert result["vote_event"]["insert"] == 4
+
+    result = VoteEventImporter("jid", bi).import_data(
+        _vote_events("passed"), chunk_size=2
+    )
+    assert result["vote_event"]["noop"] == 4
+
+    result = VoteEventImporter("jid", bi).import_data(
+        _vote_events("failed"), chunk_size=10
+    )
+    assert result["vote_event"]["update"] == 4
+    assert VoteEvent.objects.count() == 4
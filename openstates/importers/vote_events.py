@@ -9,6 +9,10 @@ from .organizations import OrganizationImporter
 from .bills import BillImporter
 
 
+# (bill_id, description, date, organization_id)
+_ActionKey = typing.Tuple[str, str, str, str]
+
+
 class VoteEventImporter(BaseImporter):
     _type = "vote_event"
     model_class = VoteEvent
@@ -25,6 +29,8 @@ class VoteEventImporter(BaseImporter):
         self.seen_bill_ids: typing.Set[str] = set()
         self.seen_action_ids: typing.Set[str] = set()
         self.vote_events_to_delete: typing.Set[str] = set()
+        # (prepared vote event, bill json id, action description) waiting to be matched
+        self.pending_bill_actions: typing.List[typing.Tuple[_JsonDict, str, str]] = []
 
     def get_object(self, vote_event: _JsonDict) -> VoteEvent:
         spec = {"legislative_session_id": vote_event["legislative_session_id"]}
@@ -35,14 +41,6 @@ class VoteEventImporter(BaseImporter):
             )
 
         if vote_event["bill_id"]:
-            if vote_event["bill_id"] not in self.seen_bill_ids:
-                self.seen_bill_ids.add(vote_event["bill_id"])
-                # keep a list of all the vote event ids that should be deleted
-                self.vote_events_to_delete.update(
-                    self.model_class.objects.filter(
-                        bill_id=vote_event["bill_id"]
-                    ).values_list("id", flat=True)
-                )
             spec["bill_id"] = vote_event["bill_id"]
 
         if vote_event.get("dedupe_key"):
@@ -63,6 +61,69 @@ class VoteEventImporter(BaseImporter):
 
         return self.model_class.objects.prefetch_related("votes__voter").get(**spec)
 
+    def get_object_key(self, vote_event: _JsonDict) -> typing.Optional[typing.Hashable]:
+        if not vote_event["identifier"] and not vote_event["bill_id"]:
+            # let get_object raise InvalidVoteEventError
+            return None
+        if vote_event.get("dedupe_key"):
+            return ("dedupe_key", vote_event["dedupe_key"])
+        elif vote_event["identifier"]:
+            return (
+                "identifier",
+                vote_event["legislative_session_id"],
+                vote_event["bill_id"],
+                vote_event["identifier"],
+            )
+        else:
+            return (
+                "motion",
+                vote_event["legislative_session_id"],
+                vote_event["bill_id"],
+                vote_event["motion_text"],
+                vote_event["start_date"],
+                vote_event["organization_id"],
+            )
+
+    def get_objects(
+        self, vote_events: typing.List[_JsonDict]
+    ) -> typing.Iterable[typing.Tuple[typing.Hashable, VoteEvent]]:
+        keys = {self.get_object_key(ve) for ve in vote_events}
+        vote_event_qs = self.model_class.objects.prefetch_related("votes__voter")
+
+        dedupe_keys = {key[1] for key in keys if key[0] == "dedupe_key"}
+        if dedupe_keys:
+            for obj in vote_event_qs.filter(dedupe_key__in=dedupe_keys):
+                yield ("dedupe_key", obj.dedupe_key), obj
+
+        # without a bill_id get_object doesn't filter on bill, so None matches any bill
+        identifier_keys = {key[1:] for key in keys if key[0] == "identifier"}
+        if identifier_keys:
+            for obj in vote_event_qs.filter(
+                legislative_session_id__in={key[0] for key in identifier_keys},
+                identifier__in={key[2] for key in identifier_keys},
+            ):
+                for bill_id in {obj.bill_id, None}:
+                    key = (obj.legislative_session_id, bill_id, obj.identifier)
+                    if key in identifier_keys:
+                        yield ("identifier",) + key, obj
+
+        motion_keys = {key[1:] for key in keys if key[0] == "motion"}
+        if motion_keys:
+            for obj in vote_event_qs.filter(
+                legislative_session_id__in={key[0] for key in motion_keys},
+                bill_id__in={key[1] for key in motion_keys},
+                motion_text__in={key[2] for key in motion_keys},
+            ):
+                key = (
+                    obj.legislative_session_id,
+                    obj.bill_id,
+                    obj.motion_text,
+                    obj.start_date,
+                    obj.organization_id,
+                )
+                if key in motion_keys:
+                    yield ("motion",) + key, obj
+
     def limit_spec(self, spec: _JsonDict) -> _DBSpec:
         spec["legislative_session__jurisdiction_id"] = self.jurisdiction_id
         return spec
@@ -85,30 +146,69 @@ class VoteEventImporter(BaseImporter):
         data["bill_id"] = self.bill_importer.resolve_json_id(bill)
         bill_action = data.pop("bill_action")
         if bill_action:
-            try:
-                action = BillAction.objects.get(
-                    bill_id=data["bill_id"],
-                    description=bill_action,
-                    date=data["start_date"],
-                    organization_id=data["organization_id"],
-                )
+            # matched for the whole chunk at once in prepare_chunk
+            self.pending_bill_actions.append((data, bill, bill_action))
+
+        for vote in data["votes"]:
+            vote["voter_id"] = self.resolve_person(
+                vote["voter_id"], session.start_date, session.end_date,
+                json.loads(organization_classification[1:]).get("classification", None)
+            )
+
+        # vote events on this bill that aren't part of this import get deleted in postimport
+        if data["bill_id"]:
+            self.seen_bill_ids.add(data["bill_id"])
+        return data
+
+    def prepare_chunk(self, data_items: typing.List[_JsonDict]) -> None:
+        pending, self.pending_bill_actions = self.pending_bill_actions, []
+        if not pending:
+            return
+
+        # every action of the chunk's bills, with whether a vote is already linked to it
+        actions: typing.Dict[_ActionKey, typing.List[typing.Tuple[str, bool]]] = {}
+        for action_id, bill_id, description, date, org_id, vote_id in BillAction.objects.filter(
+            bill_id__in={data["bill_id"] for data, _, _ in pending}
+        ).values_list("id", "bill_id", "description", "date", "organization_id", "vote"):
+            actions.setdefault((bill_id, description, date, org_id), []).append(
+                (action_id, vote_id is not None)
+            )
+
+        for data, bill, bill_action in pending:
+            matches = actions.get(
+                (
+                    data["bill_id"],
+                    bill_action,
+                    data["start_date"],
+                    data["organization_id"],
+                ),
+                [],
+            )
+            if len(matches) == 1:
+                action_id, has_vote = matches[0]
                 # seen_action_ids is for ones being added in this import
-                # action.vote is already set if action was set on prior import
-                if action.id in self.seen_action_ids or hasattr(action, "vote"):
+                # has_vote is set if action was set on prior import
+                if action_id in self.seen_action_ids or has_vote:
                     self.warning(
-                        "can not match two VoteEvents to %s: %s", action.id, bill_action
+                        "can not match two VoteEvents to %s: %s", action_id, bill_action
                     )
                 else:
-                    data["bill_action_id"] = action.id
-                    self.seen_action_ids.add(action.id)
-            except BillAction.DoesNotExist:
+                    data["bill_action_id"] = action_id
+                    self.seen_action_ids.add(action_id)
+            elif not matches:
                 self.warning(
                     "could not match VoteEvent to %s %s %s",
                     bill,
                     bill_action,
                     data["start_date"],
                 )
-            except BillAction.MultipleObjectsReturned as e:
+            else:
+                # same message BillAction.objects.get() would have raised
+                e = BillAction.MultipleObjectsReturned(
+                    "get() returned more than one BillAction -- it returned {}!".format(
+                        len(matches)
+                    )
+                )
                 self.warning(
                     "could not match VoteEvent to %s %s %s: %s",
                     bill,
@@ -117,15 +217,33 @@ class VoteEventImporter(BaseImporter):
                     e,
                 )
 
-        for vote in data["votes"]:
-            vote["voter_id"] = self.resolve_person(
-                vote["voter_id"], session.start_date, session.end_date,
-                json.loads(organization_classification[1:]).get("classification", None)
-            )
-        return data
+    def checkpoint_state(self) -> _JsonDict:
+        state = super().checkpoint_state()
+        state["seen_bill_ids"] = list(self.seen_bill_ids)
+        state["seen_action_ids"] = list(self.seen_action_ids)
+        return state
+
+    def restore_checkpoint(self, state: _JsonDict) -> None:
+        super().restore_checkpoint(state)
+        self.seen_bill_ids.update(state["seen_bill_ids"])
+        self.seen_action_ids.update(state["seen_action_ids"])
 
     def postimport(self) -> None:
+        # keep a list of all the vote event ids on bills we've seen that should be deleted
+        self.vote_events_to_delete.update(
+            self.model_class.objects.filter(bill_id__in=self.seen_bill_ids).values_list(
+                "id", flat=True
+            )
+        )
         # be sure not to delete vote events that were imported (meaning updated) this time through
-        self.vote_events_to_delete.difference_update(self.json_to_db_id.values())
+        self.vote_events_to_delete.difference_update(self.db_to_json_id)
         # everything remaining, goodbye
-        self.model_class.objects.filter(id__in=self.vote_events_to_delete).delete()
+        to_delete = self.model_class.objects.filter(id__in=self.vote_events_to_delete)
+        if self.diff is not None:
+            for vote_event_id in to_delete.values_list("id", flat=True):
+                self.diff.write(self._type, "delete", vote_event_id)
+            return
+        self.changed_sessions.update(
+            to_delete.values_list("legislative_session_id", flat=True).distinct()
+        )
+        to_delete.delete()
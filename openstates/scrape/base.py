@@ -1,11 +1,12 @@
 import boto3  # noqa
+import concurrent.futures
 import datetime
 from http.client import RemoteDisconnected
 from google.cloud import storage  # type: ignore
 import importlib
 import json
-import jsonschema
 import logging
+import multiprocessing
 import os
 import random
 import requests
@@ -13,11 +14,11 @@ import scrapelib
 import time
 from urllib.error import URLError
 import uuid
-from collections import defaultdict, OrderedDict
-from jsonschema import Draft3Validator, FormatChecker
+from collections import defaultdict, deque, OrderedDict
 
 from .. import utils, settings
 from ..exceptions import ScrapeError, ScrapeValueError, EmptyScrape
+from .validation import get_validator, parse_validation_mode
 
 
 GCP_PROJECT = os.environ.get("GCP_PROJECT", None)
@@ -27,16 +28,6 @@ SCRAPE_REALTIME_LAKE_PREFIX = os.environ.get(
 )
 
 
-@FormatChecker.cls_checks("uri-blank")
-def uri_blank(value):
-    return value == "" or FormatChecker().conforms(value, "uri")
-
-
-@FormatChecker.cls_checks("uri")
-def check_uri(val):
-    return val and val.startswith(("http://", "https://", "ftp://"))
-
-
 def cleanup_list(obj, default):
     if not obj:
         obj = default
@@ -79,6 +70,15 @@ def clean_whitespace(obj):
     return obj
 
 
+def _validation_error(obj):
+    """run in a worker process by deferred validation"""
+    try:
+        obj.validate()
+    except ValueError as ve:
+        return str(ve)
+    return None
+
+
 def get_random_user_agent():
     """
     Return a random user agent to help avoid detection.
@@ -104,6 +104,7 @@ class Scraper(scrapelib.Scraper):
         datadir,
         *,
         strict_validation=True,
+        validation_mode="strict",
         fastmode=False,
         realtime=False,
         file_archiving_enabled=False,
@@ -153,6 +154,17 @@ class Scraper(scrapelib.Scraper):
 
         # validation
         self.strict_validation = strict_validation
+        # see validation.parse_validation_mode
+        self.validation_mode = validation_mode
+        self._validation_kind, self._validation_rate = parse_validation_mode(
+            validation_mode
+        )
+        # sampling validates an object each time this reaches 1, starting with the first
+        self._sample_credit = 1.0
+        self._validation_pool = None
+        self._pending_validations = deque()
+        self.validation_errors = []
+        self.validated_count = 0
 
         # 'type' -> {set of names}
         self.output_names = defaultdict(set)
@@ -230,9 +242,11 @@ class Scraper(scrapelib.Scraper):
                 # Delete the local file after upload
                 os.remove(jsonl_path)
 
-    def upload_to_gcs_real_time(self, obj=None, force_upload=False):
+    def upload_to_gcs_real_time(self, obj=None, force_upload=False, obj_json=None):
         """
         Save scrape output to object bucket every interval
+
+        obj_json is obj already encoded as JSON, if the caller has it
         """
         # Temporarily override any HTTP_PROXY env var
         # because GCP client uses requests, and it doesn't like self-signed cert in chain
@@ -248,7 +262,8 @@ class Scraper(scrapelib.Scraper):
 
         # Attempt to save only when there is an object.
         if obj:
-            obj_dict = obj.as_dict()
+            if obj_json is None:
+                obj_json = json.dumps(obj.as_dict(), cls=utils.JSONEncoderPlus)
             upload_data_class = obj._type
 
             if upload_data_class not in self._realtime_upload_data_classes:
@@ -259,7 +274,7 @@ class Scraper(scrapelib.Scraper):
 
             jsonl_path = os.path.join(self.datadir, f"{upload_data_class}.jsonl")
             with open(jsonl_path, "a") as f:
-                json.dump(obj_dict, f, cls=utils.JSONEncoderPlus)
+                f.write(obj_json)
                 f.write("\n")
 
         now = time.time()
@@ -283,73 +298,153 @@ class Scraper(scrapelib.Scraper):
         filename = f"{obj._type}_{obj._id}.json".replace("/", "-")
         self.info(f"save {obj._type} {obj} as {filename}")
 
-        self.debug(
-            json.dumps(
-                OrderedDict(sorted(obj.as_dict().items())),
-                cls=utils.JSONEncoderPlus,
-                indent=4,
-                separators=(",", ": "),
+        # built once, and encoded at most once, for everything below
+        obj_dict = obj.as_dict()
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.debug(
+                json.dumps(
+                    OrderedDict(sorted(obj_dict.items())),
+                    cls=utils.JSONEncoderPlus,
+                    indent=4,
+                    separators=(",", ": "),
+                )
             )
-        )
 
         self.output_names[obj._type].add(filename)
 
         if self.scrape_output_handler is None:
             file_path = os.path.join(self.datadir, filename)
+            obj_json = json.dumps(obj_dict, cls=utils.JSONEncoderPlus)
 
             with open(file_path, "w") as f:
-                json.dump(obj.as_dict(), f, cls=utils.JSONEncoderPlus)
+                f.write(obj_json)
 
             # Periodically push data to GCS by data class
             if self.realtime:
-                self.upload_to_gcs_real_time(obj)
+                self.upload_to_gcs_real_time(obj, obj_json=obj_json)
 
         else:
-            self.scrape_output_handler.handle(obj)
+            # handlers that can take the object already serialized get it that way
+            handle_serialized = getattr(
+                self.scrape_output_handler, "handle_serialized", None
+            )
+            if handle_serialized is not None:
+                obj_json = json.dumps(obj_dict, cls=utils.JSONEncoderPlus)
+                handle_serialized(obj, obj_dict, obj_json)
+            else:
+                self.scrape_output_handler.handle(obj)
 
         # validate after writing, allows for inspection on failure
+        self.validate_object(obj, obj_dict)
+
+        # after saving and validating, save subordinate objects
+        for obj in obj._related:
+            self.save_object(obj)
+
+    def validate_object(self, obj, obj_dict=None):
+        """validate obj (whose as_dict() is obj_dict) as the validation mode says to"""
+        if self._validation_kind == "sampled":
+            if self._sample_credit < 1:
+                self._sample_credit += self._validation_rate
+                return
+            self._sample_credit += self._validation_rate - 1
+
+        if self._validation_kind == "deferred":
+            if self._validation_pool is None:
+                # forked, so workers don't need to import the scraper again
+                self._validation_pool = concurrent.futures.ProcessPoolExecutor(
+                    mp_context=multiprocessing.get_context("fork")
+                )
+            self._pending_validations.append(
+                self._validation_pool.submit(_validation_error, obj)
+            )
+            # don't let too many objects pile up waiting for validation
+            while len(self._pending_validations) > 1000:
+                self._collect_validation(self._pending_validations.popleft())
+            return
+
+        self.validated_count += 1
         try:
-            obj.validate()
+            obj.validate(data=obj_dict)
         except ValueError as ve:
             if self.strict_validation:
                 raise ve
             else:
                 self.warning(ve)
 
-        # after saving and validating, save subordinate objects
-        for obj in obj._related:
-            self.save_object(obj)
+    def _collect_validation(self, future):
+        self.validated_count += 1
+        error = future.result()
+        if error:
+            self.validation_errors.append(error)
+            if not self.strict_validation:
+                self.warning(error)
+
+    def finish_validation(self):
+        """wait for deferred validation, raising all of its errors at once if strict"""
+        try:
+            while self._pending_validations:
+                self._collect_validation(self._pending_validations.popleft())
+        finally:
+            self.close_validation()
+        if self.validation_errors and self.strict_validation:
+            raise ScrapeValueError(
+                "{} objects failed validation:\n{}".format(
+                    len(self.validation_errors), "\n".join(self.validation_errors)
+                )
+            )
+
+    def close_validation(self):
+        for future in self._pending_validations:
+            future.cancel()
+        self._pending_validations.clear()
+        if self._validation_pool is not None:
+            self._validation_pool.shutdown()
+            self._validation_pool = None
 
     def do_scrape(self, **kwargs):
         record = {"objects": defaultdict(int)}
         self.output_names = defaultdict(set)
         record["start"] = utils.utcnow()
         try:
-            for obj in self.scrape(**kwargs) or []:
-                # allow for returning empty objects in a list
-                if not obj:
-                    continue
-                if hasattr(obj, "__iter__"):
-                    for iterobj in obj:
-                        self.save_object(iterobj)
-                else:
-                    self.save_object(obj)
-        except EmptyScrape:
-            if self.output_names:
-                raise ScrapeError(
-                    f"objects returned from {self.__class__.__name__} scrape, expected none"
-                )
-            self.warning(
-                f"{self.__class__.__name__} raised EmptyScrape, continuing without any results"
-            )
-        else:
-            if not self.output_names:
-                raise ScrapeError(
-                    "no objects returned from {} scrape".format(self.__class__.__name__)
+            try:
+                for obj in self.scrape(**kwargs) or []:
+                    # allow for returning empty objects in a list
+                    if not obj:
+                        continue
+                    if hasattr(obj, "__iter__"):
+                        for iterobj in obj:
+                            self.save_object(iterobj)
+                    else:
+                        self.save_object(obj)
+            except EmptyScrape:
+                if self.output_names:
+                    raise ScrapeError(
+                        f"objects returned from {self.__class__.__name__} scrape, expected none"
+                    )
+                self.warning(
+                    f"{self.__class__.__name__} raised EmptyScrape, continuing without any results"
                 )
+            else:
+                if not self.output_names:
+                    raise ScrapeError(
+                        "no objects returned from {} scrape".format(self.__class__.__name__)
+                    )
+            self.finish_validation()
+        finally:
+            self.close_validation()
+            # output handlers that write to open files (like bundle.Handler) close them
+            close_output = getattr(self.scrape_output_handler, "close", None)
+            if close_output is not None:
+                close_output()
 
         record["end"] = utils.utcnow()
         record["skipped"] = getattr(self, "skipped", 0)
+        record["validation"] = {
+            "mode": self.validation_mode,
+            "validated": self.validated_count,
+        }
         for _type, nameset in self.output_names.items():
             record["objects"][_type] += len(nameset)
 
@@ -566,7 +661,7 @@ class BaseModel(object):
 
     # validation
 
-    def validate(self, schema=None):
+    def validate(self, schema=None, data=None):
         """
         Validate that we have a valid object.
 
@@ -577,27 +672,17 @@ class BaseModel(object):
         due to upstream schemas being in JSON Schema v3, and not validictory's
         modified syntax.
         ^ TODO: FIXME
+
+        data is the object's as_dict(), if the caller already has it
         """
         if schema is None:
             schema = self._schema
+        if data is None:
+            data = self.as_dict()
 
-        # this code copied to openstates/cli/validate - maybe update it if changes here :)
-        type_checker = Draft3Validator.TYPE_CHECKER.redefine(
-            "datetime", lambda c, d: isinstance(d, (datetime.date, datetime.datetime))
-        )
-        type_checker = type_checker.redefine(
-            "date",
-            lambda c, d: (
-                isinstance(d, datetime.date) and not isinstance(d, datetime.datetime)
-            ),
-        )
-
-        ValidatorCls = jsonschema.validators.extend(
-            Draft3Validator, type_checker=type_checker
-        )
-        validator = ValidatorCls(schema, format_checker=FormatChecker())
+        validator = get_validator(schema)
 
-        errors = [str(error) for error in validator.iter_errors(self.as_dict())]
+        errors = [str(error) for error in validator.iter_errors(data)]
         if errors:
             raise ScrapeValueError(
                 "validation of {} {} failed: {}".format(
@@ -0,0 +1,83 @@
+"""
+a SCRAPE_OUTPUT_HANDLER writing scraped objects to a bundle per type, instead of a
+JSON file per object
+
+    SCRAPE_OUTPUT_HANDLER=openstates.scrape.bundle os-update ...
+
+each type's objects are appended, one per line, to scrape_bundle.<type>.jsonl in the
+data directory, which importers read instead of the individual files (see
+openstates.importers.readers), and their ids to scrape_bundle.<type>.ids
+
+SCRAPE_BUNDLE_COMPRESSION=gz compresses the bundles, every scraper in a run appends
+to the same bundles, as a separate gzip member
+
+scrapers run in worker processes (os-update --session-parallelism) write their own
+parts, scrape_bundle.<type>.<pid>.jsonl, as appending to the same bundle from several
+processes would interleave their writes
+"""
+import gzip
+import json
+import multiprocessing
+import os
+from .. import settings, utils
+from ..exceptions import ScrapeError
+
+BUNDLE_NAME = "scrape_bundle.{}{}.jsonl"
+INDEX_NAME = "scrape_bundle.{}{}.ids"
+COMPRESSIONS = ("", "gz")
+
+
+class Handler:
+    def __init__(self, scraper):
+        self.datadir = scraper.datadir
+        self.compression = settings.SCRAPE_BUNDLE_COMPRESSION
+        if self.compression not in COMPRESSIONS:
+            raise ScrapeError(
+                f"SCRAPE_BUNDLE_COMPRESSION must be one of {COMPRESSIONS}, "
+                f"not {self.compression!r}"
+            )
+        # type -> (bundle, index), opened as objects of the type are saved
+        self.files = {}
+
+    @property
+    def part(self):
+        if multiprocessing.parent_process() is None:
+            return ""
+        return f".{os.getpid()}"
+
+    def bundle_path(self, _type):
+        name = BUNDLE_NAME.format(_type, self.part)
+        if self.compression:
+            name += "." + self.compression
+        return os.path.join(self.datadir, name)
+
+    def _open(self, _type):
+        path = self.bundle_path(_type)
+        if self.compression == "gz":
+            bundle = gzip.open(path, "ab")
+        else:
+            bundle = open(path, "ab")
+        index = open(os.path.join(self.datadir, INDEX_NAME.format(_type, self.part)), "a")
+        self.files[_type] = (bundle, index)
+        return bundle, index
+
+    def handle(self, obj):
+        obj_dict = obj.as_dict()
+        self.handle_serialized(
+            obj, obj_dict, json.dumps(obj_dict, cls=utils.JSONEncoderPlus)
+        )
+
+    def handle_serialized(self, obj, obj_dict, obj_json):
+        """write obj, already serialized by Scraper.save_object as obj_json"""
+        files = self.files.get(obj._type)
+        bundle, index = files if files else self._open(obj._type)
+        bundle.write(obj_json.encode())
+        bundle.write(b"\n")
+        index.write(obj._id)
+        index.write("\n")
+
+    def close(self):
+        for bundle, index in self.files.values():
+            bundle.close()
+            index.close()
+        self.files = {}
@@ -0,0 +1,133 @@
+import concurrent.futures
+import gzip
+import json
+import multiprocessing
+import pytest
+from unittest import mock
+from openstates import settings
+from openstates.exceptions import ScrapeError
+from openstates.importers.readers import DirectoryReader
+from openstates.scrape import Bill, State, VoteEvent
+from openstates.scrape.base import Scraper
+
+
+class NewJersey(State):
+    pass
+
+
+juris = NewJersey()
+
+
+class BillScraper(Scraper):
+    def scrape(self, first=0):
+        for n in range(first, first + 3):
+            b = Bill(f"HB {n}", "2021", "Test", chamber="lower")
+            b.add_source("http://example.com")
+            yield b
+            if n == first:
+                v = VoteEvent(
+                    legislative_session="2021",
+                    motion_text="passage",
+                    start_date="2021-01-01",
+                    classification="passage",
+                    result="pass",
+                    bill=b,
+                )
+                v.add_source("http://example.com")
+                yield v
+
+
+@pytest.fixture
+def bundle_handler(monkeypatch):
+    monkeypatch.setenv("SCRAPE_OUTPUT_HANDLER", "openstates.scrape.bundle")
+
+
+def test_bundle_per_type(tmp_path, bundle_handler):
+    # two scrapes in a run append to the same bundles
+    record = BillScraper(juris, str(tmp_path)).do_scrape()
+    BillScraper(juris, str(tmp_path)).do_scrape(first=3)
+
+    assert record["objects"] == {"bill": 3, "vote_event": 1}
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "scrape_bundle.bill.ids",
+        "scrape_bundle.bill.jsonl",
+        "scrape_bundle.vote_event.ids",
+        "scrape_bundle.vote_event.jsonl",
+    ]
+
+    reader = DirectoryReader(str(tmp_path))
+    bills = list(reader.read("bill"))
+    assert [b["identifier"] for b in bills] == [f"HB {n}" for n in range(6)]
+    assert len(list(reader.read("vote_event"))) == 2
+    with open(tmp_path / "scrape_bundle.bill.ids") as f:
+        assert f.read().split() == [b["_id"] for b in bills]
+
+
+def test_bundle_gzip(tmp_path, bundle_handler):
+    with mock.patch.object(settings, "SCRAPE_BUNDLE_COMPRESSION", "gz"):
+        BillScraper(juris, str(tmp_path)).do_scrape()
+        BillScraper(juris, str(tmp_path)).do_scrape(first=3)
+
+    with gzip.open(tmp_path / "scrape_bundle.bill.jsonl.gz") as f:
+        assert json.loads(f.readline())["identifier"] == "HB 0"
+    bills = list(DirectoryReader(str(tmp_path)).read("bill"))
+    assert [b["identifier"] for b in bills] == [f"HB {n}" for n in range(6)]
+
+
+def test_bundle_closed_on_error(tmp_path, bundle_handler):
+    class BrokenScraper(BillScraper):
+        def scrape(self):
+            yield from super().scrape()
+            raise ValueError("oops")
+
+    with mock.patch.object(settings, "SCRAPE_BUNDLE_COMPRESSION", "gz"):
+        scraper = BrokenScraper(juris, str(tmp_path))
+        with pytest.raises(ValueError):
+            scraper.do_scrape()
+    assert scraper.scrape_output_handler.files == {}
+    # what was scraped before the error is readable
+    assert len(list(DirectoryReader(str(tmp_path)).read("bill"))) == 3
+
+
+def test_bundle_bad_compression(tmp_path, bundle_handler):
+    with mock.patch.object(settings, "SCRAPE_BUNDLE_COMPRESSION", "bz2"):
+        with pytest.raises(ScrapeError):
+            Scraper(juris, str(tmp_path))
+
+
+def scrape_in_worker(datadir, first):
+    return BillScraper(juris, datadir).do_scrape(first=first)["objects"]["bill"]
+
+
+def test_bundle_parts_in_worker_processes(tmp_path, bundle_handler):
+    BillScraper(juris, str(tmp_path)).do_scrape()
+    with concurrent.futures.ProcessPoolExecutor(
+        2, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        futures = [
+            executor.submit(scrape_in_worker, str(tmp_path), first)
+            for first in (3, 6)
+        ]
+        assert [future.result() for future in futures] == [3, 3]
+
+    # each process wrote its own part
+    parts = [p.name for p in tmp_path.iterdir() if p.name.endswith(".jsonl")]
+    assert "scrape_bundle.bill.jsonl" in parts
+    assert len([p for p in parts if p.startswith("scrape_bundle.bill.")]) >= 2
+    bills = list(DirectoryReader(str(tmp_path)).read("bill"))
+    assert sorted(b["identifier"] for b in bills) == sorted(f"HB {n}" for n in range(9))
+
+
+def test_bundle_serializes_once(tmp_path, bundle_handler):
+    scraper = BillScraper(juris, str(tmp_path))
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dumps, mock.patch.object(
+        Bill, "as_dict", autospec=True, side_effect=Bill.as_dict
+    ) as as_dict:
+        scraper.save_object(next(scraper.scrape()))
+    scraper.scrape_output_handler.close()
+
+    assert as_dict.call_count == 1
+    encoded = [c for c in json_dumps.mock_calls if "cls" in c.kwargs and "indent" not in c.kwargs]
+    assert len(encoded) == 1
+    (bill,) = DirectoryReader(str(tmp_path)).read("bill")
+    assert bill["identifier"] == "HB 0"
@@ -126,3 +126,32 @@ def test_add_associated_link_on_duplicate_ignore():
     assert len(m._associated) == 1
     assert len(m._associated[0]["links"]) == 1
     assert m._associated[0]["note"] == "something"
+
+
+def test_validator_cached():
+    from openstates.scrape import Organization
+    from openstates.scrape.popolo import org_schema_no_sources
+    from openstates.scrape.validation import get_validator
+
+    assert get_validator(schema) is get_validator(schema)
+    assert get_validator(org_schema_no_sources) is not get_validator(
+        Organization._schema
+    )
+
+    # party orgs validate without sources, committees don't
+    Organization("Democratic", classification="party").validate()
+    with pytest.raises(ValueError):
+        Organization("Finance", classification="committee").validate()
+
+
+@pytest.mark.parametrize(
+    "url,valid",
+    [("http://example.com", True), ("", True), ("example.com", False)],
+)
+def test_validate_uri_blank(url, valid):
+    from openstates.scrape.validation import get_validator
+
+    validator = get_validator(
+        {"properties": {"url": {"type": "string", "format": "uri-blank"}}}
+    )
+    assert validator.is_valid({"url": url}) == valid
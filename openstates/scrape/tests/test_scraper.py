@@ -1,3 +1,5 @@
+import json
+import logging
 import pytest
 from unittest import mock
 from openstates.scrape import Bill, State, EmptyScrape
@@ -11,19 +13,28 @@ class NewJersey(State):
 juris = NewJersey()
 
 
+def saved(json_dumps):
+    """the objects a patched json.dumps encoded for output, not for the debug log"""
+    return [
+        call.args[0]
+        for call in json_dumps.mock_calls
+        if "cls" in call.kwargs and "indent" not in call.kwargs
+    ]
+
+
 def test_save_object_basics():
     # ensure that save object dumps a file
     s = Scraper(juris, "/tmp/")
     p = Bill("HB 1", "2021", "Test")
     p.add_source("http://example.com")
 
-    with mock.patch("json.dump") as json_dump:
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
         s.save_object(p)
 
     # ensure object is saved in right place
     filename = "bill_" + p._id + ".json"
     assert filename in s.output_names["bill"]
-    json_dump.assert_called_once_with(p.as_dict(), mock.ANY, cls=mock.ANY)
+    assert saved(json_dump) == [p.as_dict()]
 
 
 def test_save_object_invalid():
@@ -43,13 +54,10 @@ def test_save_related():
     o.add_source("http://example.com")
     p._related.append(o)
 
-    with mock.patch("json.dump") as json_dump:
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
         s.save_object(p)
 
-    assert json_dump.mock_calls == [
-        mock.call(p.as_dict(), mock.ANY, cls=mock.ANY),
-        mock.call(o.as_dict(), mock.ANY, cls=mock.ANY),
-    ]
+    assert saved(json_dump) == [p.as_dict(), o.as_dict()]
 
 
 def test_simple_scrape():
@@ -59,10 +67,10 @@ def test_simple_scrape():
             p.add_source("http://example.com")
             yield p
 
-    with mock.patch("json.dump") as json_dump:
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
         record = FakeScraper(juris, "/tmp/").do_scrape()
 
-    assert len(json_dump.mock_calls) == 1
+    assert len(saved(json_dump)) == 1
     assert record["objects"]["bill"] == 1
     assert record["end"] > record["start"]
     assert record["skipped"] == 0
@@ -80,10 +88,10 @@ def test_double_iter():
             p.add_source("http://example.com")
             yield p
 
-    with mock.patch("json.dump") as json_dump:
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
         record = IterScraper(juris, "/tmp/").do_scrape()
 
-    assert len(json_dump.mock_calls) == 1
+    assert len(saved(json_dump)) == 1
     assert record["objects"]["bill"] == 1
 
 
@@ -144,10 +152,10 @@ def test_bill_scraper():
                 return b
 
     bs = BillScraper(juris, "/tmp/")
-    with mock.patch("json.dump") as json_dump:
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
         record = bs.do_scrape(legislative_session="2020")
 
-    assert len(json_dump.mock_calls) == 1
+    assert len(saved(json_dump)) == 1
     assert record["objects"]["bill"] == 1
     assert record["skipped"] == 1
 
@@ -166,3 +174,73 @@ def test_whitespace_is_stripped():
     assert b.sources[0]["url"] == "https://example.com/"
     # subject got sorted by pre_save
     assert b.subject == ["one", "three", "two"]
+
+
+class BillsScraper(Scraper):
+    def scrape(self, sourceless=()):
+        for n in range(10):
+            b = Bill(f"HB {n}", "2021", "Test")
+            if n not in sourceless:
+                b.add_source("http://example.com")
+            yield b
+
+
+def test_sampled_validation():
+    with mock.patch("json.dumps", wraps=json.dumps):
+        scraper = BillsScraper(juris, "/tmp/", validation_mode="sampled:25%")
+        record = scraper.do_scrape()
+    # the first object is always validated, then one in every four
+    assert record["validation"] == {"mode": "sampled:25%", "validated": 3}
+
+    # only HB 0, HB 4 and HB 8 are validated, so HB 1's missing source isn't noticed
+    with mock.patch("json.dumps", wraps=json.dumps):
+        BillsScraper(juris, "/tmp/", validation_mode="sampled:25%").do_scrape(
+            sourceless=[1]
+        )
+        with pytest.raises(ValueError):
+            BillsScraper(juris, "/tmp/", validation_mode="sampled:25%").do_scrape(
+                sourceless=[4]
+            )
+
+
+def test_deferred_validation():
+    with mock.patch("json.dumps", wraps=json.dumps):
+        record = BillsScraper(juris, "/tmp/", validation_mode="deferred").do_scrape()
+    assert record["validation"] == {"mode": "deferred", "validated": 10}
+
+    # every object is saved, then all the errors are raised together
+    scraper = BillsScraper(juris, "/tmp/", validation_mode="deferred")
+    with mock.patch("json.dumps", wraps=json.dumps) as json_dump:
+        with pytest.raises(ValueError) as e:
+            scraper.do_scrape(sourceless=[2, 7])
+    assert len(saved(json_dump)) == 10
+    assert "2 objects failed validation" in str(e.value)
+    assert len(scraper.validation_errors) == 2
+
+
+def test_deferred_validation_nonstrict():
+    scraper = BillsScraper(
+        juris, "/tmp/", strict_validation=False, validation_mode="deferred"
+    )
+    with mock.patch("json.dumps", wraps=json.dumps), mock.patch.object(scraper, "warning") as warning:
+        record = scraper.do_scrape(sourceless=[3])
+    assert record["objects"]["bill"] == 10
+    assert len(warning.mock_calls) == 1
+
+
+def test_invalid_validation_mode():
+    with pytest.raises(ValueError):
+        Scraper(juris, "/tmp/", validation_mode="sampled:200%")
+
+
+def test_debug_dump_only_when_logging_debug(caplog):
+    s = Scraper(juris, "/tmp/")
+    p = Bill("HB 1", "2021", "Test")
+    p.add_source("http://example.com")
+
+    for level, dumps in ((logging.INFO, 0), (logging.DEBUG, 1)):
+        with caplog.at_level(level, "openstates"), mock.patch(
+            "json.dumps", wraps=json.dumps
+        ) as json_dump:
+            s.save_object(p)
+        assert len([c for c in json_dump.mock_calls if "indent" in c.kwargs]) == dumps
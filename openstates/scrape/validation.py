@@ -0,0 +1,83 @@
+"""
+validation of scraped objects against their schemas
+
+validators are built once per schema and reused, by BaseModel.validate & os-validate
+"""
+import datetime
+import typing
+import jsonschema
+from jsonschema import Draft3Validator, FormatChecker
+from .schemas.bill import schema as bill_schema
+from .schemas.event import schema as event_schema
+from .schemas.jurisdiction import schema as jurisdiction_schema
+from .schemas.organization import schema as organization_schema
+from .schemas.vote_event import schema as vote_event_schema
+
+# schemas of each type of scraped object
+SCHEMAS = {
+    "bill": bill_schema,
+    "event": event_schema,
+    "jurisdiction": jurisdiction_schema,
+    "organization": organization_schema,
+    "vote_event": vote_event_schema,
+}
+
+
+@FormatChecker.cls_checks("uri")
+def check_uri(val):
+    return val and val.startswith(("http://", "https://", "ftp://"))
+
+
+@FormatChecker.cls_checks("uri-blank")
+def uri_blank(value):
+    return value == "" or bool(check_uri(value))
+
+
+# scraped objects have date & datetime objects where their JSON will have strings
+_type_checker = Draft3Validator.TYPE_CHECKER.redefine(
+    "datetime", lambda c, d: isinstance(d, (datetime.date, datetime.datetime))
+)
+_type_checker = _type_checker.redefine(
+    "date",
+    lambda c, d: (isinstance(d, datetime.date) and not isinstance(d, datetime.datetime)),
+)
+ScrapeValidator = jsonschema.validators.extend(Draft3Validator, type_checker=_type_checker)
+
+# id(schema) -> (schema, its validator), the schema is kept so its id isn't reused
+_validators: typing.Dict[int, typing.Tuple[dict, typing.Any]] = {}
+
+
+def get_validator(schema: dict) -> typing.Any:
+    """the validator for a schema, built the first time it's used"""
+    cached = _validators.get(id(schema))
+    if cached is None or cached[0] is not schema:
+        cached = _validators[id(schema)] = (
+            schema,
+            ScrapeValidator(schema, format_checker=FormatChecker()),
+        )
+    return cached[1]
+
+
+def parse_validation_mode(mode: str) -> typing.Tuple[str, float]:
+    """
+    split a validation mode into its kind and the fraction of objects it validates
+
+    modes are:
+        strict:      validate each object as it's saved
+        deferred:    validate every object in worker processes, errors are reported once
+                     the scrape is done
+        sampled:N%:  validate N% of the objects as they're saved
+    """
+    if mode in ("strict", "deferred"):
+        return mode, 1.0
+    if mode.startswith("sampled:") and mode.endswith("%"):
+        try:
+            rate = float(mode[len("sampled:"):-1]) / 100
+        except ValueError:
+            pass
+        else:
+            if 0 <= rate <= 1:
+                return "sampled", rate
+    raise ValueError(
+        f"invalid validation mode {mode!r}, expected strict, deferred or sampled:N%"
+    )
@@ -21,6 +21,8 @@ SCRAPELIB_VERIFY = verify
 
 CACHE_DIR = os.path.join(os.getcwd(), "_cache")
 SCRAPED_DATA_DIR = os.path.join(os.getcwd(), "_data")
+# "" or "gz", see openstates.scrape.bundle
+SCRAPE_BUNDLE_COMPRESSION = os.environ.get("SCRAPE_BUNDLE_COMPRESSION", "")
 
 IMPORT_TRANSFORMERS = {
     "bill": {
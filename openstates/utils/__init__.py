@@ -8,5 +8,6 @@ from .generic import (
     convert_pdf,
     utcnow,
     format_datetime,
+    fingerprint,
 )
 from .metadata import abbr_to_jid, jid_to_abbr
@@ -1,4 +1,5 @@
 import datetime
+import hashlib
 import json
 import os
 import pytz
@@ -60,6 +61,30 @@ class JSONEncoderPlus(json.JSONEncoder):
         return super(JSONEncoderPlus, self).default(obj, **kwargs)
 
 
+def fingerprint(
+    obj: typing.Any,
+    default: typing.Optional[typing.Callable[[typing.Any], typing.Any]] = None,
+) -> str:
+    """
+    Stable hash of JSON-like data, the same in every process so it can be stored.
+
+    Dicts hash the same regardless of key order and sets regardless of element order,
+    anything else json can't encode is passed to default (or str() if not given).
+    """
+
+    def encode(value: typing.Any) -> typing.Any:
+        if isinstance(value, (set, frozenset)):
+            return sorted(
+                value, key=lambda e: json.dumps(e, sort_keys=True, default=encode)
+            )
+        elif default is not None:
+            return default(value)
+        return str(value)
+
+    serialized = json.dumps(obj, sort_keys=True, default=encode)
+    return hashlib.blake2b(serialized.encode("utf8"), digest_size=16).hexdigest()
+
+
 def convert_pdf(filename: str, type: str = "xml") -> bytes:
     commands = {
         "text": ["pdftotext", "-layout", filename, "-"],